@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+# Compares the compiled JSON codec against dataclasses_json on a synthetic workspace.
+# Run from the repository root with PYTHONPATH=src/main/python
+
+import argparse
+import random
+import timeit
+import uuid
+
+from plotlyst.core import codec
+from plotlyst.core.client import SceneInfo, CharacterInfo, NovelInfo, ScenePlotReferenceInfo
+from plotlyst.core.domain import CharacterAgency, SceneStructureItem, SceneStoryBeat, Plot, Document, \
+    DocumentStatistics, BackstoryEvent, ScenePlotReferenceData
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding and decoding of novel files')
+    parser.add_argument('--scenes', type=int, default=1000, help='number of synthetic scenes')
+    parser.add_argument('--characters', type=int, default=200, help='number of synthetic characters')
+    parser.add_argument('-n', '--repeat', type=int, default=3, help='number of measured rounds')
+    return parser.parse_args()
+
+
+def synthetic_workspace(scenes: int, characters: int):
+    plots = [Plot(f'Storyline {i}') for i in range(10)]
+    character_infos = []
+    for i in range(characters):
+        character_infos.append(CharacterInfo(name=f'Character {i}', id=uuid.uuid4(), summary='Lorem ipsum ' * 10,
+                                             backstory=[BackstoryEvent(f'Event {j}', 'Synopsis ' * 5) for j in
+                                                        range(5)],
+                                             document=Document('', id=uuid.uuid4()),
+                                             traits=['brave', 'stubborn', 'kind']))
+    scene_infos = []
+    for i in range(scenes):
+        cast = random.sample(character_infos, min(4, len(character_infos)))
+        scene_infos.append(
+            SceneInfo(title=f'Scene {i}', id=uuid.uuid4(), synopsis='Lorem ipsum dolor sit amet ' * 8,
+                      pov=cast[0].id, characters=[x.id for x in cast[1:]],
+                      agency=[CharacterAgency(x.id, motivations={1: 2, 3: 1}, intensity=2) for x in cast[:2]],
+                      plots=[ScenePlotReferenceInfo(x.id, ScenePlotReferenceData(charge=1)) for x in
+                             random.sample(plots, 2)],
+                      beats=[SceneStoryBeat(uuid.uuid4(), uuid.uuid4())],
+                      structure=[SceneStructureItem(f'Beat {j}') for j in range(6)],
+                      manuscript=Document('', id=uuid.uuid4(), statistics=DocumentStatistics(wc=1200))))
+    novel_info = NovelInfo(id=uuid.uuid4(), scenes=[x.id for x in scene_infos],
+                           characters=[x.id for x in character_infos], plots=plots)
+    return scene_infos, character_infos, novel_info
+
+
+def measure(label: str, func, repeat: int):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f'{label:<40}{best * 1000:>10.1f} ms')
+
+
+def main():
+    args = parse_args()
+    scenes, characters, novel = synthetic_workspace(args.scenes, args.characters)
+    objects = [novel, *scenes, *characters]
+    documents = [(type(x), x.to_json()) for x in objects]
+
+    for obj in objects:
+        assert codec.to_json(obj) == obj.to_json(), f'Encoding mismatch for {type(obj).__name__}'
+
+    print(f'{len(scenes)} scenes, {len(characters)} characters')
+    measure('encode (dataclasses_json)', lambda: [x.to_json() for x in objects], args.repeat)
+    measure('encode (codec)', lambda: [codec.to_json(x) for x in objects], args.repeat)
+    measure('decode (dataclasses_json)', lambda: [cls.from_json(data) for cls, data in documents], args.repeat)
+    measure(f'decode (codec{", orjson" if codec.orjson else ""})',
+            lambda: [codec.from_json(cls, data) for cls, data in documents], args.repeat)
+
+
+if __name__ == '__main__':
+    main()
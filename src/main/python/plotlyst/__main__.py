@@ -39,6 +39,7 @@ try:
     from plotlyst.service.dir import select_new_project_directory, default_directory
     from plotlyst.service.log import setup_logging
 
+    from PyQt6.QtCore import Qt
     from PyQt6.QtGui import QFont, QIcon, QPixmap
     from PyQt6.QtWidgets import QApplication, QMessageBox, QSplashScreen
     from fbs_runtime.application_context.PyQt6 import ApplicationContext
@@ -48,6 +49,7 @@ try:
     from plotlyst.core.client import json_client
     from plotlyst.event.handler import handle_exception
     from plotlyst.view.main_window import MainWindow
+    from plotlyst.view.icons import IconRegistry
     from plotlyst.view.stylesheet import APP_STYLESHEET
 except Exception as ex:
     app = QApplication(sys.argv)
@@ -131,11 +133,20 @@ if __name__ == '__main__':
     splash.show()
     app.processEvents()
 
+    def show_loading_progress(loaded: int, total: int):
+        splash.showMessage(f'Loading novel... {loaded}/{total}',
+                           Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter)
+        app.processEvents()
+
+    IconRegistry.warm_up()
+    json_client.set_loading_listener(show_loading_progress)
     try:
         window = MainWindow()
     except Exception as ex:
         QMessageBox.critical(None, 'Could not create main window', traceback.format_exc())
         raise ex
+    finally:
+        json_client.set_loading_listener(None)
 
     window.show()
     splash.finish(window)
@@ -17,24 +17,28 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-import codecs
 import copy
+import logging
 import os
 import pathlib
+import shutil
 import uuid
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import IntEnum
 from pathlib import Path
-from typing import List, Optional, Any, Dict, Set, Union
+from typing import List, Optional, Any, Dict, Set, Union, Callable
 
-from PyQt6.QtCore import QByteArray, QBuffer, QIODevice
+from PyQt6.QtCore import QByteArray, QBuffer, QIODevice, Qt
 from PyQt6.QtGui import QImage, QImageReader, QImageWriter
 from atomicwrites import atomic_write
 from dataclasses_json import dataclass_json, Undefined, config
 from qthandy import busy
 
 from plotlyst.common import recursive
+from plotlyst.core import codec
+from plotlyst.core.storage import WorkspaceStorage, open_storage
 from plotlyst.core.domain import Novel, Character, Scene, Chapter, SceneStage, \
     default_stages, StoryStructure, \
     default_story_structures, NovelDescriptor, TemplateValue, \
@@ -44,17 +48,19 @@ from plotlyst.core.domain import Novel, Character, Scene, Chapter, SceneStage, \
     default_tag_types, LanguageSettings, ImportOrigin, NovelPreferences, Goal, CharacterPreferences, TagReference, \
     ScenePlotReferenceData, MiceQuotient, SceneDrive, WorldBuilding, Board, \
     default_big_five_values, CharacterPlan, ManuscriptGoals, Diagram, DiagramData, default_character_networks, \
+    DiagramChanges, Node, Connector, connector_key, \
     ScenePurposeType, StoryElement, SceneOutcome, ChapterType, SceneStructureItem, \
     DocumentProgress, ReaderQuestion, SceneReaderQuestion, ImageRef, SceneReaderInformation, \
     CharacterProfileSectionReference, CharacterMultiAttribute, default_character_profile, CharacterPersonality, \
     StrengthWeaknessAttribute, PremiseBuilder, SceneFunctions, Location, default_locations, TopicElement, StoryType, \
-    DailyProductivity, NovelInfo, SceneMigration, WorldBuildingEntity, character_codex_root
+    DailyProductivity, NovelInfo, SceneMigration, WorldBuildingEntity, character_codex_root, NovelSection
 from plotlyst.core.template import Role, exclude_if_empty, exclude_if_black, exclude_if_false
 from plotlyst.env import app_env
 
 
 class ApplicationNovelVersion(IntEnum):
     R0 = 0
+    R1 = 1  # story structures, board, manuscript progress and productivity are persisted in separate files
 
 
 LATEST_VERSION = [x for x in ApplicationNovelVersion][-1]
@@ -261,6 +267,35 @@ class ProjectNovelInfo:
     sequence: int = field(default=0, metadata=config(exclude=exclude_if_empty))
 
 
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class StoryStructuresInfo:
+    structures: List[StoryStructure] = field(default_factory=list)
+
+
+@dataclass_json(undefined=Undefined.EXCLUDE)
+@dataclass
+class ManuscriptProgressInfo:
+    progress: Dict[str, DocumentProgress] = field(default_factory=dict)
+
+
+@dataclass
+class DiagramJournalRecord:
+    nodes: List[Node] = field(default_factory=list, metadata=config(exclude=exclude_if_empty))
+    removed_nodes: List[str] = field(default_factory=list, metadata=config(exclude=exclude_if_empty))
+    connectors: List[Connector] = field(default_factory=list, metadata=config(exclude=exclude_if_empty))
+    removed_connectors: List[str] = field(default_factory=list, metadata=config(exclude=exclude_if_empty))
+
+    @staticmethod
+    def from_changes(changes: DiagramChanges) -> 'DiagramJournalRecord':
+        return DiagramJournalRecord(list(changes.nodes.values()), [str(x) for x in changes.removed_nodes],
+                                    list(changes.connectors.values()), list(changes.removed_connectors))
+
+    def changes(self) -> DiagramChanges:
+        return DiagramChanges({x.id: x for x in self.nodes}, {uuid.UUID(x) for x in self.removed_nodes},
+                              {connector_key(x): x for x in self.connectors}, set(self.removed_connectors))
+
+
 def _default_story_structures():
     return default_story_structures
 
@@ -272,6 +307,7 @@ class Project:
 
 
 class JsonClient:
+    LOADER_WORKERS: int = min(8, (os.cpu_count() or 1) + 2)
 
     def __init__(self):
         self.project: Optional[Project] = None
@@ -282,9 +318,16 @@ class JsonClient:
         self._old_scenes_dir: Optional[pathlib.Path] = None
         self._old_characters_dir: Optional[pathlib.Path] = None
         self.project_images_dir: Optional[pathlib.Path] = None
+        self.thumbnails_dir: Optional[pathlib.Path] = None
+        self.cache_dir: Optional[pathlib.Path] = None
         self._old_docs_dir: Optional[pathlib.Path] = None
+        self._loading_listener: Optional[Callable[[int, int], None]] = None
+        self._storage: Optional[WorkspaceStorage] = None
 
     def init(self, workspace: str):
+        if self._storage is not None:
+            self._storage.close()
+        self._storage = open_storage(workspace)
         self.project_file_path = os.path.join(workspace, 'project.plotlyst')
 
         if not os.path.exists(self.project_file_path) or os.path.getsize(self.project_file_path) == 0:
@@ -293,13 +336,15 @@ class JsonClient:
         else:
             with open(self.project_file_path) as json_file:
                 data = json_file.read()
-                self.project = Project.from_json(data)
+                self.project = codec.from_json(Project, data)
             self._persist_project()
 
         self._workspace = workspace
         self.root_path = pathlib.Path(self._workspace)
         self.novels_dir = self.root_path.joinpath('novels')
         self.project_images_dir = self.root_path.joinpath('images')
+        self.thumbnails_dir = self.project_images_dir.joinpath('thumbnails')
+        self.cache_dir = self.root_path.joinpath('cache')
 
         if not os.path.exists(str(self.novels_dir)):
             os.mkdir(self.novels_dir)
@@ -324,22 +369,19 @@ class JsonClient:
         if novel is None:
             novel = app_env.novel
         characters_dir_ = self.novels_dir.joinpath(str(novel.id)).joinpath('characters')
-        if not characters_dir_.exists():
-            characters_dir_.mkdir()
+        self._storage.makedirs(characters_dir_)
         return characters_dir_
 
     def scenes_dir(self, novel: Optional[Union[Novel, NovelInfo]] = None) -> Path:
         if novel is None:
             novel = app_env.novel
         scenes_dir_ = self.novels_dir.joinpath(str(novel.id)).joinpath('scenes')
-        if not scenes_dir_.exists():
-            scenes_dir_.mkdir()
+        self._storage.makedirs(scenes_dir_)
         return scenes_dir_
 
     def diagrams_dir(self, novel: Novel) -> Path:
         diagrams_dir_ = self.novels_dir.joinpath(str(novel.id)).joinpath('diagrams')
-        if not diagrams_dir_.exists():
-            diagrams_dir_.mkdir()
+        self._storage.makedirs(diagrams_dir_)
         return diagrams_dir_
 
     def images_dir(self, novel: Novel) -> Path:
@@ -350,8 +392,7 @@ class JsonClient:
 
     def docs_dir(self, novel: Novel) -> Path:
         docs_dir_ = self.novels_dir.joinpath(str(novel.id)).joinpath('docs')
-        if not docs_dir_.exists():
-            docs_dir_.mkdir()
+        self._storage.makedirs(docs_dir_)
         return docs_dir_
 
     def update_project_novel(self, novel: Novel):
@@ -378,62 +419,63 @@ class JsonClient:
         self.project.novels.append(project_novel_info)
         self._persist_project()
         self._persist_novel(novel)
-        novel_dir = self.novels_dir.joinpath(str(project_novel_info.id))
-        if not novel_dir.exists():
-            novel_dir.mkdir()
 
     def delete_novel(self, novel: Novel):
         novel_info = self._find_project_novel_info_or_fail(novel.id)
         self.project.novels.remove(novel_info)
         self._persist_project()
         self.__delete_info(self.novels_dir, novel_info.id)
+        shutil.rmtree(self.cache_dir.joinpath(str(novel_info.id)), ignore_errors=True)
 
     def update_novel(self, novel: Novel):
-        self._persist_novel(novel)
+        sections = novel.pop_dirty_sections()
+        self._persist_novel(novel, sections if sections else None)
 
     def update_world(self, novel: Novel):
         self._persist_world(novel.id, novel.world)
 
     def insert_scene(self, novel: Novel, scene: Scene):
         self._persist_scene(scene, novel)
-        self._persist_novel(novel)
+        self._persist_novel(novel, {NovelSection.Info})
 
     def update_scene(self, scene: Scene):
         self._persist_scene(scene)
 
     def delete_scene(self, novel: Novel, scene: Scene):
-        self._persist_novel(novel)
+        self._persist_novel(novel, {NovelSection.Info})
         self.__delete_info(self.scenes_dir(novel), scene.id)
         if scene.document:
             self.delete_document(novel, scene.document)
 
     def insert_character(self, novel: Novel, character: Character):
         self.update_character(character, True, novel)
-        self._persist_novel(novel)
+        self._persist_novel(novel, {NovelSection.Info})
 
     def update_character(self, character: Character, update_avatar: bool = False, novel: Optional[Novel] = None):
         avatar_id: Optional[uuid.UUID] = None
 
-        path = self.characters_dir(novel).joinpath(self.__json_file(character.id))
-        if os.path.exists(path):
-            with open(path) as json_file:
-                data = json_file.read()
-                info: CharacterInfo = CharacterInfo.from_json(data)
-                avatar_id = info.avatar_id
+        data = self._storage.read(self.characters_dir(novel).joinpath(self.__json_file(character.id)))
+        if data:
+            info: CharacterInfo = codec.from_json(CharacterInfo, data)
+            avatar_id = info.avatar_id
 
         if update_avatar:
+            avatar = character.avatar
+            if not avatar and character.avatar_id:
+                # the avatar was not displayed yet, e.g., a character imported from another novel
+                avatar = self._load_image(self.__image_file(character.avatar_id))
             if avatar_id:
                 self.__delete_image(avatar_id)
                 avatar_id = None
-            if character.avatar:
+            if avatar:
                 avatar_id = uuid.uuid4()
-                image = QImage.fromData(character.avatar)
+                image = QImage.fromData(avatar)
                 image.save(str(self.project_images_dir.joinpath(self.__image_file(avatar_id))))
 
         self._persist_character(character, avatar_id, novel)
 
     def delete_character(self, novel: Novel, character: Character):
-        self._persist_novel(novel)
+        self._persist_novel(novel, {NovelSection.Info})
         self.__delete_info(self.characters_dir(novel), character.id)
         if character.document:
             self.delete_document(novel, character.document)
@@ -454,11 +496,11 @@ class JsonClient:
         else:
             data_str: str = self.__load_doc_data(novel, document.data_id)
             if document.type in [DocumentType.CAUSE_AND_EFFECT, DocumentType.REVERSED_CAUSE_AND_EFFECT]:
-                document.data = Causality.from_json(data_str)
+                document.data = codec.from_json(Causality, data_str)
             elif document.type == DocumentType.MICE:
-                document.data = MiceQuotient.from_json(data_str)
+                document.data = codec.from_json(MiceQuotient, data_str)
             elif document.type == DocumentType.PREMISE:
-                document.data = PremiseBuilder.from_json(data_str)
+                document.data = codec.from_json(PremiseBuilder, data_str)
         document.loaded = True
 
     @busy
@@ -473,14 +515,17 @@ class JsonClient:
 
         json_str = self.__load_diagram(novel, diagram.id)
         if json_str:
-            diagram.data = DiagramData.from_json(json_str)
+            diagram.data = codec.from_json(DiagramData, json_str)
         else:
             diagram.data = DiagramData()
+        diagram.journal_size = self._replay_diagram_journal(novel, diagram)
         diagram.loaded = True
 
+    def image_path(self, novel: Novel, ref: ImageRef) -> Path:
+        return self.images_dir(novel).joinpath(f'{ref.id}.{ref.extension}')
+
     def load_image(self, novel: Novel, ref: ImageRef) -> Optional[QImage]:
-        filename = f'{ref.id}.{ref.extension}'
-        path = self.images_dir(novel).joinpath(filename)
+        path = self.image_path(novel, ref)
         if not path.exists():
             return None
         image = QImage()
@@ -488,9 +533,50 @@ class JsonClient:
 
         return image
 
+    def load_avatar(self, avatar_id: uuid.UUID, size: int) -> Optional[QImage]:
+        path = self.project_images_dir.joinpath(self.__image_file(avatar_id))
+        if not path.exists():
+            return None
+        reader = QImageReader(str(path))
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid() and min(original.width(), original.height()) > size:
+            original.scale(size, size, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+            reader.setScaledSize(original)
+        image = reader.read()
+        if image.isNull():
+            return None
+        return image
+
+    def load_avatar_thumbnail(self, avatar_id: uuid.UUID, size: int) -> Optional[QImage]:
+        path = self.thumbnails_dir.joinpath(self.__thumbnail_file(avatar_id, size))
+        if not path.exists():
+            return None
+        image = QImage()
+        if not image.load(str(path)):
+            return None
+        return image
+
+    def save_avatar_thumbnail(self, avatar_id: uuid.UUID, size: int, image: QImage):
+        if not self.thumbnails_dir.exists():
+            self.thumbnails_dir.mkdir()
+        image.save(str(self.thumbnails_dir.joinpath(self.__thumbnail_file(avatar_id, size))), 'PNG')
+
+    def load_cache(self, novel: Novel, name: str) -> Optional[str]:
+        path = self.cache_dir.joinpath(str(novel.id)).joinpath(name)
+        if not path.exists():
+            return None
+        with open(path, encoding='utf-8') as file:
+            return file.read()
+
+    def save_cache(self, novel: Novel, name: str, data: str):
+        novel_cache_dir = self.cache_dir.joinpath(str(novel.id))
+        novel_cache_dir.mkdir(parents=True, exist_ok=True)
+        with atomic_write(novel_cache_dir.joinpath(name), encoding='utf-8', overwrite=True) as f:
+            f.write(data)
+
     def save_image(self, novel: Novel, ref: ImageRef, image: QImage):
-        file_path = self.images_dir(novel).joinpath(f'{ref.id}.{ref.extension}')
-        writer = QImageWriter(str(file_path))
+        writer = QImageWriter(str(self.image_path(novel, ref)))
         writer.write(image)
 
     def update_document(self, novel: Novel, document: Document):
@@ -499,13 +585,23 @@ class JsonClient:
     def delete_document(self, novel: Novel, document: Document):
         self.__delete_doc(novel, document)
 
-    def update_diagram(self, novel: Novel, diagram: Diagram):
-        self._persist_diagram(novel, diagram)
+    def update_diagram(self, novel: Novel, diagram: Diagram, changes: Optional[DiagramChanges] = None):
+        """Saves the whole diagram, or only appends the given changes to its journal.
+
+        The journal is replayed when the diagram is loaded, and it is removed whenever the whole diagram is saved."""
+        if changes is None:
+            self._persist_diagram(novel, diagram)
+        elif changes:
+            record = codec.to_json(DiagramJournalRecord.from_changes(changes))
+            self._storage.append(self.diagrams_dir(novel).joinpath(self.__journal_file(diagram.id)), record + '\n')
 
     def fetch_novel(self, id: uuid.UUID) -> Novel:
         project_novel_info: ProjectNovelInfo = self._find_project_novel_info_or_fail(id)
         novel_info = self._read_novel_info(project_novel_info.id)
-        self.__persist_info(self.novels_dir, novel_info)
+        if novel_info.version < ApplicationNovelVersion.R1:
+            self._migrate_novel_sections(novel_info)
+        else:
+            self._read_novel_sections(novel_info)
 
         plot_ids = {}
         for plot in novel_info.plots:
@@ -517,42 +613,23 @@ class JsonClient:
             chapters.append(chapter)
             chapters_ids[str(chapter.id)] = chapter
 
+        characters_dir = self.characters_dir(novel_info)
+        scenes_dir = self.scenes_dir(novel_info)
+        self._storage.preload(characters_dir, scenes_dir)
+        with ThreadPoolExecutor(max_workers=self.LOADER_WORKERS) as executor:
+            character_futures = [executor.submit(self._read_character_info, characters_dir, char_id) for char_id in
+                                 novel_info.characters]
+            scene_futures = [executor.submit(self._read_scene_info, scenes_dir, scene_id) for scene_id in
+                             novel_info.scenes]
+            self._report_loading_progress(character_futures + scene_futures)
+        self._storage.clear_preloaded()
+
         characters = []
-        for char_id in novel_info.characters:
-            path = self.characters_dir(novel_info).joinpath(
-                self.__json_file(char_id))
-            if not os.path.exists(path):
+        for future in character_futures:
+            info = future.result()
+            if info is None:
                 continue
-            with open(path, encoding='utf8') as json_file:
-                data = json_file.read()
-                info: CharacterInfo = CharacterInfo.from_json(data)
-                character = Character(name=info.name, id=info.id, gender=info.gender, role=info.role, age=info.age,
-                                      age_infinite=info.age_infinite,
-                                      occupation=info.occupation,
-                                      template_values=info.template_values,
-                                      disabled_template_headers=info.disabled_template_headers,
-                                      backstory=info.backstory, plans=info.plans,
-                                      document=info.document,
-                                      journals=info.journals, prefs=info.prefs, topics=info.topics,
-                                      big_five=info.big_five,
-                                      profile=info.profile,
-                                      summary=info.summary,
-                                      faculties=info.faculties,
-                                      traits=info.traits,
-                                      values=info.values,
-                                      gmc=info.gmc,
-                                      lack=info.lack,
-                                      baggage=info.baggage,
-                                      flaws=info.flaws,
-                                      strengths=info.strengths,
-                                      personality=info.personality, alias=info.alias,
-                                      origin_id=info.origin_id, codex=info.codex
-                                      )
-                if info.avatar_id:
-                    bytes = self._load_image(self.__image_file(info.avatar_id))
-                    if bytes:
-                        character.avatar = bytes
-                characters.append(character)
+            characters.append(self._character_from_info(info))
         characters_ids: Dict[str, Character] = {}
         for char in characters:
             characters_ids[str(char.id)] = char
@@ -563,52 +640,45 @@ class JsonClient:
         if all([not x.active for x in novel_info.story_structures]):
             novel_info.story_structures[0].active = True
 
+        stages_ids = {str(x.id): x for x in novel_info.stages}
         scenes: List[Scene] = []
-        for scene_id in novel_info.scenes:
-            path = self.scenes_dir(novel_info).joinpath(
-                self.__json_file(scene_id))
-            if not os.path.exists(path):
+        for future in scene_futures:
+            info = future.result()
+            if info is None:
                 continue
-            with open(path, encoding='utf8') as json_file:
-                data = json_file.read()
-                info: SceneInfo = SceneInfo.from_json(data)
-                scene_plots = []
-                for plot_value in info.plots:
-                    if str(plot_value.plot_id) in plot_ids.keys():
-                        scene_plots.append(ScenePlotReference(plot_ids[str(plot_value.plot_id)], plot_value.data))
-                if info.pov and str(info.pov) in characters_ids.keys():
-                    pov = characters_ids[str(info.pov)]
-                else:
-                    pov = None
-
-                scene_characters = []
-                for char_id in info.characters:
-                    if str(char_id) in characters_ids.keys():
-                        scene_characters.append(characters_ids[str(char_id)])
-
-                if info.chapter and str(info.chapter) in chapters_ids.keys():
-                    chapter = chapters_ids[str(info.chapter)]
-                else:
-                    chapter = None
-
-                stage = None
-                if info.stage:
-                    match = [x for x in novel_info.stages if x.id == info.stage]
-                    if match:
-                        stage = match[0]
-
-                scene = Scene(title=info.title, id=info.id, synopsis=info.synopsis,
-                              wip=info.wip, day=info.day,
-                              plot_values=scene_plots, pov=pov, characters=scene_characters, agency=info.agency,
-                              chapter=chapter, stage=stage, beats=info.beats,
-                              comments=info.comments, tag_references=info.tag_references,
-                              document=info.document, manuscript=info.manuscript, drive=info.drive,
-                              purpose=info.purpose, outcome=info.outcome, story_elements=info.story_elements,
-                              structure=info.structure, questions=info.questions, info=info.info,
-                              progress=info.progress, plot_pos_progress=info.plot_pos_progress,
-                              plot_neg_progress=info.plot_neg_progress, functions=info.functions,
-                              migration=SceneMigration(info.migration.migrated_functions))
-                scenes.append(scene)
+            scene_plots = []
+            for plot_value in info.plots:
+                if str(plot_value.plot_id) in plot_ids.keys():
+                    scene_plots.append(ScenePlotReference(plot_ids[str(plot_value.plot_id)], plot_value.data))
+            if info.pov and str(info.pov) in characters_ids.keys():
+                pov = characters_ids[str(info.pov)]
+            else:
+                pov = None
+
+            scene_characters = []
+            for char_id in info.characters:
+                if str(char_id) in characters_ids.keys():
+                    scene_characters.append(characters_ids[str(char_id)])
+
+            if info.chapter and str(info.chapter) in chapters_ids.keys():
+                chapter = chapters_ids[str(info.chapter)]
+            else:
+                chapter = None
+
+            stage = stages_ids.get(str(info.stage)) if info.stage else None
+
+            scene = Scene(title=info.title, id=info.id, synopsis=info.synopsis,
+                          wip=info.wip, day=info.day,
+                          plot_values=scene_plots, pov=pov, characters=scene_characters, agency=info.agency,
+                          chapter=chapter, stage=stage, beats=info.beats,
+                          comments=info.comments, tag_references=info.tag_references,
+                          document=info.document, manuscript=info.manuscript, drive=info.drive,
+                          purpose=info.purpose, outcome=info.outcome, story_elements=info.story_elements,
+                          structure=info.structure, questions=info.questions, info=info.info,
+                          progress=info.progress, plot_pos_progress=info.plot_pos_progress,
+                          plot_neg_progress=info.plot_neg_progress, functions=info.functions,
+                          migration=SceneMigration(info.migration.migrated_functions))
+            scenes.append(scene)
 
         tag_types = novel_info.tag_types
         tags = novel_info.tags
@@ -647,65 +717,155 @@ class JsonClient:
                       manuscript_progress=novel_info.manuscript_progress, questions=novel_info.questions,
                       productivity=novel_info.productivity, descriptors=novel_info.descriptors)
 
-        world_path = self.novels_dir.joinpath(str(novel_info.id)).joinpath('world.json')
-        if os.path.exists(world_path):
-            with open(world_path, encoding='utf8') as json_file:
-                novel.world = WorldBuilding.from_json(json_file.read())
-        board_path = self.novels_dir.joinpath(str(novel_info.id)).joinpath('board.json')
-        if os.path.exists(board_path):
-            with open(board_path, encoding='utf8') as json_file:
-                novel.board = Board.from_json(json_file.read())
+        data = self.__read_json_by_name(self.novels_dir.joinpath(str(novel_info.id)), 'world')
+        if data:
+            novel.world = codec.from_json(WorldBuilding, data)
+        novel.board = novel_info.board
 
         return novel
 
+    def transaction(self):
+        return self._storage.transaction()
+
+    def set_loading_listener(self, listener: Optional[Callable[[int, int], None]]):
+        self._loading_listener = listener
+
+    def _report_loading_progress(self, futures: List[Future]):
+        if self._loading_listener is None:
+            return
+        total = len(futures)
+        step = max(1, total // 50)
+        self._loading_listener(0, total)
+        for i, _ in enumerate(as_completed(futures), start=1):
+            if i % step == 0 or i == total:
+                self._loading_listener(i, total)
+
+    def _read_character_info(self, characters_dir: Path, char_id: uuid.UUID) -> Optional[CharacterInfo]:
+        data = self._storage.read(characters_dir.joinpath(self.__json_file(char_id)))
+        if data is None:
+            return None
+        return codec.from_json(CharacterInfo, data)
+
+    def _read_scene_info(self, scenes_dir: Path, scene_id: uuid.UUID) -> Optional[SceneInfo]:
+        data = self._storage.read(scenes_dir.joinpath(self.__json_file(scene_id)))
+        if data is None:
+            return None
+        return codec.from_json(SceneInfo, data)
+
+    @staticmethod
+    def _character_from_info(info: CharacterInfo) -> Character:
+        return Character(name=info.name, id=info.id, gender=info.gender, role=info.role, age=info.age,
+                         age_infinite=info.age_infinite,
+                         occupation=info.occupation,
+                         avatar_id=info.avatar_id,
+                         template_values=info.template_values,
+                         disabled_template_headers=info.disabled_template_headers,
+                         backstory=info.backstory, plans=info.plans,
+                         document=info.document,
+                         journals=info.journals, prefs=info.prefs, topics=info.topics,
+                         big_five=info.big_five,
+                         profile=info.profile,
+                         summary=info.summary,
+                         faculties=info.faculties,
+                         traits=info.traits,
+                         values=info.values,
+                         gmc=info.gmc,
+                         lack=info.lack,
+                         baggage=info.baggage,
+                         flaws=info.flaws,
+                         strengths=info.strengths,
+                         personality=info.personality, alias=info.alias,
+                         origin_id=info.origin_id, codex=info.codex
+                         )
+
     def _read_novel_info(self, id: uuid.UUID) -> NovelInfo:
-        path = self.novels_dir.joinpath(self.__json_file(id))
-        if not os.path.exists(path):
+        data = self._storage.read(self.novels_dir.joinpath(self.__json_file(id)))
+        if data is None:
             raise IOError(f'Could not find novel with id {id}')
-        with open(path) as json_file:
-            data = json_file.read()
-            return NovelInfo.from_json(data)
+        return codec.from_json(NovelInfo, data)
+
+    def _read_novel_sections(self, novel_info: NovelInfo):
+        novel_dir = self.novels_dir.joinpath(str(novel_info.id))
+        data = self.__read_json_by_name(novel_dir, 'structures')
+        if data:
+            novel_info.story_structures = codec.from_json(StoryStructuresInfo, data).structures
+        data = self.__read_json_by_name(novel_dir, 'manuscript_progress')
+        if data:
+            novel_info.manuscript_progress = codec.from_json(ManuscriptProgressInfo, data).progress
+        data = self.__read_json_by_name(novel_dir, 'productivity')
+        if data:
+            novel_info.productivity = codec.from_json(DailyProductivity, data)
+        data = self.__read_json_by_name(novel_dir, 'board')
+        if data:
+            novel_info.board = codec.from_json(Board, data)
+
+    def _migrate_novel_sections(self, novel_info: NovelInfo):
+        novel_dir = self.novels_dir.joinpath(str(novel_info.id))
+        self._storage.makedirs(novel_dir)
+        data = self.__read_json_by_name(novel_dir, 'board')
+        if data:
+            novel_info.board = codec.from_json(Board, data)
+
+        self.__persist_info_by_name(novel_dir, StoryStructuresInfo(novel_info.story_structures), 'structures')
+        self.__persist_info_by_name(novel_dir, ManuscriptProgressInfo(novel_info.manuscript_progress),
+                                    'manuscript_progress')
+        self.__persist_info_by_name(novel_dir, novel_info.productivity, 'productivity')
+        self.__persist_info_by_name(novel_dir, novel_info.board, 'board')
+
+        stored_info = copy.copy(novel_info)
+        stored_info.story_structures = []
+        stored_info.manuscript_progress = {}
+        stored_info.productivity = DailyProductivity()
+        stored_info.board = Board()
+        stored_info.version = LATEST_VERSION
+        self.__persist_info(self.novels_dir, stored_info)
 
     def _persist_project(self):
         with atomic_write(self.project_file_path, overwrite=True) as f:
-            f.write(self.project.to_json())
-
-    def _persist_novel(self, novel: Novel):
-        novel_info = NovelInfo(id=novel.id, scenes=[x.id for x in novel.scenes],
-                               plots=novel.plots,
-                               characters=[x.id for x in novel.characters],
-                               chapters=[ChapterInfo(title=x.title, id=x.id, type=x.type) for x in novel.chapters],
-                               custom_chapters=novel.custom_chapters,
-                               stages=novel.stages, story_structures=novel.story_structures,
-                               goals=novel.goals,
-                               tags=[item for sublist in novel.tags.values() for item in sublist if not item.builtin],
-                               tag_types=list(novel.tags.keys()),
-                               documents=novel.documents,
-                               premise=novel.premise, synopsis=novel.synopsis,
-                               version=LATEST_VERSION, prefs=novel.prefs, locations=novel.locations,
-                               manuscript_goals=novel.manuscript_goals,
-                               events_map=novel.events_map, character_networks=novel.character_networks,
-                               manuscript_progress=novel.manuscript_progress, questions=novel.questions,
-                               productivity=novel.productivity, descriptors=novel.descriptors)
-
-        self.__persist_info(self.novels_dir, novel_info)
-        # self._persist_world(novel.id, novel.world)
-        self._persist_board(novel.id, novel.board)
+            f.write(codec.to_json(self.project))
+
+    def _persist_novel(self, novel: Novel, sections: Optional[Set[NovelSection]] = None):
+        if sections is None:
+            sections = set(NovelSection)
+
+        novel_dir = self.novels_dir.joinpath(str(novel.id))
+        self._storage.makedirs(novel_dir)
+
+        if NovelSection.Info in sections:
+            novel_info = NovelInfo(id=novel.id, scenes=[x.id for x in novel.scenes],
+                                   plots=novel.plots,
+                                   characters=[x.id for x in novel.characters],
+                                   chapters=[ChapterInfo(title=x.title, id=x.id, type=x.type) for x in
+                                             novel.chapters],
+                                   custom_chapters=novel.custom_chapters,
+                                   stages=novel.stages,
+                                   goals=novel.goals,
+                                   tags=[item for sublist in novel.tags.values() for item in sublist if
+                                         not item.builtin],
+                                   tag_types=list(novel.tags.keys()),
+                                   documents=novel.documents,
+                                   premise=novel.premise, synopsis=novel.synopsis,
+                                   version=LATEST_VERSION, prefs=novel.prefs, locations=novel.locations,
+                                   manuscript_goals=novel.manuscript_goals,
+                                   events_map=novel.events_map, character_networks=novel.character_networks,
+                                   questions=novel.questions, descriptors=novel.descriptors)
+            self.__persist_info(self.novels_dir, novel_info)
+        if NovelSection.Structures in sections:
+            self.__persist_info_by_name(novel_dir, StoryStructuresInfo(novel.story_structures), 'structures')
+        if NovelSection.Board in sections:
+            self.__persist_info_by_name(novel_dir, novel.board, 'board')
+        if NovelSection.ManuscriptProgress in sections:
+            self.__persist_info_by_name(novel_dir, ManuscriptProgressInfo(novel.manuscript_progress),
+                                        'manuscript_progress')
+        if NovelSection.Productivity in sections:
+            self.__persist_info_by_name(novel_dir, novel.productivity, 'productivity')
 
     def _persist_world(self, novel_id: uuid.UUID, world: WorldBuilding):
         novel_dir = self.novels_dir.joinpath(str(novel_id))
-        if not novel_dir.exists():
-            novel_dir.mkdir()
+        self._storage.makedirs(novel_dir)
 
         self.__persist_info_by_name(novel_dir, world, 'world')
 
-    def _persist_board(self, novel_id: uuid.UUID, board: Board):
-        novel_dir = self.novels_dir.joinpath(str(novel_id))
-        if not novel_dir.exists():
-            novel_dir.mkdir()
-
-        self.__persist_info_by_name(novel_dir, board, 'board')
-
     def _persist_character(self, char: Character, avatar_id: Optional[uuid.UUID] = None, novel: Optional[Novel] = None):
         char_info = CharacterInfo(id=char.id, name=char.name, gender=char.gender, role=char.role, age=char.age,
                                   age_infinite=char.age_infinite,
@@ -751,9 +911,26 @@ class JsonClient:
 
     def _persist_diagram(self, novel: Novel, diagram: Diagram):
         diagrams_dir = self.diagrams_dir(novel)
-        if not os.path.exists(str(diagrams_dir)):
-            os.mkdir(diagrams_dir)
-        self.__persist_json_by_id(diagrams_dir, diagram.data.to_json(), diagram.id)
+        with self._storage.transaction():
+            self.__persist_json_by_id(diagrams_dir, codec.to_json(diagram.data), diagram.id)
+            self._storage.delete(diagrams_dir.joinpath(self.__journal_file(diagram.id)))
+
+    def _replay_diagram_journal(self, novel: Novel, diagram: Diagram) -> int:
+        journal = self._storage.read(self.diagrams_dir(novel).joinpath(self.__journal_file(diagram.id)))
+        if not journal:
+            return 0
+        size = 0
+        for line in journal.splitlines():
+            if not line:
+                continue
+            try:
+                changes = codec.from_json(DiagramJournalRecord, line).changes()
+            except (ValueError, KeyError, TypeError):
+                logging.warning('Discarding the unreadable end of the journal of diagram %s', diagram.id)
+                break
+            changes.apply(diagram.data)
+            size += len(changes)
+        return size
 
     @staticmethod
     def __id_or_none(item):
@@ -769,9 +946,15 @@ class JsonClient:
     def __json_file(self, uuid: uuid.UUID) -> str:
         return f'{uuid}.json'
 
+    def __journal_file(self, uuid: uuid.UUID) -> str:
+        return f'{uuid}.jsonl'
+
     def __image_file(self, uuid: uuid.UUID) -> str:
         return f'{uuid}.jpeg'
 
+    def __thumbnail_file(self, uuid: uuid.UUID, size: int) -> str:
+        return f'{uuid}_{size}.png'
+
     def __doc_file(self, uuid: uuid.UUID) -> str:
         return f'{uuid}.html'
 
@@ -781,77 +964,65 @@ class JsonClient:
 
     def __load_doc(self, novel: Novel, doc_uuid: uuid.UUID) -> str:
         novel_doc_dir = self.docs_dir(novel).joinpath(str(novel.id))
-        path = novel_doc_dir.joinpath(self.__doc_file(doc_uuid))
-        if not os.path.exists(path):
-            return ''
-        with codecs.open(str(path), "r", "utf-8") as doc_file:
-            return doc_file.read()
+        content = self._storage.read(novel_doc_dir.joinpath(self.__doc_file(doc_uuid)))
+        return content if content is not None else ''
 
     def __load_doc_data(self, novel: Novel, data_uuid: uuid.UUID) -> str:
         if not data_uuid:
             return ''
         novel_doc_dir = self.docs_dir(novel).joinpath(str(novel.id))
-        path = novel_doc_dir.joinpath(self.__json_file(data_uuid))
-        if not os.path.exists(path):
-            return ''
-        with open(path, encoding='utf-8') as json_file:
-            return json_file.read()
+        data = self._storage.read(novel_doc_dir.joinpath(self.__json_file(data_uuid)))
+        return data if data is not None else ''
 
     def __load_diagram(self, novel: Novel, diagram_uuid: uuid.UUID) -> str:
         diagrams_dir = self.diagrams_dir(novel)
-        path = diagrams_dir.joinpath(self.__json_file(diagram_uuid))
-        if not os.path.exists(path):
-            return ''
-        with open(path, encoding='utf-8') as json_file:
-            return json_file.read()
+        data = self._storage.read(diagrams_dir.joinpath(self.__json_file(diagram_uuid)))
+        return data if data is not None else ''
 
     def __persist_doc(self, novel: Novel, doc: Document):
         novel_doc_dir = self.docs_dir(novel).joinpath(str(novel.id))
-        if not os.path.exists(str(novel_doc_dir)):
-            os.mkdir(novel_doc_dir)
+        self._storage.makedirs(novel_doc_dir)
 
         if doc.type in [DocumentType.DOCUMENT, DocumentType.STORY_STRUCTURE]:
-            doc_file_path = novel_doc_dir.joinpath(self.__doc_file(doc.id))
-            with atomic_write(doc_file_path, encoding='utf-8', overwrite=True) as f:
-                f.write(doc.content)
+            self._storage.write(novel_doc_dir.joinpath(self.__doc_file(doc.id)), doc.content)
         elif doc.type in [DocumentType.REVERSED_CAUSE_AND_EFFECT, DocumentType.CAUSE_AND_EFFECT, DocumentType.MICE,
                           DocumentType.PREMISE]:
-            self.__persist_json_by_id(novel_doc_dir, doc.data.to_json(), doc.data_id)
+            self.__persist_json_by_id(novel_doc_dir, codec.to_json(doc.data), doc.data_id)
 
     def __persist_info(self, dir, info: Any):
-        self.__persist_json_by_id(dir, info.to_json(), info.id)
+        self.__persist_json_by_id(dir, codec.to_json(info), info.id)
 
     def __persist_info_by_name(self, dir, info: Any, name: str):
-        self.__persist_json_by_name(dir, info.to_json(), name)
+        self.__persist_json_by_name(dir, codec.to_json(info), name)
 
     def __persist_json_by_name(self, dir, json_data: str, name: str):
-        with atomic_write(dir.joinpath(f'{name}.json'), encoding='utf-8', overwrite=True) as f:
-            f.write(json_data)
+        self._storage.write(dir.joinpath(f'{name}.json'), json_data)
+
+    def __read_json_by_name(self, dir, name: str) -> str:
+        data = self._storage.read(dir.joinpath(f'{name}.json'))
+        return data if data is not None else ''
 
     def __persist_json_by_id(self, dir, json_data: str, id: uuid.UUID):
-        with atomic_write(dir.joinpath(self.__json_file(id)), encoding='utf-8', overwrite=True) as f:
-            f.write(json_data)
+        self._storage.write(dir.joinpath(self.__json_file(id)), json_data)
 
     def __delete_info(self, dir, id: uuid.UUID):
-        path = dir.joinpath(self.__json_file(id))
-        if os.path.exists(path):
-            os.remove(path)
+        self._storage.delete(dir.joinpath(self.__json_file(id)))
 
     def __delete_image(self, id: uuid.UUID):
         path = self.project_images_dir.joinpath(self.__image_file(id))
         if os.path.exists(path):
             os.remove(path)
+        if self.thumbnails_dir.exists():
+            for thumbnail in self.thumbnails_dir.glob(f'{id}_*.png'):
+                os.remove(thumbnail)
 
     def __delete_doc(self, novel: Novel, doc: Document):
         novel_doc_dir = self.docs_dir(novel).joinpath(str(novel.id))
-        if not os.path.exists(str(novel_doc_dir)):
-            return
-        doc_file_path = novel_doc_dir.joinpath(self.__doc_file(doc.id))
-        if os.path.exists(doc_file_path):
-            os.remove(doc_file_path)
+        self._storage.delete(novel_doc_dir.joinpath(self.__doc_file(doc.id)))
 
         if doc.diagram is not None:
             self.__delete_info(self.diagrams_dir(novel), doc.diagram.id)
+            self._storage.delete(self.diagrams_dir(novel).joinpath(self.__journal_file(doc.diagram.id)))
 
         recursive(doc, lambda parent: parent.children, lambda p, child: self.__delete_doc(novel, child))
 
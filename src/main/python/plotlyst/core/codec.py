@@ -0,0 +1,266 @@
+"""
+Plotlyst
+Copyright (C) 2021-2024  Zsolt Kovari
+
+This file is part of Plotlyst.
+
+Plotlyst is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Plotlyst is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+from collections.abc import Collection, Mapping
+from dataclasses import fields, is_dataclass, MISSING
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Type, TypeVar, Union, get_type_hints, get_origin, get_args
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # optional backend
+    orjson = None
+
+T = TypeVar('T')
+
+# Schema-compiled JSON codec for the persisted dataclasses. The output is byte-identical to dataclasses_json's
+# to_json() and decoding is equivalent to from_json(), but the per-class field tables (exclusion predicates,
+# field decoders) are compiled once instead of being re-inspected for every object.
+
+_encoders: Dict[type, Callable[[Any], Any]] = {}
+_class_decoders: Dict[type, Callable[[Any], Any]] = {}
+
+
+def to_json(obj: Any) -> str:
+    return json.dumps(encode(obj))
+
+
+def from_json(cls: Type[T], data: Union[str, bytes]) -> T:
+    return decode(cls, _loads(data))
+
+
+def encode(obj: Any) -> Any:
+    encoder = _encoders.get(type(obj))
+    if encoder is None:
+        encoder = _resolve_encoder(type(obj))
+    return encoder(obj)
+
+
+def decode(cls: Type[T], kvs: Any) -> T:
+    decoder = _class_decoders.get(cls)
+    if decoder is None:
+        decoder = _compile_class_decoder(cls)
+    return decoder(kvs)
+
+
+def _loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g., NaN values that only the standard library accepts
+    return json.loads(data)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _encode_list(value: Any) -> Any:
+    return [encode(x) for x in value]
+
+
+def _encode_dict(value: Any) -> Any:
+    return {k: encode(v) for k, v in value.items()}
+
+
+def _encode_enum(value: Enum) -> Any:
+    return encode(value.value)
+
+
+def _unsupported(value: Any) -> Any:
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _resolve_encoder(type_: type) -> Callable[[Any], Any]:
+    if is_dataclass(type_):
+        encoder = _compile_class_encoder(type_)
+    elif issubclass(type_, Enum):
+        encoder = _encode_enum
+    elif issubclass(type_, (str, int, float, bool, type(None))):
+        encoder = _identity
+    elif issubclass(type_, UUID):
+        encoder = str
+    elif issubclass(type_, datetime):
+        encoder = datetime.timestamp
+    elif issubclass(type_, Decimal):
+        encoder = str
+    elif issubclass(type_, Mapping):
+        encoder = _encode_dict
+    elif issubclass(type_, Collection):
+        encoder = _encode_list
+    else:
+        encoder = _unsupported
+
+    _encoders[type_] = encoder
+    return encoder
+
+
+def _compile_class_encoder(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    table = []
+    for field in fields(cls):
+        exclude = field.metadata.get('dataclasses_json', {}).get('exclude')
+        table.append((field.name, exclude))
+
+    def encode_instance(obj: Any) -> Dict[str, Any]:
+        result = {}
+        for name, exclude in table:
+            raw = getattr(obj, name)
+            value = encode(raw)
+            if exclude is not None and exclude(value if is_dataclass(raw) else raw):
+                continue
+            result[name] = value
+        return result
+
+    return encode_instance
+
+
+def _is_optional(type_: Any) -> bool:
+    return get_origin(type_) is Union and type(None) in get_args(type_)
+
+
+def _type_origin(type_: Any) -> Any:
+    origin = get_origin(type_)
+    return type_ if origin is None else origin
+
+
+def _is_subclass(type_: Any, classinfo: Any) -> bool:
+    return isinstance(type_, type) and issubclass(type_, classinfo)
+
+
+def _is_collection(type_: Any) -> bool:
+    return _is_subclass(_type_origin(type_), Collection)
+
+
+def _is_supported_generic(type_: Any) -> bool:
+    if _is_subclass(type_, str):
+        return False
+    return _is_collection(type_) or get_origin(type_) is Union or _is_subclass(type_, Enum)
+
+
+def _compile_class_decoder(cls: type) -> Callable[[Any], Any]:
+    types = get_type_hints(cls)
+    table = []
+    for field in fields(cls):
+        if not field.init:
+            continue
+        type_ = types[field.name]
+        while hasattr(type_, '__supertype__'):
+            type_ = type_.__supertype__
+        table.append((field.name, _compile_field_decoder(type_), field.default, field.default_factory))
+
+    def decode_instance(kvs: Any) -> Any:
+        if isinstance(kvs, cls):
+            return kvs
+        init_kwargs = {}
+        for name, decoder, default, default_factory in table:
+            if name in kvs:
+                value = kvs[name]
+                init_kwargs[name] = None if value is None else decoder(value)
+            elif default is not MISSING:
+                init_kwargs[name] = default
+            elif default_factory is not MISSING:
+                init_kwargs[name] = default_factory()
+            else:
+                raise KeyError(name)
+        return cls(**init_kwargs)
+
+    _class_decoders[cls] = decode_instance
+    return decode_instance
+
+
+def _nested_class_decoder(cls: type) -> Callable[[Any], Any]:
+    def decode_nested(value: Any) -> Any:
+        if is_dataclass(value):
+            return value
+        return decode(cls, value)
+
+    return decode_nested
+
+
+def _compile_field_decoder(type_: Any) -> Callable[[Any], Any]:
+    if is_dataclass(type_):
+        return _nested_class_decoder(type_)
+    if _is_supported_generic(type_):
+        return _compile_generic_decoder(type_)
+    return _compile_extended_decoder(type_)
+
+
+def _compile_extended_decoder(type_: Any) -> Callable[[Any], Any]:
+    if _is_subclass(type_, datetime):
+        def decode_datetime(value: Any) -> Any:
+            if isinstance(value, datetime):
+                return value
+            return datetime.fromtimestamp(value, tz=datetime.now(timezone.utc).astimezone().tzinfo)
+
+        return decode_datetime
+    if _is_subclass(type_, Decimal):
+        return lambda value: value if isinstance(value, Decimal) else Decimal(value)
+    if _is_subclass(type_, UUID):
+        return lambda value: value if isinstance(value, UUID) else UUID(value)
+    return _identity
+
+
+def _compile_items_decoder(type_: Any) -> Callable[[Any], Any]:
+    if is_dataclass(type_):
+        return lambda value: decode(type_, value)
+    if _is_supported_generic(type_):
+        generic = _compile_generic_decoder(type_)
+        return lambda value: None if value is None else generic(value)
+    return _identity
+
+
+def _compile_generic_decoder(type_: Any) -> Callable[[Any], Any]:
+    if _is_subclass(type_, Enum):
+        return type_
+
+    if _is_collection(type_):
+        constructor = _type_origin(type_)
+        if _is_subclass(constructor, Mapping):
+            args = get_args(type_) or (Any, Any)
+            key_type, value_type = args
+            if key_type is None or key_type is Any:
+                decode_key = _identity
+            else:
+                key_items = _compile_items_decoder(key_type)
+
+                def decode_key(key: Any) -> Any:
+                    return key_type(key_items(key))
+            decode_value = _compile_items_decoder(value_type)
+            return lambda value: constructor((decode_key(k), decode_value(v)) for k, v in value.items())
+
+        decode_item = _compile_items_decoder(get_args(type_)[0])
+        return lambda value: constructor(decode_item(x) for x in value)
+
+    args = get_args(type_)
+    if not args:
+        return _identity
+    if _is_optional(type_) and len(args) == 2:
+        arg = args[0]
+        if is_dataclass(arg):
+            return _nested_class_decoder(arg)
+        if _is_supported_generic(arg):
+            return _compile_generic_decoder(arg)
+        return _compile_extended_decoder(arg)
+
+    return _identity
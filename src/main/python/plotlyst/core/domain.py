@@ -24,7 +24,7 @@ from abc import ABC
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Set
 
 from PyQt6.QtCore import Qt
 from dataclasses_json import dataclass_json, Undefined, config
@@ -668,6 +668,7 @@ class Character:
     age_infinite: bool = field(default=False, metadata=config(exclude=exclude_if_false))
     occupation: Optional[str] = None
     avatar: Optional[Any] = None
+    avatar_id: Optional[uuid.UUID] = None
     template_values: List[TemplateValue] = field(default_factory=list)
     disabled_template_headers: Dict[str, bool] = field(default_factory=dict)
     backstory: List[BackstoryEvent] = field(default_factory=list)
@@ -696,6 +697,9 @@ class Character:
         if self.prefs.avatar.icon_color == 'black':
             self.prefs.avatar.icon_color = default_character_color(self.id)
 
+    def has_avatar(self) -> bool:
+        return bool(self.avatar) or self.avatar_id is not None
+
     def enneagram(self) -> Optional[SelectionItem]:
         if self.prefs.toggled(NovelSetting.Character_enneagram):
             if self.personality.enneagram:
@@ -1326,10 +1330,7 @@ class CharacterBased(ABC):
         if not self.character_id:
             return None
         if not self._character:
-            for c in novel.characters:
-                if c.id == self.character_id:
-                    self._character = c
-                    break
+            self._character = novel.find_character(self.character_id)
 
         return self._character
 
@@ -1346,9 +1347,7 @@ class SceneBased(ABC):
         if not self.scene_id:
             return None
         if not self._scene:
-            for s in novel.scenes:
-                if s.id == self.scene_id:
-                    return s
+            return novel.find_scene(self.scene_id)
 
 
 def default_plot_value() -> PlotValue:
@@ -1527,10 +1526,7 @@ class Plot(SelectionItem, CharacterBased):
         if not self.relation_character_id:
             return None
         if not self._relation_character:
-            for c in novel.characters:
-                if c.id == self.relation_character_id:
-                    self._relation_character = c
-                    break
+            self._relation_character = novel.find_character(self.relation_character_id)
 
         return self._relation_character
 
@@ -2255,7 +2251,7 @@ class Scene:
 
     def title_or_index(self, novel: 'Novel') -> str:
         prefix = 'Scene' if novel.prefs.is_scenes_organization() else 'Chapter'
-        return self.title if self.title else f'{prefix} {novel.scenes.index(self) + 1}'
+        return self.title if self.title else f'{prefix} {novel.scene_index(self) + 1}'
 
     def link_plot(self, plot: Plot) -> ScenePlotReference:
         ref = ScenePlotReference(plot)
@@ -3723,16 +3719,12 @@ class MiceThread:
     def beginning_scene(self, novel: 'Novel') -> Optional['Scene']:
         if not self.beginning_scene_id:
             return None
-        for s in novel.scenes:
-            if s.id == self.beginning_scene_id:
-                return s
+        return novel.find_scene(self.beginning_scene_id)
 
     def ending_scene(self, novel: 'Novel') -> Optional['Scene']:
         if not self.ending_scene_id:
             return None
-        for s in novel.scenes:
-            if s.id == self.ending_scene_id:
-                return s
+        return novel.find_scene(self.ending_scene_id)
 
 
 @dataclass_json(undefined=Undefined.EXCLUDE)
@@ -3910,6 +3902,7 @@ def default_productivity_categories() -> List[ProductivityType]:
     ]
 
 
+@dataclass_json(undefined=Undefined.EXCLUDE)
 @dataclass
 class DailyProductivity:
     overall_days: int = 0
@@ -4213,6 +4206,7 @@ class Diagram:
     def __post_init__(self):
         self.loaded: bool = False
         self.data: Optional[DiagramData] = None
+        self.journal_size: int = 0
 
     @overrides
     def __eq__(self, other: 'Diagram'):
@@ -4225,6 +4219,77 @@ class Diagram:
         return hash(str(self.id))
 
 
+def connector_key(connector: Connector) -> str:
+    """Connectors have no id but their endpoints never change, therefore they identify the connector."""
+    return f'{connector.source_id}:{connector.target_id}:{float(connector.source_angle)!r}:' \
+           f'{float(connector.target_angle)!r}'
+
+
+@dataclass
+class DiagramChanges:
+    """Nodes and connectors of a diagram that changed since it was last saved.
+
+    The changed entities are kept by reference, so a node that is edited several times is recorded once."""
+    nodes: Dict[uuid.UUID, Node] = field(default_factory=dict)
+    removed_nodes: Set[uuid.UUID] = field(default_factory=set)
+    connectors: Dict[str, Connector] = field(default_factory=dict)
+    removed_connectors: Set[str] = field(default_factory=set)
+
+    def __len__(self):
+        return len(self.nodes) + len(self.removed_nodes) + len(self.connectors) + len(self.removed_connectors)
+
+    def update_node(self, node: Node):
+        self.removed_nodes.discard(node.id)
+        self.nodes[node.id] = node
+
+    def remove_node(self, node: Node):
+        self.nodes.pop(node.id, None)
+        self.removed_nodes.add(node.id)
+
+    def update_connector(self, connector: Connector):
+        key = connector_key(connector)
+        self.removed_connectors.discard(key)
+        self.connectors[key] = connector
+
+    def remove_connector(self, connector: Connector):
+        key = connector_key(connector)
+        self.connectors.pop(key, None)
+        self.removed_connectors.add(key)
+
+    def merge(self, changes: 'DiagramChanges'):
+        for node_id in changes.removed_nodes:
+            self.nodes.pop(node_id, None)
+        self.removed_nodes.update(changes.removed_nodes)
+        for node in changes.nodes.values():
+            self.update_node(node)
+        for key in changes.removed_connectors:
+            self.connectors.pop(key, None)
+        self.removed_connectors.update(changes.removed_connectors)
+        for connector in changes.connectors.values():
+            self.update_connector(connector)
+
+    def apply(self, data: DiagramData):
+        if self.removed_nodes:
+            data.nodes = [x for x in data.nodes if x.id not in self.removed_nodes]
+        if self.nodes:
+            indexes = {x.id: i for i, x in enumerate(data.nodes)}
+            for node_id, node in self.nodes.items():
+                if node_id in indexes:
+                    data.nodes[indexes[node_id]] = node
+                else:
+                    data.nodes.append(node)
+
+        if self.removed_connectors:
+            data.connectors = [x for x in data.connectors if connector_key(x) not in self.removed_connectors]
+        if self.connectors:
+            indexes = {connector_key(x): i for i, x in enumerate(data.connectors)}
+            for key, connector in self.connectors.items():
+                if key in indexes:
+                    data.connectors[indexes[key]] = connector
+                else:
+                    data.connectors.append(connector)
+
+
 def default_character_networks() -> List[Diagram]:
     return [Diagram('Character relations', id=uuid.UUID('bfd1f2d3-cb33-48a6-a09e-b4332c3d1ed1'))]
 
@@ -4386,6 +4451,47 @@ class NovelInfo:
     spice: int = 1
 
 
+class NovelSection(Enum):
+    Info = 0
+    Structures = 1
+    Board = 2
+    ManuscriptProgress = 3
+    Productivity = 4
+
+
+class IdIndex:
+    """Maps the ids of a list's elements to their positions.
+
+    Every hit is verified against the list, and the positions are rebuilt when the verification fails. A miss
+    rebuilds the positions only if the list was resized or replaced since the last rebuild, or if the index was
+    invalidated, so that looking up a missing id stays constant time too. The paths that insert and remove elements
+    in the same step therefore invalidate the index, while reordering the list needs no invalidation.
+    """
+
+    def __init__(self):
+        self._positions: Dict[uuid.UUID, int] = {}
+        self._length: int = -1
+        self._items_id: int = 0
+
+    def invalidate(self):
+        self._length = -1
+
+    def position(self, items: List[Any], id_: uuid.UUID) -> int:
+        i = self._positions.get(id_)
+        if i is not None and i < len(items) and items[i].id == id_:
+            return i
+        if i is None and self._length == len(items) and self._items_id == id(items):
+            return -1
+        self._positions = {x.id: i for i, x in enumerate(items)}
+        self._length = len(items)
+        self._items_id = id(items)
+        return self._positions.get(id_, -1)
+
+    def find(self, items: List[Any], id_: uuid.UUID) -> Optional[Any]:
+        i = self.position(items, id_)
+        return items[i] if i >= 0 else None
+
+
 @dataclass
 class Novel(NovelDescriptor):
     story_structures: List[StoryStructure] = field(default_factory=list)
@@ -4415,6 +4521,24 @@ class Novel(NovelDescriptor):
     productivity: DailyProductivity = field(default_factory=DailyProductivity)
     descriptors: NovelInfo = field(default_factory=NovelInfo)
 
+    def __post_init__(self):
+        super().__post_init__()
+        self._dirty_sections: Set[NovelSection] = set()
+        self._scenes_index = IdIndex()
+        self._characters_index = IdIndex()
+        self._plots_index = IdIndex()
+
+    def mark_dirty(self, *sections: NovelSection):
+        if sections:
+            self._dirty_sections.update(sections)
+        else:
+            self._dirty_sections.update(NovelSection)
+
+    def pop_dirty_sections(self) -> Set[NovelSection]:
+        sections = self._dirty_sections
+        self._dirty_sections = set()
+        return sections
+
     def pov_characters(self) -> List[Character]:
         pov_ids = set()
         povs: List[Character] = []
@@ -4464,10 +4588,25 @@ class Novel(NovelDescriptor):
     def scenes_in_chapter(self, chapter: Chapter) -> List[Scene]:
         return [x for x in self.scenes if x.chapter is chapter]
 
+    def invalidate_index(self):
+        self._scenes_index.invalidate()
+        self._characters_index.invalidate()
+        self._plots_index.invalidate()
+
     def find_character(self, id_: uuid.UUID) -> Optional[Character]:
-        for char_ in self.characters:
-            if char_.id == id_:
-                return char_
+        return self._characters_index.find(self.characters, id_)
+
+    def find_scene(self, id_: uuid.UUID) -> Optional[Scene]:
+        return self._scenes_index.find(self.scenes, id_)
+
+    def find_plot(self, id_: uuid.UUID) -> Optional[Plot]:
+        return self._plots_index.find(self.plots, id_)
+
+    def scene_index(self, scene: Scene) -> int:
+        i = self._scenes_index.position(self.scenes, scene.id)
+        if i < 0:
+            raise ValueError(f'Scene {scene.id} is not in the novel')
+        return i
 
     @staticmethod
     def new_scene(title: str = '') -> Scene:
@@ -4499,7 +4638,7 @@ class Novel(NovelDescriptor):
         return Novel(title, icon='ph.books', story_type=StoryType.Series)
 
     def insert_scene_after(self, scene: Scene, chapter: Optional[Chapter] = None) -> Scene:
-        i = self.scenes.index(scene)
+        i = self.scene_index(scene)
         day = scene.day
 
         new_scene = self.new_scene()
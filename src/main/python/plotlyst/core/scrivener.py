@@ -17,17 +17,18 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import html
 import os
 import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Dict, Set
 from uuid import UUID
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
 
 import pypandoc
-from PyQt6.QtGui import QTextDocument, QTextBlockFormat, QTextCursor
 
 from plotlyst.common import camel_to_whitespace, DEFAULT_MANUSCRIPT_INDENT, \
     DEFAULT_MANUSCRIPT_LINE_SPACE
@@ -42,15 +43,30 @@ class ScrivenerParsingError(Exception):
 
 
 class ScrivenerParser:
+    MAX_CONVERSIONS: int = 4
 
-    def parse_project(self, folder: str) -> Novel:
+    def __init__(self):
+        self.stamps: Dict[str, str] = {}
+        self.unchanged: Set[UUID] = set()
+        self._content_paths: Dict[UUID, Path] = {}
+
+    def parse_project(self, folder: str, previous_stamps: Optional[Dict[str, str]] = None) -> Novel:
+        """Parses the Scrivener project under the given folder.
+
+        The RTF documents are converted concurrently. If the stamps (modification time and size) of a previous parse
+        are given, the scene documents that did not change since are skipped: their scenes are listed in unchanged
+        and have no manuscript. The stamps of the current parse are kept in stamps.
+        """
         scrivener_file = self.find_scrivener_file(folder)
         if not scrivener_file:
             raise ValueError(f'Could not find main Scrivener file with .scrivx extension under given folder: {folder}')
 
+        self.stamps = {}
+        self.unchanged = set()
+        self._content_paths = {}
         novel = self._parse_scrivx(Path(folder).joinpath(scrivener_file), Path(folder).joinpath('Files/Data'))
 
-        self._applyManuscriptFormat(novel)
+        self._load_manuscripts(novel, previous_stamps if previous_stamps else {})
 
         novel.import_origin = ImportOrigin(ImportOriginType.SCRIVENER, source=folder, source_id=novel.id)
         novel.id = uuid.uuid4()
@@ -152,7 +168,9 @@ class ScrivenerParser:
         scene = Novel.new_scene(title)
         scene.id = UUID(uuid_)
         scene.synopsis = self._find_synopsis(scene.id, data_folder)
-        scene.manuscript = self._find_content(scene.id, data_folder)
+        content_path = self._find_content(scene.id, data_folder)
+        if content_path:
+            self._content_paths[scene.id] = content_path
         return scene
 
     def _parse_character(self, element: Element, data_folder: Path) -> Optional[Character]:
@@ -196,41 +214,73 @@ class ScrivenerParser:
 
         return ''
 
-    def _find_content(self, id: UUID, data_folder: Path) -> Optional[Document]:
+    def _find_content(self, id: UUID, data_folder: Path) -> Optional[Path]:
         id_folder = data_folder.joinpath(str(id).upper())
         if id_folder.exists():
             content_path = id_folder.joinpath('content.rtf')
             if content_path.exists():
-                with open(content_path, encoding='utf8') as content_file:
-                    rtf_str = content_file.read()
-                    rtf_str = replace_backslash_with_par(rtf_str)
-                    text = pypandoc.convert_text(rtf_str, to='html', format='rtf')
-
-                    doc = Document('')
-                    doc.content = text
-                    doc.loaded = True
-                    return doc
-
-    def _applyManuscriptFormat(self, novel: Novel):
-        blockFmt = QTextBlockFormat()
-        blockFmt.setTextIndent(DEFAULT_MANUSCRIPT_INDENT)
-        blockFmt.setLineHeight(DEFAULT_MANUSCRIPT_LINE_SPACE, 1)
-        blockFmt.setLeftMargin(0)
-        blockFmt.setTopMargin(0)
-        blockFmt.setRightMargin(0)
-        blockFmt.setBottomMargin(0)
+                return content_path
 
+    def _load_manuscripts(self, novel: Novel, previous_stamps: Dict[str, str]):
+        pending: Dict[Scene, Path] = {}
         for scene in novel.scenes:
-            if scene.manuscript:
-                document = QTextDocument()
-                document.setHtml(scene.manuscript.content)
-                cursor = QTextCursor(document)
-                cursor.clearSelection()
-                cursor.select(QTextCursor.SelectionType.Document)
-                cursor.setBlockFormat(blockFmt)
-
-                scene.manuscript.content = document.toHtml()
-                scene.manuscript.statistics = DocumentStatistics(wc(document.toPlainText()))
+            content_path = self._content_paths.get(scene.id)
+            if content_path is None:
+                continue
+            stat = content_path.stat()
+            stamp = f'{stat.st_mtime_ns}:{stat.st_size}'
+            self.stamps[str(scene.id)] = stamp
+            if previous_stamps.get(str(scene.id)) == stamp:
+                self.unchanged.add(scene.id)
+            else:
+                pending[scene] = content_path
+
+        if not pending:
+            return
+        # each conversion runs in a separate pandoc process
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONVERSIONS, len(pending))) as executor:
+            for scene, doc in zip(pending.keys(), executor.map(self._convert_content, pending.values())):
+                scene.manuscript = doc
+
+    def _convert_content(self, content_path: Path) -> Document:
+        with open(content_path, encoding='utf8') as content_file:
+            rtf_str = content_file.read()
+        rtf_str = replace_backslash_with_par(rtf_str)
+        text = pypandoc.convert_text(rtf_str, to='html', format='rtf')
+
+        doc = Document('')
+        doc.content = apply_manuscript_format(text)
+        doc.statistics = DocumentStatistics(wc(html_to_plain_text(text)))
+        doc.loaded = True
+        return doc
+
+
+_BLOCK_TAG = re.compile(r'<(p|h[1-6]|li|blockquote)(\s[^>]*)?>', re.IGNORECASE)
+_STYLE_ATTR = re.compile(r'\sstyle="([^"]*)"', re.IGNORECASE)
+_TAG = re.compile(r'<[^>]+>')
+_BLOCK_END = re.compile(r'</(p|h[1-6]|li|div|blockquote|pre|tr)>|<br\s*/?>', re.IGNORECASE)
+MANUSCRIPT_BLOCK_STYLE = f'margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; ' \
+                         f'text-indent:{DEFAULT_MANUSCRIPT_INDENT}px; line-height:{DEFAULT_MANUSCRIPT_LINE_SPACE}%;'
+
+
+def apply_manuscript_format(text: str) -> str:
+    """Sets the default manuscript block format (indentation, line spacing, no margins) on every block of the
+    given HTML."""
+
+    def style_block(match: re.Match) -> str:
+        tag, attrs = match.group(1), match.group(2) or ''
+        style = _STYLE_ATTR.search(attrs)
+        if style:
+            attrs = attrs[:style.start()] + attrs[style.end():]
+            return f'<{tag}{attrs} style="{style.group(1).rstrip("; ")}; {MANUSCRIPT_BLOCK_STYLE}">'
+        return f'<{tag}{attrs} style="{MANUSCRIPT_BLOCK_STYLE}">'
+
+    return _BLOCK_TAG.sub(style_block, text)
+
+
+def html_to_plain_text(text: str) -> str:
+    text = _BLOCK_END.sub('\n', text)
+    return html.unescape(_TAG.sub('', text))
 
 
 def replace_backslash_with_par(rtf_text: str):
@@ -0,0 +1,281 @@
+"""
+Plotlyst
+Copyright (C) 2021-2024  Zsolt Kovari
+
+This file is part of Plotlyst.
+
+Plotlyst is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Plotlyst is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Iterator
+
+from atomicwrites import atomic_write
+
+PACK_FILE_NAME = 'workspace.plotlyst-pack'
+PACKED_EXTENSIONS = ('.json', '.jsonl', '.html')
+
+
+class WorkspaceStorage(ABC):
+    """Stores the text documents (JSON and HTML) of a workspace. Paths are absolute paths under the workspace root."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @abstractmethod
+    def read(self, path: Path) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def write(self, path: Path, data: str):
+        pass
+
+    def append(self, path: Path, data: str):
+        self.write(path, (self.read(path) or '') + data)
+
+    @abstractmethod
+    def delete(self, path: Path):
+        pass
+
+    def exists(self, path: Path) -> bool:
+        return self.read(path) is not None
+
+    def makedirs(self, path: Path):
+        pass
+
+    def preload(self, *paths: Path):
+        pass
+
+    def clear_preloaded(self):
+        pass
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        yield
+
+    def close(self):
+        pass
+
+
+class DirectoryStorage(WorkspaceStorage):
+    """The default layout: one file per document."""
+
+    def read(self, path: Path) -> Optional[str]:
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as file:
+            return file.read()
+
+    def write(self, path: Path, data: str):
+        with atomic_write(path, encoding='utf-8', overwrite=True) as f:
+            f.write(data)
+
+    def append(self, path: Path, data: str):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(data)
+
+    def delete(self, path: Path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def exists(self, path: Path) -> bool:
+        return os.path.exists(path)
+
+    def makedirs(self, path: Path):
+        if not path.exists():
+            path.mkdir(parents=True)
+
+
+class PackedStorage(WorkspaceStorage):
+    """Keeps every document of the workspace in a single SQLite file.
+
+    Reads go through SQLite's memory-mapped I/O, and preload() fetches a whole novel with one range scan.
+    Writes are grouped into transactions, and the free pages left by rewritten documents are released
+    periodically with an incremental vacuum.
+    """
+    MMAP_SIZE: int = 256 * 1024 * 1024
+    COMPACTION_INTERVAL: int = 200
+    COMPACTION_RATIO: float = 0.25
+
+    def __init__(self, root: Path):
+        super().__init__(root)
+        self.path = root.joinpath(PACK_FILE_NAME)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._commits = 0
+        self._preloaded: Dict[str, str] = {}
+        self._connection = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        self._connection.execute('PRAGMA synchronous = NORMAL')
+        self._connection.execute(f'PRAGMA mmap_size = {self.MMAP_SIZE}')
+        self._connection.execute('CREATE TABLE IF NOT EXISTS documents (path TEXT PRIMARY KEY, data TEXT NOT NULL)')
+        self.compact()
+
+    def read(self, path: Path) -> Optional[str]:
+        key = self._key(path)
+        data = self._preloaded.pop(key, None)
+        if data is not None:
+            return data
+        with self._lock:
+            row = self._connection.execute('SELECT data FROM documents WHERE path = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def write(self, path: Path, data: str):
+        key = self._key(path)
+        with self.transaction():
+            self._preloaded.pop(key, None)
+            self._connection.execute('INSERT OR REPLACE INTO documents (path, data) VALUES (?, ?)', (key, data))
+
+    def append(self, path: Path, data: str):
+        key = self._key(path)
+        with self.transaction():
+            self._preloaded.pop(key, None)
+            self._connection.execute('INSERT INTO documents (path, data) VALUES (?, ?) '
+                                     'ON CONFLICT(path) DO UPDATE SET data = data || excluded.data', (key, data))
+
+    def delete(self, path: Path):
+        key = self._key(path)
+        with self.transaction():
+            self._preloaded.pop(key, None)
+            self._connection.execute('DELETE FROM documents WHERE path = ?', (key,))
+
+    def exists(self, path: Path) -> bool:
+        key = self._key(path)
+        if key in self._preloaded:
+            return True
+        with self._lock:
+            row = self._connection.execute('SELECT 1 FROM documents WHERE path = ?', (key,)).fetchone()
+        return row is not None
+
+    def preload(self, *paths: Path):
+        for path in paths:
+            prefix = self._key(path) + '/'
+            with self._lock:
+                rows = self._connection.execute('SELECT path, data FROM documents WHERE path >= ? AND path < ?',
+                                                (prefix, prefix[:-1] + '0')).fetchall()
+            self._preloaded.update(rows)
+
+    def clear_preloaded(self):
+        self._preloaded.clear()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        with self._lock:
+            if self._depth == 0:
+                self._connection.execute('BEGIN IMMEDIATE')
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute('ROLLBACK')
+                raise
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute('COMMIT')
+                    self._commits += 1
+                    if self._commits % self.COMPACTION_INTERVAL == 0:
+                        self.compact()
+
+    def compact(self):
+        with self._lock:
+            pages = self._connection.execute('PRAGMA page_count').fetchone()[0]
+            free = self._connection.execute('PRAGMA freelist_count').fetchone()[0]
+            if pages and free / pages >= self.COMPACTION_RATIO:
+                # executescript steps the pragma to completion; execute() would release a single page
+                self._connection.executescript('PRAGMA incremental_vacuum;')
+
+    def close(self):
+        with self._lock:
+            self._preloaded.clear()
+            self._connection.close()
+
+    def import_directory(self):
+        """Copies the JSON and HTML documents of the directory layout into the pack."""
+        with self.transaction():
+            for path in _document_files(self.root):
+                with open(path, encoding='utf-8') as file:
+                    self.write(path, file.read())
+
+    def export_directory(self):
+        """Writes every packed document back to its place in the directory layout."""
+        with self._lock:
+            rows = self._connection.execute('SELECT path, data FROM documents').fetchall()
+        for key, data in rows:
+            path = self.root.joinpath(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_write(path, encoding='utf-8', overwrite=True) as f:
+                f.write(data)
+
+    def _key(self, path: Path) -> str:
+        return Path(path).relative_to(self.root).as_posix()
+
+
+def is_packed(workspace: str) -> bool:
+    return os.path.exists(os.path.join(workspace, PACK_FILE_NAME))
+
+
+def open_storage(workspace: str) -> WorkspaceStorage:
+    root = Path(workspace)
+    if is_packed(workspace):
+        return PackedStorage(root)
+    return DirectoryStorage(root)
+
+
+def pack_workspace(workspace: str):
+    """Converts a workspace from the directory layout into the packed format. The packed documents are removed
+    from the directory layout only after they have been committed to the pack."""
+    storage = PackedStorage(Path(workspace))
+    try:
+        storage.import_directory()
+    except Exception:
+        storage.close()
+        _remove_pack(workspace)
+        raise
+    storage.close()
+    for path in _document_files(Path(workspace)):
+        os.remove(path)
+
+
+def unpack_workspace(workspace: str):
+    """Converts a packed workspace back into the directory layout."""
+    storage = PackedStorage(Path(workspace))
+    try:
+        storage.export_directory()
+    finally:
+        storage.close()
+    _remove_pack(workspace)
+
+
+def _remove_pack(workspace: str):
+    for suffix in ('', '-journal'):
+        path = os.path.join(workspace, PACK_FILE_NAME + suffix)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _document_files(root: Path) -> Iterator[Path]:
+    novels_dir = root.joinpath('novels')
+    if not novels_dir.exists():
+        return
+    for dirpath, _, filenames in os.walk(novels_dir):
+        for filename in filenames:
+            if filename.endswith(PACKED_EXTENSIONS):
+                yield Path(dirpath).joinpath(filename)
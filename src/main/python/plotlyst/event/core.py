@@ -20,7 +20,7 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from abc import abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 
 from PyQt6.QtCore import pyqtSignal, QObject, QTimer
 
@@ -91,6 +91,10 @@ class EventListener:
     def event_received(self, event: Event):
         pass
 
+    def events_received(self, events: List[Event]):
+        for event in events:
+            self.event_received(event)
+
 
 def emit_global_event(event: Event):
     global_event_sender.send.emit(event)
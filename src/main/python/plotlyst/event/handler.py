@@ -19,8 +19,12 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import asyncio
 import logging
+import os
+import time
 import traceback
-from typing import Optional, List, Dict, TypeVar
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from typing import Optional, List, Dict, TypeVar, Type, Tuple
 
 from PyQt6.QtCore import QTimer, Qt, QObject
 from PyQt6.QtGui import QCursor
@@ -90,34 +94,140 @@ def handle_exception(exception_type, exception_value: Exception, exception_trace
 TEvent = TypeVar('TEvent', bound=Event)
 
 
+@dataclass
+class ListenerTiming:
+    calls: int = 0
+    total_ms: float = 0
+    max_ms: float = 0
+
+
+def _coalescing_key(event: Event) -> Tuple:
+    key = [type(event), id(event.source)]
+    for field in fields(event):
+        if field.name == 'source':
+            continue
+        value = getattr(event, field.name)
+        try:
+            hash(value)
+        except TypeError:
+            value = id(value)
+        key.append(value)
+    return tuple(key)
+
+
 class EventDispatcher:
+    """Delivers the emitted events to the registered listeners.
+
+    A listener registered for an event type receives its subclasses too. Inside a batch() the events are queued and
+    the same event emitted again by the same source for the same entities is coalesced. At the end of the batch each
+    listener receives its events at once via events_received(), so that a view may refresh only once.
+
+    The time spent in each listener is recorded if the PLOTLYST_EVENT_TIMING environment variable is set.
+    """
+    SLOW_LISTENER_MS: float = 50
 
     def __init__(self):
-        self._listeners: Dict[TEvent, List[EventListener]] = {}
+        self._listeners: Dict[Type[TEvent], List[EventListener]] = {}
+        self._resolved: Dict[Type[TEvent], List[EventListener]] = {}
+        self._batch_depth: int = 0
+        self._queue: Dict[Tuple, Event] = {}
+        self._timings: Optional[Dict[Tuple[str, str], ListenerTiming]] = None
+        self.set_timing_enabled(bool(os.getenv('PLOTLYST_EVENT_TIMING')))
 
     def register(self, listener: EventListener, *event_types):
         for event_type in event_types:
             if event_type not in self._listeners.keys():
                 self._listeners[event_type] = []
             self._listeners[event_type].append(listener)
+        self._resolved.clear()
         if isinstance(listener, QObject):
             listener.destroyed.connect(lambda: self.deregister(listener, *event_types))
 
     def clear(self):
         self._listeners.clear()
+        self._resolved.clear()
+        self._queue.clear()
 
     def deregister(self, listener: EventListener, *event_types):
         for event_type in event_types:
             if event_type not in self._listeners.keys():
-                return
+                continue
             if listener in self._listeners[event_type]:
                 self._listeners[event_type].remove(listener)
+        self._resolved.clear()
 
     def dispatch(self, event: Event):
-        if type(event) in self._listeners.keys():
-            for listener in self._listeners[type(event)]:
+        if self._batch_depth:
+            key = _coalescing_key(event)
+            self._queue.pop(key, None)
+            self._queue[key] = event
+            return
+
+        for listener in self._listeners_of(type(event)):
+            if event.source != listener:
+                self._deliver(listener, [event])
+
+    @contextmanager
+    def batch(self):
+        """Queues the events dispatched within the block and delivers them when the outermost batch ends."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush()
+
+    def set_timing_enabled(self, enabled: bool):
+        self._timings = {} if enabled else None
+
+    def timings(self) -> Dict[Tuple[str, str], ListenerTiming]:
+        """The recorded time per listener class and event type, if timing is enabled."""
+        return dict(self._timings) if self._timings is not None else {}
+
+    def _flush(self):
+        events = list(self._queue.values())
+        self._queue.clear()
+
+        grouped: Dict[int, Tuple[EventListener, List[Event]]] = {}
+        for event in events:
+            for listener in self._listeners_of(type(event)):
                 if event.source != listener:
-                    listener.event_received(event)
+                    grouped.setdefault(id(listener), (listener, []))[1].append(event)
+        for listener, listener_events in grouped.values():
+            self._deliver(listener, listener_events)
+
+    def _listeners_of(self, event_type: Type[TEvent]) -> List[EventListener]:
+        listeners = self._resolved.get(event_type)
+        if listeners is None:
+            listeners = []
+            for type_ in event_type.__mro__:
+                for listener in self._listeners.get(type_, []):
+                    if listener not in listeners:
+                        listeners.append(listener)
+            self._resolved[event_type] = listeners
+        return listeners
+
+    def _deliver(self, listener: EventListener, events: List[Event]):
+        start = time.perf_counter() if self._timings is not None else 0
+        if len(events) == 1:
+            listener.event_received(events[0])
+        elif isinstance(listener, EventListener):
+            listener.events_received(events)
+        else:
+            for event in events:
+                listener.event_received(event)
+        if self._timings is not None:
+            self._record_timing(listener, events, (time.perf_counter() - start) * 1000)
+
+    def _record_timing(self, listener: EventListener, events: List[Event], elapsed: float):
+        event_name = type(events[0]).__name__ if len(events) == 1 else f'batch of {len(events)}'
+        timing = self._timings.setdefault((type(listener).__name__, event_name), ListenerTiming())
+        timing.calls += 1
+        timing.total_ms += elapsed
+        timing.max_ms = max(timing.max_ms, elapsed)
+        if elapsed > self.SLOW_LISTENER_MS:
+            logging.warning(f'{type(listener).__name__} took {elapsed:.1f} ms to handle {event_name}')
 
 
 class EventDispatchersRepository:
@@ -18,7 +18,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from abc import abstractmethod
-from typing import List, Any, Set, Optional, Dict
+from typing import List, Any, Set, Optional, Dict, Tuple, Iterable
 
 from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, QAbstractItemModel, QSortFilterProxyModel, pyqtSignal, \
     QVariant
@@ -281,6 +281,11 @@ class DefaultSelectionItemsModel(SelectionItemsModel):
 
 
 class DistributionModel(QAbstractTableModel):
+    """Rows are story elements (characters, tags, etc.), columns are the scenes after the two header columns.
+
+    Matches are kept in an incidence matrix: one integer bitset per row with a bit for every scene. The matrix is
+    rebuilt on model reset or when its shape changes, and single scenes are updated with updateScene().
+    """
     SortRole: int = Qt.ItemDataRole.UserRole + 1
     SceneRole: int = Qt.ItemDataRole.UserRole + 2
 
@@ -294,6 +299,10 @@ class DistributionModel(QAbstractTableModel):
         self._highlighted_tags: List[QModelIndex] = []
         self._active_brush = QBrush(QColor(PLOTLYST_SECONDARY_COLOR))
         self._inactive_brush = QBrush(QColor(Qt.GlobalColor.lightGray))
+        self._incidence: Optional[List[int]] = None
+        self._incidence_shape: Tuple[int, int] = (0, 0)
+        self._highlight_mask: Optional[int] = None
+        self.modelReset.connect(self._invalidateIncidence)
 
     @overrides
     def columnCount(self, parent: QModelIndex = None) -> int:
@@ -313,11 +322,7 @@ class DistributionModel(QAbstractTableModel):
                 else:
                     return self._dataForTag(index, role)
             elif role == self.SortRole:
-                count = 0
-                for i, _ in enumerate(self.novel.scenes):
-                    if self._match_by_row_col(index.row(), i + 2):
-                        count += 1
-                return count
+                return bin(self._row_bits(index.row())).count('1')
             else:
                 return self._dataForTag(index, role)
         elif index.column() == self.IndexMeta:
@@ -333,7 +338,7 @@ class DistributionModel(QAbstractTableModel):
                     if self._highlighted_scene.column() != index.column():
                         return self._inactive_brush
                 if self._highlighted_tags:
-                    if not all([self._match_by_row_col(x.row(), index.column()) for x in self._highlighted_tags]):
+                    if not self._highlightMask() >> (index.column() - 2) & 1:
                         return self._inactive_brush
                 return self._active_brush
         return QVariant()
@@ -343,21 +348,20 @@ class DistributionModel(QAbstractTableModel):
         flags = super().flags(index)
 
         if self._highlighted_scene and index.column() == self.IndexTags:
-            if not self._match_by_row_col(index.row(), self._highlighted_scene.column()):
+            if not self._hit(index.row(), self._highlighted_scene.column()):
                 return Qt.ItemFlag.NoItemFlags
 
         return flags
 
     def commonScenes(self) -> int:
-        matches = 0
-        for y in range(2, self.columnCount()):
-            if all(self._match_by_row_col(x.row(), y) for x in self._highlighted_tags):
-                matches += 1
-        return matches
+        if not self._highlighted_tags:
+            return len(self.novel.scenes)
+        return bin(self._highlightMask()).count('1')
 
     def highlightTags(self, indexes: List[QModelIndex]):
         self._highlighted_tags = indexes
         self._highlighted_scene = None
+        self._highlight_mask = None
         self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
 
     def highlightScene(self, index: QModelIndex):
@@ -367,10 +371,83 @@ class DistributionModel(QAbstractTableModel):
             self._highlighted_scene = None
 
         self._highlighted_tags.clear()
+        self._highlight_mask = None
         self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
 
+    def updateScene(self, scene: Scene):
+        if self._incidence is None:
+            return
+        try:
+            column = self.novel.scene_index(scene)
+        except ValueError:
+            self._invalidateIncidence()
+            return
+        if self._incidence_shape != (self.rowCount(), len(self.novel.scenes)):
+            self._invalidateIncidence()
+            return
+
+        bit = 1 << column
+        rows = set(self._rows_for_scene(scene, column, self._row_lookup()))
+        for row in range(len(self._incidence)):
+            if row in rows:
+                self._incidence[row] |= bit
+            else:
+                self._incidence[row] &= ~bit
+        self._highlight_mask = None
+        emit_column_changed(self, self.IndexTags)
+        emit_column_changed(self, column + 2)
+
     def _match(self, index: QModelIndex):
-        return self._match_by_row_col(index.row(), index.column())
+        return self._hit(index.row(), index.column())
+
+    def _hit(self, row: int, column: int) -> bool:
+        if column < 2:
+            return False
+        return bool(self._row_bits(row) >> (column - 2) & 1)
+
+    def _row_bits(self, row: int) -> int:
+        incidence = self._matrix()
+        if 0 <= row < len(incidence):
+            return incidence[row]
+        return 0
+
+    def _highlightMask(self) -> int:
+        if self._highlight_mask is None:
+            mask = (1 << len(self.novel.scenes)) - 1
+            for index in self._highlighted_tags:
+                mask &= self._row_bits(index.row())
+            self._highlight_mask = mask
+        return self._highlight_mask
+
+    def _matrix(self) -> List[int]:
+        shape = (self.rowCount(), len(self.novel.scenes))
+        if self._incidence is None or self._incidence_shape != shape:
+            incidence = [0] * shape[0]
+            lookup = self._row_lookup()
+            for column, scene in enumerate(self.novel.scenes):
+                bit = 1 << column
+                for row in self._rows_for_scene(scene, column, lookup):
+                    incidence[row] |= bit
+            self._incidence = incidence
+            self._incidence_shape = shape
+            self._highlight_mask = None
+        return self._incidence
+
+    def _invalidateIncidence(self):
+        self._incidence = None
+        self._highlight_mask = None
+
+    def _row_lookup(self) -> Optional[Dict[Any, int]]:
+        """Maps the row keys to rows, or returns None if the model matches cell by cell."""
+        return None
+
+    def _scene_keys(self, scene: Scene) -> Iterable[Any]:
+        return []
+
+    def _rows_for_scene(self, scene: Scene, column: int, lookup: Optional[Dict[Any, int]]) -> Iterable[int]:
+        if lookup is None:
+            return [row for row in range(self.rowCount()) if self._match_by_row_col(row, column + 2)]
+        return {lookup[key] for key in self._scene_keys(scene) if key in lookup}
 
     @abstractmethod
     def _dataForTag(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
@@ -17,12 +17,14 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from typing import Optional, Dict, Any, Iterable, List
+
 from PyQt6.QtCore import QModelIndex, Qt
 from PyQt6.QtGui import QBrush, QColor
 from overrides import overrides
 
 from plotlyst.common import PLOTLYST_MAIN_COLOR
-from plotlyst.core.domain import Tag, Goal, Novel, ReaderInformationType
+from plotlyst.core.domain import Tag, Goal, Novel, ReaderInformationType, Scene
 from plotlyst.model.common import DistributionModel
 from plotlyst.view.common import text_color_with_bg_color
 from plotlyst.view.icons import avatars, IconRegistry
@@ -49,6 +51,17 @@ class CharactersScenesDistributionTableModel(DistributionModel):
         pov = self.novel.characters[row] == self.novel.scenes[column - 2].pov
         return in_char or pov
 
+    @overrides
+    def _row_lookup(self) -> Optional[Dict[Any, int]]:
+        return {x.id: i for i, x in enumerate(self.novel.characters)}
+
+    @overrides
+    def _scene_keys(self, scene: Scene) -> Iterable[Any]:
+        if scene.pov:
+            yield scene.pov.id
+        for character in scene.characters:
+            yield character.id
+
 
 class GoalScenesDistributionTableModel(DistributionModel):
 
@@ -85,6 +98,7 @@ class GoalScenesDistributionTableModel(DistributionModel):
 
 
 class InformationScenesDistributionTableModel(DistributionModel):
+    RevelationRow: str = 'revelation'
 
     def __init__(self, novel: Novel, parent=None):
         super().__init__(novel, parent)
@@ -121,6 +135,18 @@ class InformationScenesDistributionTableModel(DistributionModel):
 
         return False
 
+    @overrides
+    def _row_lookup(self) -> Optional[Dict[Any, int]]:
+        return {self.RevelationRow: 0, ReaderInformationType.Story: 1, ReaderInformationType.Character: 2,
+                ReaderInformationType.World: 3}
+
+    @overrides
+    def _scene_keys(self, scene: Scene) -> Iterable[Any]:
+        for info in scene.info:
+            if info.revelation:
+                yield self.RevelationRow
+            yield info.type
+
 
 class TagScenesDistributionTableModel(DistributionModel):
 
@@ -148,5 +174,16 @@ class TagScenesDistributionTableModel(DistributionModel):
     def _match_by_row_col(self, row: int, column: int):
         return self._tag(row) in self.novel.scenes[column - 2].tags(self.novel)
 
+    @overrides
+    def _row_lookup(self) -> Optional[Dict[Any, int]]:
+        return {x: i for i, x in enumerate(self._tags())}
+
+    @overrides
+    def _scene_keys(self, scene: Scene) -> Iterable[Any]:
+        return scene.tags(self.novel)
+
     def _tag(self, row: int) -> Tag:
-        return [item for sublist in self.novel.tags.values() for item in sublist][row]
+        return self._tags()[row]
+
+    def _tags(self) -> List[Tag]:
+        return [item for sublist in self.novel.tags.values() for item in sublist]
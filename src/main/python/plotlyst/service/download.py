@@ -0,0 +1,136 @@
+"""
+Plotlyst
+Copyright (C) 2021-2025  Zsolt Kovari
+
+This file is part of Plotlyst.
+
+Plotlyst is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Plotlyst is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional, Any, Dict
+
+import requests
+from atomicwrites import atomic_write
+from requests.adapters import HTTPAdapter
+
+from plotlyst.env import app_env
+
+
+@dataclass
+class CachedResponse:
+    content: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HttpCache:
+    """On-disk cache of downloaded documents. Each URL is kept as a content file and a metadata file that holds
+    the validators (ETag, Last-Modified) sent back to the server on the next request."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        content_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(content_path, 'rb') as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url:
+            return None
+        return CachedResponse(content, meta.get('etag'), meta.get('last_modified'))
+
+    def put(self, url: str, response: CachedResponse):
+        content_path, meta_path = self._paths(url)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with atomic_write(content_path, mode='wb', overwrite=True) as f:
+                f.write(response.content)
+            with atomic_write(meta_path, encoding='utf-8', overwrite=True) as f:
+                json.dump({'url': url, 'etag': response.etag, 'last_modified': response.last_modified}, f)
+        except OSError:
+            logging.exception('Could not cache download of %s', url)
+
+    def _paths(self, url: str):
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.path, name), os.path.join(self.path, f'{name}.json')
+
+
+class HttpClient:
+    """Shared HTTP client with a connection pool and a conditional-request cache.
+
+    Cached documents are revalidated with If-None-Match/If-Modified-Since, so an unchanged document costs a
+    304 response only. If the server cannot be reached, the cached copy is returned.
+    """
+    MAX_CONNECTIONS: int = 8
+
+    def __init__(self, cache: Optional[HttpCache] = None, timeout: float = 10):
+        self.cache = cache
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.MAX_CONNECTIONS)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def get(self, url: str) -> bytes:
+        cached = self.cache.get(url) if self.cache else None
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                headers['If-Modified-Since'] = cached.last_modified
+
+        try:
+            with self._session.get(url, headers=headers, timeout=self.timeout) as response:
+                if cached is not None and response.status_code == 304:
+                    return cached.content
+                response.raise_for_status()
+                content = response.content
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except (requests.ConnectionError, requests.Timeout):
+            if cached is not None:
+                return cached.content
+            raise
+
+        if self.cache and (etag or last_modified):
+            self.cache.put(url, CachedResponse(content, etag, last_modified))
+        return content
+
+    def get_json(self, url: str) -> Any:
+        return json.loads(self.get(url))
+
+    def close(self):
+        self._session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def http_client() -> HttpClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(HttpCache(os.path.join(app_env.cache_dir, 'http')))
+        return _client
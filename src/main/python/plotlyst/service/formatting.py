@@ -0,0 +1,164 @@
+"""
+Plotlyst
+Copyright (C) 2021-2025  Zsolt Kovari
+
+This file is part of Plotlyst.
+
+Plotlyst is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Plotlyst is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+import pypandoc
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable
+from overrides import overrides
+
+
+class LatexBuildCache:
+    """Content-addressed cache of the LaTeX chapters converted from the manuscript.
+
+    A chapter is stored under the hash of its HTML and of the conversion options, so a chapter is converted again
+    only if its text changed. The document itself is rebuilt only if the main file or the list of chapters changed.
+    """
+    PANDOC_FORMAT: str = 'html'
+    PANDOC_TARGET: str = 'latex'
+    PANDOC_ARGS: List[str] = []
+    CHAPTERS_FOLDER: str = 'chapters'
+    MAIN_FILE: str = 'main.tex'
+    STAMP_FILE: str = 'build.stamp'
+
+    def __init__(self, build_dir: str):
+        self.build_dir = build_dir
+        self.chapters_dir = os.path.join(build_dir, self.CHAPTERS_FOLDER)
+        os.makedirs(self.chapters_dir, exist_ok=True)
+
+    def key(self, html: str) -> str:
+        options = json.dumps([self.PANDOC_FORMAT, self.PANDOC_TARGET, self.PANDOC_ARGS])
+        return hashlib.blake2b(f'{options}\n{html}'.encode('utf-8'), digest_size=16).hexdigest()
+
+    def chapter_name(self, key: str) -> str:
+        """The name of a chapter as it is included from the main file."""
+        return f'{self.CHAPTERS_FOLDER}/{key}'
+
+    def chapter_path(self, key: str) -> str:
+        return os.path.join(self.chapters_dir, f'{key}.tex')
+
+    def has(self, key: str) -> bool:
+        return os.path.exists(self.chapter_path(key))
+
+    def convert(self, key: str, html: str):
+        path = self.chapter_path(key)
+        tmp_path = f'{path}.tmp'
+        pypandoc.convert_text(html, to=self.PANDOC_TARGET, format=self.PANDOC_FORMAT, extra_args=self.PANDOC_ARGS,
+                              outputfile=tmp_path)
+        os.replace(tmp_path, path)
+
+    def main_path(self) -> str:
+        return os.path.join(self.build_dir, self.MAIN_FILE)
+
+    def pdf_path(self) -> str:
+        return os.path.splitext(self.main_path())[0] + '.pdf'
+
+    def write_main(self, tex: str):
+        if self._read(self.main_path()) != tex:
+            with open(self.main_path(), 'w', encoding='utf-8') as f:
+                f.write(tex)
+
+    def build_key(self, keys: List[str]) -> str:
+        main = self._read(self.main_path()) or ''
+        return hashlib.blake2b('\n'.join([main, *keys]).encode('utf-8'), digest_size=16).hexdigest()
+
+    def is_built(self, build_key: str) -> bool:
+        return os.path.exists(self.pdf_path()) and self._read(self._stamp_path()) == build_key
+
+    def mark_built(self, build_key: str):
+        with open(self._stamp_path(), 'w', encoding='utf-8') as f:
+            f.write(build_key)
+
+    def prune(self, keys: List[str]):
+        """Removes the converted chapters, and their auxiliary files, that are not part of the manuscript anymore."""
+        used = set(keys)
+        for filename in os.listdir(self.chapters_dir):
+            if filename.split('.', 1)[0] not in used:
+                os.remove(os.path.join(self.chapters_dir, filename))
+
+    def _stamp_path(self) -> str:
+        return os.path.join(self.build_dir, self.STAMP_FILE)
+
+    @staticmethod
+    def _read(path: str) -> Optional[str]:
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+
+class LatexBuildResult(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+
+class LatexBuildWorker(QRunnable):
+    """Converts the changed chapters in parallel, then compiles the document if anything changed.
+
+    Each conversion runs in its own pandoc process, therefore a thread pool is enough to keep them parallel.
+    """
+    MAX_CONVERSIONS: int = 4
+
+    def __init__(self, cache: LatexBuildCache, main_tex: str, chapters: List[Tuple[str, str]], pdflatex: str,
+                 result: LatexBuildResult):
+        super().__init__()
+        self._cache = cache
+        self._main_tex = main_tex
+        self._chapters = chapters
+        self._pdflatex = pdflatex
+        self._result = result
+
+    @overrides
+    def run(self) -> None:
+        try:
+            self._build()
+        except Exception as e:
+            self._result.failed.emit(str(e))
+
+    def _build(self):
+        keys = [key for key, _ in self._chapters]
+        pending = {}
+        for key, html in self._chapters:
+            if not self._cache.has(key):
+                pending[key] = html
+
+        total = len(pending)
+        self._result.progress.emit(0, total)
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_CONVERSIONS, total)) as executor:
+                futures = [executor.submit(self._cache.convert, key, html) for key, html in pending.items()]
+                for done, future in enumerate(as_completed(futures)):
+                    future.result()
+                    self._result.progress.emit(done + 1, total)
+
+        self._cache.write_main(self._main_tex)
+        self._cache.prune(keys)
+        build_key = self._cache.build_key(keys)
+        if not self._cache.is_built(build_key):
+            subprocess.run([self._pdflatex, '-interaction=nonstopmode', self._cache.MAIN_FILE],
+                           cwd=self._cache.build_dir, check=True, stdout=subprocess.DEVNULL)
+            self._cache.mark_built(build_key)
+
+        self._result.finished.emit(self._cache.pdf_path())
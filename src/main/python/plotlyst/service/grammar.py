@@ -17,11 +17,14 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import hashlib
 import logging
-from typing import Optional, Set
+import threading
+from collections import OrderedDict
+from typing import Optional, Set, Tuple, List, Dict, Any
 
 import language_tool_python
-from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal, QThreadPool
 from language_tool_python import LanguageTool
 from language_tool_python.download_lt import LATEST_VERSION
 from overrides import overrides
@@ -86,6 +89,124 @@ class LanguageToolProxy:
 
 language_tool_proxy = LanguageToolProxy()
 
+GrammarCheckKey = Tuple[str, bytes]
+
+
+class GrammarCheckService(QObject):
+    """Checks paragraphs with LanguageTool on a worker pool.
+
+    Results are cached per paragraph, keyed by the language and a hash of the text. A paragraph is checked only
+    once while it is pending or running, even if several blocks ask for it. A request is dropped if every requester
+    cancels it before a worker picks it up; once running, its check is finished and cached regardless. Workers take
+    the most recent request first, so the paragraph being edited doesn't wait behind a full-manuscript recheck.
+    """
+    MAX_WORKERS: int = 2
+    CACHE_SIZE: int = 5000
+    checked = pyqtSignal(object)
+    discarded = pyqtSignal(object)
+    _resultReady = pyqtSignal(object, object)
+    _checkFailed = pyqtSignal(object)
+
+    def __init__(self):
+        super(GrammarCheckService, self).__init__()
+        self._cache: OrderedDict[GrammarCheckKey, List[Any]] = OrderedDict()
+        self._queue: OrderedDict[GrammarCheckKey, str] = OrderedDict()
+        self._requesters: Dict[GrammarCheckKey, int] = {}
+        self._running: Set[GrammarCheckKey] = set()
+        self._lock = threading.Lock()
+        self._workers: int = 0
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(self.MAX_WORKERS)
+        self._resultReady.connect(self._store)
+        self._checkFailed.connect(self._discard)
+
+    @staticmethod
+    def key(text: str, lang: str) -> GrammarCheckKey:
+        return lang, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def cached(self, key: GrammarCheckKey) -> Optional[List[Any]]:
+        matches = self._cache.get(key)
+        if matches is not None:
+            self._cache.move_to_end(key)
+        return matches
+
+    def request(self, key: GrammarCheckKey, text: str):
+        with self._lock:
+            self._requesters[key] = self._requesters.get(key, 0) + 1
+            if key in self._queue:
+                self._queue.move_to_end(key)
+            elif key not in self._running:
+                self._queue[key] = text
+            if self._workers < self.MAX_WORKERS:
+                self._workers += 1
+                self._pool.start(_GrammarCheckRunnable(self))
+
+    def cancel(self, key: GrammarCheckKey):
+        with self._lock:
+            count = self._requesters.get(key, 0) - 1
+            if count > 0:
+                self._requesters[key] = count
+            else:
+                self._requesters.pop(key, None)
+                self._queue.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._queue.keys())
+            self._queue.clear()
+            self._requesters.clear()
+        self._cache.clear()
+        for key in keys:
+            self.discarded.emit(key)
+
+    def _next(self) -> Optional[Tuple[GrammarCheckKey, str]]:
+        with self._lock:
+            if not self._queue:
+                self._workers -= 1
+                return None
+            key, text = self._queue.popitem(last=True)
+            self._running.add(key)
+            return key, text
+
+    def _discard(self, key: GrammarCheckKey):
+        with self._lock:
+            self._running.discard(key)
+            self._requesters.pop(key, None)
+        self.discarded.emit(key)
+
+    def _store(self, key: GrammarCheckKey, matches: List[Any]):
+        with self._lock:
+            self._running.discard(key)
+            self._requesters.pop(key, None)
+        self._cache[key] = matches
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        self.checked.emit(key)
+
+
+class _GrammarCheckRunnable(QRunnable):
+    def __init__(self, service: GrammarCheckService):
+        super(_GrammarCheckRunnable, self).__init__()
+        self.service = service
+
+    @overrides
+    def run(self) -> None:
+        while True:
+            item = self.service._next()
+            if item is None:
+                return
+            key, text = item
+            try:
+                matches = language_tool_proxy.tool.check(text)
+            except Exception as ex:
+                logging.error('Grammar check failed: %s', ex)
+                self.service._checkFailed.emit(key)
+                continue
+            self.service._resultReady.emit(key, matches)
+
+
+grammar_service = GrammarCheckService()
+
 
 class Dictionary(EventListener):
     def __init__(self):
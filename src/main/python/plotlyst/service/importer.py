@@ -17,6 +17,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import json
 from abc import abstractmethod
 from pathlib import Path
 from typing import Dict, List
@@ -31,6 +32,7 @@ from plotlyst.core.client import json_client
 from plotlyst.core.domain import Novel, Character, Chapter, Scene
 from plotlyst.core.scrivener import ScrivenerParser
 from plotlyst.event.core import emit_event
+from plotlyst.event.handler import event_dispatchers
 from plotlyst.events import NovelSyncEvent, NovelAboutToSyncEvent, CharacterDeletedEvent, \
     SceneDeletedEvent
 from plotlyst.resources import ResourceType
@@ -78,6 +80,7 @@ class SyncImporter(QObject):
 
 
 class ScrivenerSyncImporter(SyncImporter):
+    STAMPS_CACHE: str = 'scrivener_stamps.json'
 
     @overrides
     def name(self) -> str:
@@ -114,17 +117,33 @@ class ScrivenerSyncImporter(SyncImporter):
         emit_event(novel, NovelAboutToSyncEvent(self, novel))
         novel.import_origin.last_mod_time = self._mod_time(novel)
 
-        new_novel = self._parser.parse_project(novel.import_origin.source)
+        stamps = self._load_stamps(novel)
+        new_novel = self._parser.parse_project(novel.import_origin.source, stamps)
         flush_or_fail()
 
-        self._sync_characters(novel, new_novel)
-        for scene in novel.scenes:
-            scene.chapter = None
-        self._sync_chapters(novel, new_novel)
-        new_scenes, removed_scenes = self._sync_scenes(novel, new_novel)
+        with event_dispatchers.instance(novel).batch():
+            self._sync_characters(novel, new_novel)
+            for scene in novel.scenes:
+                scene.chapter = None
+            self._sync_chapters(novel, new_novel)
+            new_scenes, removed_scenes = self._sync_scenes(novel, new_novel)
+
+            self.repo.update_project_novel(novel)
+            emit_event(novel, NovelSyncEvent(self, novel, new_scenes, removed_scenes))
 
-        self.repo.update_project_novel(novel)
-        emit_event(novel, NovelSyncEvent(self, novel, new_scenes, removed_scenes))
+        flush_or_fail()
+        json_client.save_cache(novel, self.STAMPS_CACHE, json.dumps(self._parser.stamps))
+
+    def _load_stamps(self, novel: Novel) -> Dict[str, str]:
+        data = json_client.load_cache(novel, self.STAMPS_CACHE)
+        if not data:
+            return {}
+        try:
+            stamps = json.loads(data)
+        except ValueError:
+            return {}
+        synced = {str(x.id) for x in novel.scenes if x.manuscript}
+        return {k: v for k, v in stamps.items() if k in synced}
 
     def _mod_time(self, novel: Novel) -> int:
         scriv_file = self._parser.find_scrivener_file(novel.import_origin.source)
@@ -185,21 +204,23 @@ class ScrivenerSyncImporter(SyncImporter):
                 old_scene.title = imported_scene.title
                 imported_manuscript = imported_scene.manuscript
                 old_manuscript = old_scene.manuscript
-
-                if old_manuscript and imported_manuscript:
-                    old_manuscript.content = imported_manuscript.content
-                    old_manuscript.statistics = imported_manuscript.statistics
-                    old_manuscript.loaded = True
-                elif old_manuscript and not imported_manuscript:
-                    old_manuscript.content = ''
-                elif not old_manuscript and imported_manuscript:
-                    old_scene.manuscript = imported_manuscript
+                manuscript_changed = imported_scene.id not in self._parser.unchanged
+
+                if manuscript_changed:
+                    if old_manuscript and imported_manuscript:
+                        old_manuscript.content = imported_manuscript.content
+                        old_manuscript.statistics = imported_manuscript.statistics
+                        old_manuscript.loaded = True
+                    elif old_manuscript and not imported_manuscript:
+                        old_manuscript.content = ''
+                    elif not old_manuscript and imported_manuscript:
+                        old_scene.manuscript = imported_manuscript
 
                 if imported_scene.chapter:
                     old_scene.chapter = chapters[imported_scene.chapter]
 
                 self.repo.update_scene(old_scene)
-                if old_scene.manuscript:
+                if old_scene.manuscript and manuscript_changed:
                     self.repo.update_doc(novel, old_scene.manuscript)
 
                 scenes.append(old_scene)
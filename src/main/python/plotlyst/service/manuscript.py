@@ -17,9 +17,15 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 import pypandoc
 from PyQt6.QtCore import Qt, QMarginsF
@@ -43,6 +49,14 @@ from plotlyst.service.resource import ask_for_resource
 from plotlyst.view.widget.confirm import asked
 
 
+DOCX_FRAGMENTS_CACHE = 'docx_fragments.json'
+DOCX_FRAGMENTS_VERSION = 1
+DOCX_CONVERSIONS = 4
+DOCX_FRAGMENT_FORMAT = 'md'
+DOCX_FRAGMENT_TARGET = 'html'
+DOCX_FRAGMENT_ARGS: List[str] = []
+
+
 def export_manuscript_to_docx(novel: Novel, sceneTitle: bool = False, povTitle: bool = False, titlePage: bool = True,
                               author: str = '', email: str = ''):
     if not ask_for_resource(ResourceType.PANDOC):
@@ -77,20 +91,19 @@ def export_manuscript_to_docx(novel: Novel, sceneTitle: bool = False, povTitle:
         html += f'<div custom-style="Author">{author_info}</div>'
         html += f'<div custom-style="Date">{datetime.today().strftime("%B %d, %Y")}</div>'
 
+    timings: Dict[str, float] = {}
+    fragments = _scene_html_fragments(novel, [x for x in novel.scenes if x.manuscript], timings)
+
     if novel.prefs.is_scenes_organization():
         for i, chapter in enumerate(novel.chapters):
             scenes = novel.scenes_in_chapter(chapter)
             chapter_heading = chapter_title(chapter, scenes, sceneTitle, povTitle)
             html += f'<h1>{chapter_heading}</h1>'
-            first_paragraph = True
             for j, scene in enumerate(scenes):
                 if not scene.manuscript:
                     continue
 
-                md_content = _prepare_scene_for_export(scene, first_paragraph)
-
-                scene_html = pypandoc.convert_text(md_content, to='html', format='md')
-                html += scene_html
+                html += fragments[scene]
     else:
         for i, scene in enumerate(novel.scenes):
             if povTitle and scene.pov:
@@ -99,22 +112,84 @@ def export_manuscript_to_docx(novel: Novel, sceneTitle: bool = False, povTitle:
                 title = scene.title_or_index(novel)
 
             html += f'<h1>{title}</h1>'
-            first_paragraph = True
 
             if not scene.manuscript:
                 continue
 
-            md_content = _prepare_scene_for_export(scene, first_paragraph)
-
-            scene_html = pypandoc.convert_text(md_content, to='html', format='md')
-            html += scene_html
+            html += fragments[scene]
 
     spec_args = ['--reference-doc', resource_registry.manuscript_docx_template]
-    pypandoc.convert_text(html, to='docx', format='html', extra_args=spec_args, outputfile=target_path)
+    with _timed('docx', timings):
+        pypandoc.convert_text(html, to='docx', format='html', extra_args=spec_args, outputfile=target_path)
+    logging.info('Docx export of %d scenes: %s', len(fragments),
+                 ', '.join(f'{stage} {seconds:.2f}s' for stage, seconds in timings.items()))
 
     ask_to_open_file(target_path)
 
 
+def _scene_html_fragments(novel: Novel, scenes: List[Scene], timings: Dict[str, float]) -> Dict[Scene, str]:
+    """Converts the scene manuscripts into the HTML fragments of the export.
+
+    The fragments are cached by the hash of the manuscript and of the pandoc version and options, so that only the
+    scenes edited since the last export are converted again. Those are converted in parallel, each in its own pandoc
+    process.
+    """
+    cache = _load_docx_fragments(novel)
+    options = json.dumps([pypandoc.get_pandoc_version(), DOCX_FRAGMENT_FORMAT, DOCX_FRAGMENT_TARGET, DOCX_FRAGMENT_ARGS])
+    keys = {scene: _docx_fragment_key(scene, options) for scene in scenes}
+    missing = {}
+    for scene, key in keys.items():
+        if key not in cache:
+            missing[key] = scene
+
+    with _timed('prepare', timings):
+        md_contents = [_prepare_scene_for_export(scene, True) for scene in missing.values()]
+    with _timed('convert', timings):
+        if md_contents:
+            with ThreadPoolExecutor(max_workers=min(DOCX_CONVERSIONS, len(md_contents))) as executor:
+                for key, scene_html in zip(missing.keys(), executor.map(_md_to_html, md_contents)):
+                    cache[key] = scene_html
+
+    used = set(keys.values())
+    if missing or len(cache) != len(used):
+        json_client.save_cache(novel, DOCX_FRAGMENTS_CACHE,
+                               json.dumps({'version': DOCX_FRAGMENTS_VERSION,
+                                           'fragments': {k: v for k, v in cache.items() if k in used}}))
+
+    return {scene: cache[key] for scene, key in keys.items()}
+
+
+def _md_to_html(md_content: str) -> str:
+    return pypandoc.convert_text(md_content, to=DOCX_FRAGMENT_TARGET, format=DOCX_FRAGMENT_FORMAT,
+                                 extra_args=DOCX_FRAGMENT_ARGS)
+
+
+def _docx_fragment_key(scene: Scene, options: str) -> str:
+    return hashlib.blake2b(f'{options}\n{scene.manuscript.content}'.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _load_docx_fragments(novel: Novel) -> Dict[str, str]:
+    data = json_client.load_cache(novel, DOCX_FRAGMENTS_CACHE)
+    if not data:
+        return {}
+    try:
+        cache = json.loads(data)
+        if cache.get('version') == DOCX_FRAGMENTS_VERSION:
+            return dict(cache['fragments'])
+    except (ValueError, KeyError, TypeError):
+        pass
+    return {}
+
+
+@contextmanager
+def _timed(stage: str, timings: Dict[str, float]):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0) + time.perf_counter() - start
+
+
 def _prepare_scene_for_export(scene: Scene, first_paragraph: bool) -> str:
     text_doc = QTextDocument()
     text_doc.setHtml(scene.manuscript.content)
@@ -295,7 +370,7 @@ def daily_overall_progress(novel: Novel) -> DocumentProgress:
         progress = DocumentProgress()
         novel.manuscript_progress[date] = progress
 
-        RepositoryPersistenceManager.instance().update_novel(novel)
+        RepositoryPersistenceManager.instance().update_manuscript_progress(novel)
 
     return progress
 
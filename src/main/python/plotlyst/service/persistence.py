@@ -17,19 +17,22 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-import asyncio
+import copy
 import logging
+import threading
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import List, Optional, Set
+from queue import Queue, Empty
+from typing import List, Optional, Set, Dict, Any, Tuple, Callable
 
 from PyQt6.QtCore import QTimer, QRunnable, QThreadPool, QObject
 from overrides import overrides
 
 from plotlyst.core.client import client, json_client
 from plotlyst.core.domain import Novel, Character, Scene, NovelDescriptor, Document, Plot, Diagram, \
-    WorldBuilding
+    WorldBuilding, NovelSection, DiagramChanges
 from plotlyst.env import app_env
 from plotlyst.event.core import emit_event
 from plotlyst.events import StorylineCharacterAssociationChanged
@@ -52,18 +55,43 @@ class Operation:
     update_image: bool = False
     doc: Optional[Document] = None
     diagram: Optional[Diagram] = None
+    diagram_changes: Optional[DiagramChanges] = None
     world: Optional[WorldBuilding] = None
 
+    def entity(self) -> Optional[Tuple[str, Any]]:
+        if self.scene:
+            return 'scene', self.scene.id
+        if self.character:
+            return 'character', self.character.id
+        if self.doc:
+            return 'doc', self.doc.id
+        if self.diagram:
+            return 'diagram', self.diagram.id
+        if self.world:
+            return 'world', self.novel.id
+        if self.novel:
+            return 'novel', self.novel.id
+        if self.novel_descriptor:
+            return 'descriptor', self.novel_descriptor.id
+
 
 class RepositoryPersistenceManager(QObject):
     __instance = None
+    MAX_QUEUED_BATCHES: int = 2
+    MAX_DIAGRAM_JOURNAL: int = 500
+    SYNC_FLUSH_TIMEOUT: float = 5.0
 
     def __init__(self):
         super(RepositoryPersistenceManager, self).__init__()
         self._operations: List[Operation] = []
+        self._pending_updates: Dict[Tuple[str, Any], Operation] = {}
         self._pool = QThreadPool.globalInstance()
-        self._finished_event = asyncio.Event()
+        self._queue: Queue = Queue(maxsize=self.MAX_QUEUED_BATCHES)
+        self._writer_lock = threading.Lock()
+        self._writer_idle = threading.Event()
+        self._writer_idle.set()
         self._persistence_enabled = True
+        self._flush_hooks: List[weakref.WeakMethod] = []
 
         self._timer = QTimer()
         self._timer.setInterval(60 * 1000)  # 1 min
@@ -80,111 +108,276 @@ class RepositoryPersistenceManager(QObject):
     def set_persistence_enabled(self, enabled: bool):
         self._persistence_enabled = enabled
 
+    def register_flush_hook(self, hook: Callable[[], None]):
+        """Registers a bound method that is called before each flush to hand over deferred changes.
+        Only a weak reference is kept."""
+        self._flush_hooks.append(weakref.WeakMethod(hook))
+
     def flush(self, sync: bool = False) -> bool:
-        if self._finished_event.is_set():
+        self._run_flush_hooks()
+        if sync:
+            if not self._writer_idle.wait(self.SYNC_FLUSH_TIMEOUT):
+                return False
+            _persist_operations(self._operations)
+            self._clear_operations()
+            return True
+
+        if not self._operations:
+            return True
+        if self._queue.full():
+            # the writer is behind; pending operations keep being coalesced until the next flush
             return False
 
-        if self._operations:
-            operations_to_persist = []
-            operations_to_persist.extend(self._operations)
-            if sync:
-                _persist_operations(operations_to_persist)
-            else:
-                self._finished_event.set()
-                _runnable = _PersistenceRunnable(operations_to_persist, self._finished_event)
-                self._pool.start(_runnable)
-            self._operations.clear()
+        snapshots = [_snapshot(op) for op in self._operations]
+        self._clear_operations()
+        with self._writer_lock:
+            self._queue.put_nowait(snapshots)
+            if self._writer_idle.is_set():
+                self._writer_idle.clear()
+                self._pool.start(_PersistenceRunnable(self._queue, self._writer_lock, self._writer_idle))
 
         return True
 
+    def _run_flush_hooks(self):
+        hooks = []
+        for ref in self._flush_hooks:
+            hook = ref()
+            if hook is not None:
+                hooks.append(ref)
+                try:
+                    hook()
+                except RuntimeError:
+                    logging.exception('Flush hook %s failed', hook)
+        self._flush_hooks = hooks
+
     def insert_novel(self, novel: Novel):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.INSERT, novel=novel))
+            self._append(Operation(OperationType.INSERT, novel=novel))
             self._persist_if_test_env()
 
     def delete_novel(self, novel: Novel):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.DELETE, novel=novel))
+            self._append(Operation(OperationType.DELETE, novel=novel))
             self._persist_if_test_env()
 
     def update_project_novel(self, novel: NovelDescriptor):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.UPDATE, novel_descriptor=novel))
+            self._append(Operation(OperationType.UPDATE, novel_descriptor=novel))
             self._persist_if_test_env()
 
-    def update_novel(self, novel: Novel):
+    def update_novel(self, novel: Novel, *sections: NovelSection):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.UPDATE, novel=novel))
+            novel.mark_dirty(*sections)
+            self._append(Operation(OperationType.UPDATE, novel=novel))
             self._persist_if_test_env()
 
+    def update_board(self, novel: Novel):
+        self.update_novel(novel, NovelSection.Board)
+
+    def update_manuscript_progress(self, novel: Novel):
+        self.update_novel(novel, NovelSection.ManuscriptProgress)
+
+    def update_productivity(self, novel: Novel):
+        self.update_novel(novel, NovelSection.Productivity)
+
     def insert_character(self, novel: Novel, character: Character):
+        novel.invalidate_index()
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.INSERT, novel=novel, character=character))
+            self._append(Operation(OperationType.INSERT, novel=novel, character=character))
             self._persist_if_test_env()
 
     def update_character(self, character: Character, update_avatar: bool = False):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.UPDATE, character=character, update_image=update_avatar))
+            self._append(Operation(OperationType.UPDATE, character=character, update_image=update_avatar))
         self._persist_if_test_env()
 
     def delete_character(self, novel: Novel, character: Character):
+        novel.invalidate_index()
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.DELETE, novel=novel, character=character))
+            self._append(Operation(OperationType.DELETE, novel=novel, character=character))
             self._persist_if_test_env()
 
     def update_scene(self, scene: Scene):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.UPDATE, scene=scene))
+            self._append(Operation(OperationType.UPDATE, scene=scene))
             self._persist_if_test_env()
 
     def insert_scene(self, novel: Novel, scene: Scene):
+        novel.invalidate_index()
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.INSERT, novel=novel, scene=scene))
+            self._append(Operation(OperationType.INSERT, novel=novel, scene=scene))
             self._persist_if_test_env()
 
     def delete_scene(self, novel: Novel, scene: Scene):
+        novel.invalidate_index()
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.DELETE, novel=novel, scene=scene))
+            self._append(Operation(OperationType.DELETE, novel=novel, scene=scene))
             self._persist_if_test_env()
 
     def update_doc(self, novel: Novel, document: Document):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.UPDATE, novel=novel, doc=document))
+            self._append(Operation(OperationType.UPDATE, novel=novel, doc=document))
             self._persist_if_test_env()
 
-    def update_diagram(self, novel: Novel, diagram: Diagram):
+    def update_diagram(self, novel: Novel, diagram: Diagram, changes: Optional[DiagramChanges] = None):
+        """Saves the whole diagram, or only the given changes if provided. The changes are appended to a journal
+        that is compacted into the diagram once it has grown past MAX_DIAGRAM_JOURNAL entries."""
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.UPDATE, novel=novel, diagram=diagram))
+            if changes is not None:
+                diagram.journal_size += len(changes)
+                if diagram.journal_size > self.MAX_DIAGRAM_JOURNAL:
+                    changes = None
+            if changes is None:
+                diagram.journal_size = 0
+            self._append(Operation(OperationType.UPDATE, novel=novel, diagram=diagram, diagram_changes=changes))
             self._persist_if_test_env()
 
     def update_world(self, novel: Novel):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.UPDATE, novel=novel, world=novel.world))
+            self._append(Operation(OperationType.UPDATE, novel=novel, world=novel.world))
             self._persist_if_test_env()
 
     def delete_doc(self, novel: Novel, document: Document):
         if self._persistence_enabled:
-            self._operations.append(Operation(OperationType.DELETE, novel=novel, doc=document))
+            self._append(Operation(OperationType.DELETE, novel=novel, doc=document))
             self._persist_if_test_env()
 
+    def _append(self, op: Operation):
+        entity = op.entity()
+        if op.type == OperationType.UPDATE:
+            pending = self._pending_updates.get(entity)
+            if pending is not None:
+                pending.update_image = pending.update_image or op.update_image
+                if pending.diagram_changes is not None and op.diagram_changes is not None:
+                    pending.diagram_changes.merge(op.diagram_changes)
+                else:
+                    pending.diagram_changes = None
+                return
+            self._pending_updates[entity] = op
+        elif op.type == OperationType.DELETE:
+            pending = self._pending_updates.pop(entity, None)
+            if pending is not None:
+                self._operations.remove(pending)
+
+        self._operations.append(op)
+
+    def _clear_operations(self):
+        self._operations.clear()
+        self._pending_updates.clear()
+
     def _persist_if_test_env(self):
         if app_env.test_env():
             _persist_operations(self._operations)
-            self._operations.clear()
+            self._clear_operations()
 
 
 class _PersistenceRunnable(QRunnable):
-    def __init__(self, operations: List[Operation], finished: asyncio.Event):
+    def __init__(self, queue: Queue, lock: threading.Lock, idle: threading.Event):
         super(_PersistenceRunnable, self).__init__()
-        self.operations = operations
-        self.finished = finished
+        self.queue = queue
+        self.lock = lock
+        self.idle = idle
 
     @overrides
     def run(self) -> None:
-        try:
-            _persist_operations(self.operations)
-        finally:
-            self.finished.clear()
+        while True:
+            with self.lock:
+                try:
+                    operations = self.queue.get_nowait()
+                except Empty:
+                    self.idle.set()
+                    return
+            try:
+                _persist_operations(operations)
+            except Exception as ex:
+                logging.error('Could not persist operations: %s', ex)
+            finally:
+                self.queue.task_done()
+
+
+def _shared_references(novel: Optional[Novel], *copied: Any) -> Dict[int, Any]:
+    memo: Dict[int, Any] = {}
+    if novel is None:
+        return memo
+
+    memo[id(novel)] = novel
+    memo[id(novel.world)] = novel.world
+    for item in novel.characters:
+        memo[id(item)] = item
+        if item.avatar is not None:
+            memo[id(item.avatar)] = item.avatar
+    for item in novel.scenes:
+        memo[id(item)] = item
+    for diagram in novel.character_networks:
+        if diagram.data is not None:
+            memo[id(diagram.data)] = diagram.data
+    if novel.events_map is not None and novel.events_map.data is not None:
+        memo[id(novel.events_map.data)] = novel.events_map.data
+
+    for item in copied:
+        memo.pop(id(item), None)
+
+    return memo
+
+
+def _snapshot(op: Operation) -> Operation:
+    """Copies the state that the given operation persists so that it can be encoded off the GUI thread.
+
+    Referenced entities that are persisted on their own, e.g., characters referenced by a scene, are shared
+    instead of copied since only their ids are serialized."""
+    novel = op.novel if op.novel is not None else app_env.novel
+    if op.scene:
+        scene = copy.deepcopy(op.scene, _shared_references(novel, op.scene))
+        novel_copy = _snapshot_novel(op.novel) if op.novel else None
+        return replace(op, scene=scene, novel=novel_copy)
+    if op.character:
+        character = copy.deepcopy(op.character, _shared_references(novel, op.character))
+        novel_copy = _snapshot_novel(op.novel) if op.novel else None
+        return replace(op, character=character, novel=novel_copy)
+    if op.doc:
+        memo = _shared_references(novel)
+        if op.type == OperationType.DELETE:
+            return replace(op, doc=copy.deepcopy(op.doc, memo))
+        doc = copy.copy(op.doc)
+        doc.data = copy.deepcopy(op.doc.data, memo)
+        return replace(op, doc=doc)
+    if op.diagram:
+        if op.diagram_changes is not None:
+            return replace(op, diagram_changes=copy.deepcopy(op.diagram_changes, _shared_references(novel)))
+        diagram = copy.copy(op.diagram)
+        diagram.data = copy.deepcopy(op.diagram.data, _shared_references(novel, op.diagram.data))
+        return replace(op, diagram=diagram)
+    if op.world:
+        novel_copy = copy.copy(op.novel)
+        novel_copy.world = copy.deepcopy(op.world, _shared_references(novel, op.world))
+        return replace(op, novel=novel_copy, world=novel_copy.world)
+    if op.novel:
+        return replace(op, novel=_snapshot_novel(op.novel, op.type == OperationType.UPDATE))
+    if op.novel_descriptor:
+        return replace(op, novel_descriptor=copy.copy(op.novel_descriptor))
+
+    return op
+
+
+def _snapshot_novel(novel: Novel, dirty: bool = False) -> Novel:
+    memo = _shared_references(novel, novel)
+    if dirty:
+        sections = novel.pop_dirty_sections()
+        if sections:
+            if NovelSection.Structures not in sections:
+                memo[id(novel.story_structures)] = novel.story_structures
+            if NovelSection.Board not in sections:
+                memo[id(novel.board)] = novel.board
+            if NovelSection.ManuscriptProgress not in sections:
+                memo[id(novel.manuscript_progress)] = novel.manuscript_progress
+            if NovelSection.Productivity not in sections:
+                memo[id(novel.productivity)] = novel.productivity
+    else:
+        sections = None
+
+    novel_copy = copy.deepcopy(novel, memo)
+    novel_copy._dirty_sections = sections if sections else set()
+    return novel_copy
 
 
 def flush_or_fail():
@@ -198,6 +391,11 @@ def flush_or_fail():
 
 
 def _persist_operations(operations: List[Operation]):
+    with json_client.transaction():
+        _apply_operations(operations)
+
+
+def _apply_operations(operations: List[Operation]):
     updated_doc_cache: Set[Document] = set()
     updated_novel_cache: Set[Novel] = set()
     updated_scene_cache: Set[Scene] = set()
@@ -236,7 +434,7 @@ def _persist_operations(operations: List[Operation]):
 
         elif op.diagram and op.type == OperationType.UPDATE:
             if op.diagram not in updated_diagram_cache:
-                json_client.update_diagram(op.novel, op.diagram)
+                json_client.update_diagram(op.novel, op.diagram, op.diagram_changes)
                 updated_diagram_cache.add(op.diagram)
 
         elif op.world and op.type == OperationType.UPDATE:
@@ -263,6 +461,7 @@ def _persist_operations(operations: List[Operation]):
 
 def delete_plot(novel: Novel, plot: Plot):
     novel.plots.remove(plot)
+    novel.invalidate_index()
     repo = RepositoryPersistenceManager.instance()
     repo.update_novel(novel)
 
@@ -338,6 +537,25 @@ def delete_character(novel: Novel, character: Character, forced: bool = False) -
                 plot.reset_relation_character()
                 repo.update_novel(novel)
 
+        for structure in novel.story_structures:
+            if structure.character_id == char_id:
+                structure.reset_character()
+                repo.update_novel(novel)
+
+        docs = list(novel.documents)
+        while docs:
+            doc = docs.pop()
+            docs.extend(doc.children)
+            if doc.character_id == char_id:
+                doc.reset_character()
+                doc.title = 'Character'
+                repo.update_novel(novel)
+
+        for task in novel.board.tasks:
+            if task.character_id == char_id:
+                task.reset_character()
+                repo.update_board(novel)
+
         return True
 
     return False
@@ -40,9 +40,9 @@ def set_daily_productivity(novel: Novel, category: ProductivityType,
         date = today_str()
 
     novel.productivity.progress[date] = str(category.id)
-    RepositoryPersistenceManager.instance().update_novel(novel)
+    RepositoryPersistenceManager.instance().update_productivity(novel)
 
 
 def clear_daily_productivity(novel: Novel, date: str):
     novel.productivity.progress.pop(date)
-    RepositoryPersistenceManager.instance().update_novel(novel)
+    RepositoryPersistenceManager.instance().update_productivity(novel)
@@ -22,6 +22,7 @@ import os
 import shutil
 import tarfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict
 
 import requests
@@ -42,6 +43,7 @@ from plotlyst.event.handler import global_event_dispatcher
 from plotlyst.resources import ResourceType, resource_manager, ResourceDownloadedEvent, \
     ResourceRemovedEvent, is_nltk, ResourceExtension, ResourceDescriptor, ResourceStatusChangedEvent, PANDOC_VERSION, \
     ResourceDownloadFailedEvent
+from plotlyst.service.download import http_client
 from plotlyst.view.common import ButtonPressResizeEventFilter, spin, push_btn, fade_in
 from plotlyst.view.generated.resource_manager_dialog_ui import Ui_ResourceManagerDialog
 from plotlyst.view.icons import IconRegistry
@@ -208,14 +210,15 @@ class JsonDownloadWorker(QRunnable):
     @overrides
     def run(self) -> None:
         try:
-            response = requests.get(self._url, timeout=10)
-            response.raise_for_status()
-
-            self._result.emit_success(response.json())
+            data = http_client().get_json(self._url)
         except requests.RequestException as e:
             status_code = getattr(e.response, 'status_code', None)
             reason = str(e) if status_code is None else e.response.reason
             self._result.emit_failure(status_code, reason)
+        except ValueError:
+            self._result.emit_failure(500, 'Could not parse JSON response')
+        else:
+            self._result.emit_success(data)
 
 
 class ImageDownloadResult(QObject):
@@ -234,6 +237,8 @@ class ImageDownloadResult(QObject):
 
 
 class ImagesDownloadWorker(QRunnable):
+    MAX_CONCURRENT_DOWNLOADS: int = 4
+
     def __init__(self, urls: List[str], result: ImageDownloadResult):
         super().__init__()
         self._urls = urls
@@ -242,20 +247,24 @@ class ImagesDownloadWorker(QRunnable):
 
     @overrides
     def run(self) -> None:
-        for url in self._urls:
-            if self._stopped:
-                return
+        if not self._urls:
+            return
 
-            try:
-                with requests.Session() as session:
-                    with session.get(url) as response:
-                        response.raise_for_status()
-
-                        self._result.emit_success(response.content)
-            except requests.RequestException as e:
-                status_code = getattr(e.response, 'status_code', None)
-                reason = str(e) if status_code is None else e.response.reason
-                self._result.emit_failure(status_code, reason)
+        client = http_client()
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_DOWNLOADS, len(self._urls))) as executor:
+            futures = [executor.submit(client.get, url) for url in self._urls]
+            for future in futures:
+                if self._stopped:
+                    for pending in futures:
+                        pending.cancel()
+                    return
+
+                try:
+                    self._result.emit_success(future.result())
+                except requests.RequestException as e:
+                    status_code = getattr(e.response, 'status_code', None)
+                    reason = str(e) if status_code is None else e.response.reason
+                    self._result.emit_failure(status_code, reason)
 
     def stop(self):
         self._stopped = True
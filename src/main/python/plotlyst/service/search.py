@@ -0,0 +1,305 @@
+"""
+Plotlyst
+Copyright (C) 2021-2025  Zsolt Kovari
+
+This file is part of Plotlyst.
+
+Plotlyst is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Plotlyst is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import json
+import re
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Pattern
+from uuid import UUID
+
+from PyQt6.QtCore import QRunnable, QThreadPool
+from PyQt6.QtGui import QTextDocument
+from overrides import overrides
+
+from plotlyst.core.client import json_client
+from plotlyst.core.domain import Novel, Scene
+
+_TOKEN = re.compile(r'\w+')
+
+
+def search_pattern(term: str, case_sensitive: bool = False, whole_word: bool = False,
+                   regex: bool = False) -> Pattern:
+    """Compiles the find options into a regular expression. Raises re.error for an invalid expression."""
+    expr = term if regex else re.escape(term)
+    if whole_word:
+        expr = rf'(?<!\w)(?:{expr})(?!\w)'
+    return re.compile(expr, 0 if case_sensitive else re.IGNORECASE)
+
+
+@dataclass
+class IndexedManuscript:
+    """The plain text of a scene's manuscript with the offsets of its blocks (paragraphs).
+
+    The blocks start at block_starts in the text, and at block_positions in the document. Soft line breaks are
+    turned into new lines in the text, therefore the blocks cannot be derived from the lines."""
+    digest: str
+    text: str
+    block_starts: List[int] = field(default_factory=list)
+    block_positions: List[int] = field(default_factory=list)
+    tokens: Set[str] = field(default_factory=set)
+    source: Optional[str] = field(default=None, repr=False)
+    _astral: Optional[List[int]] = field(default=None, repr=False)
+
+    def __post_init__(self):
+        if not self.block_starts:
+            self.block_starts = [0]
+            self.block_starts.extend(m.end() for m in re.finditer('\n', self.text))
+        if not self.block_positions:
+            self.block_positions = [self.doc_position(x) for x in self.block_starts]
+        if not self.tokens:
+            self.tokens = {x.lower() for x in _TOKEN.findall(self.text)}
+
+    @staticmethod
+    def from_document(digest: str, doc: QTextDocument, source: Optional[str] = None) -> 'IndexedManuscript':
+        texts = []
+        block_starts = []
+        block_positions = []
+        start = 0
+        block = doc.begin()
+        while block.isValid():
+            text = block.text().replace('\u2028', '\n').replace('\u00a0', ' ')
+            texts.append(text)
+            block_starts.append(start)
+            block_positions.append(block.position())
+            start += len(text) + 1
+            block = block.next()
+
+        return IndexedManuscript(digest, '\n'.join(texts), block_starts, block_positions, source=source)
+
+    def block_of(self, index: int) -> int:
+        return bisect_right(self.block_starts, index) - 1
+
+    def block_doc_position(self, block: int, index: int) -> int:
+        """Maps a Python string index within the given block into a QTextDocument position."""
+        return self.block_positions[block] + self.doc_position(index) - self.doc_position(self.block_starts[block])
+
+    def doc_position(self, index: int) -> int:
+        """Maps a Python string index into a QTextDocument position, which counts UTF-16 code units."""
+        if self._astral is None:
+            self._astral = [i for i, ch in enumerate(self.text) if ord(ch) > 0xFFFF]
+        if not self._astral:
+            return index
+        return index + bisect_right(self._astral, index - 1)
+
+
+class ManuscriptSearchIndex:
+    """Plain-text index over the scene manuscripts of a novel.
+
+    Each manuscript is converted from HTML only when its content changes. An inverted token index narrows down
+    the scenes to scan for terms that contain complete words, then the matches are found with a regular expression
+    on the cached plain text. The index is kept in the workspace cache between sessions.
+    """
+    CACHE_FILE: str = 'search_index.json'
+    CACHE_VERSION: int = 2
+
+    def __init__(self, novel: Novel):
+        self.novel = novel
+        self._entries: Dict[UUID, IndexedManuscript] = {}
+        self._postings: Dict[str, Set[UUID]] = {}
+        self._dirty: bool = False
+        self._restored: bool = False
+        self._writer = _SearchIndexWriter(novel)
+
+    def search(self, pattern: Pattern, term: str = '', whole_word: bool = False, regex: bool = False) -> Dict[
+            Scene, List[dict]]:
+        for scene in self.novel.scenes:
+            self.update(scene)
+        candidates = self._candidates(term, whole_word) if term and not regex else None
+        results = {}
+        for scene in self.novel.scenes:
+            if candidates is not None and scene.id not in candidates:
+                continue
+            matches = self.search_scene(scene, pattern)
+            if matches:
+                results[scene] = matches
+        return results
+
+    def search_scene(self, scene: Scene, pattern: Pattern, context_size: int = 30) -> List[dict]:
+        entry = self.update(scene)
+        if entry is None:
+            return []
+
+        text = entry.text
+        matches = []
+        for m in pattern.finditer(text):
+            start, end = m.span()
+            if start == end:
+                continue
+            block = entry.block_of(start)
+            end_block = entry.block_of(end - 1)
+
+            before_start = text.rfind(' ', 0, start - context_size)
+            before_start = 0 if before_start == -1 else before_start + 1
+            after_end = text.find(' ', end + context_size)
+            after_end = len(text) if after_end == -1 else after_end
+
+            doc_start = entry.block_doc_position(block, start)
+            doc_end = entry.block_doc_position(end_block, end)
+            doc_block_start = entry.block_positions[block]
+            matches.append({
+                'scene': scene,
+                'start': doc_start,
+                'end': doc_end,
+                'block': block,
+                'pos_in_block': (doc_start - doc_block_start, doc_end - doc_block_start),
+                'before': text[before_start:start],
+                'match': text[start:end],
+                'after': text[end:after_end],
+            })
+        return matches
+
+    def update(self, scene: Scene) -> Optional[IndexedManuscript]:
+        self._restore()
+        if not scene.manuscript or not scene.manuscript.content:
+            self.remove(scene)
+            return None
+
+        content = scene.manuscript.content
+        entry = self._entries.get(scene.id)
+        if entry is not None and entry.source is content:
+            return entry
+
+        digest = self._digest(content)
+        if entry is not None and entry.digest == digest:
+            entry.source = content
+            return entry
+
+        doc = QTextDocument()
+        doc.setHtml(content)
+        new_entry = IndexedManuscript.from_document(digest, doc, source=content)
+        self._set(scene.id, new_entry)
+        self._dirty = True
+        return new_entry
+
+    def remove(self, scene: Scene):
+        if scene.id in self._entries:
+            self._set(scene.id, None)
+            self._dirty = True
+
+    def save(self):
+        """Writes the index into the workspace cache in the background. The entries are immutable once indexed,
+        so only the mapping is copied here."""
+        if not self._dirty:
+            return
+        scene_ids = {x.id for x in self.novel.scenes}
+        entries = {id_: entry for id_, entry in self._entries.items() if id_ in scene_ids}
+        self._writer.submit(self.CACHE_FILE, self.CACHE_VERSION, entries)
+        self._dirty = False
+
+    def _restore(self):
+        if self._restored:
+            return
+        self._restored = True
+        data = json_client.load_cache(self.novel, self.CACHE_FILE)
+        if not data:
+            return
+        try:
+            cache = json.loads(data)
+            if cache.get('version') != self.CACHE_VERSION:
+                return
+            for id_, item in cache['scenes'].items():
+                self._set(UUID(id_), IndexedManuscript(item['digest'], item['text'], item['block_starts'],
+                                                       item['block_positions']))
+        except (ValueError, KeyError, TypeError):
+            self._entries.clear()
+            self._postings.clear()
+
+    def _candidates(self, term: str, whole_word: bool) -> Optional[Set[UUID]]:
+        tokens = list(_TOKEN.finditer(term))
+        if not whole_word:
+            # words at the edges of the term may be part of a longer word in the text
+            if tokens and tokens[0].start() == 0:
+                tokens = tokens[1:]
+            if tokens and tokens[-1].end() == len(term):
+                tokens = tokens[:-1]
+        if not tokens:
+            return None
+
+        candidates: Optional[Set[UUID]] = None
+        for token in sorted({x.group().lower() for x in tokens}, key=lambda x: len(self._postings.get(x, ()))):
+            postings = self._postings.get(token, set())
+            candidates = set(postings) if candidates is None else candidates & postings
+            if not candidates:
+                break
+        return candidates
+
+    def _set(self, scene_id: UUID, entry: Optional[IndexedManuscript]):
+        previous = self._entries.pop(scene_id, None)
+        if previous is not None:
+            for token in previous.tokens:
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.discard(scene_id)
+                    if not postings:
+                        del self._postings[token]
+        if entry is not None:
+            self._entries[scene_id] = entry
+            for token in entry.tokens:
+                self._postings.setdefault(token, set()).add(scene_id)
+
+    @staticmethod
+    def _digest(content: str) -> str:
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class _SearchIndexWriter:
+    """Encodes and writes the search index on the global thread pool. A write that was superseded by a newer one
+    before it could start is skipped."""
+
+    def __init__(self, novel: Novel):
+        self.novel = novel
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._generation: int = 0
+
+    def submit(self, name: str, version: int, entries: Dict[UUID, IndexedManuscript]):
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        QThreadPool.globalInstance().start(_SearchIndexWriteRunnable(self, generation, name, version, entries))
+
+    def write(self, generation: int, name: str, version: int, entries: Dict[UUID, IndexedManuscript]):
+        with self._write_lock:
+            with self._lock:
+                if generation != self._generation:
+                    return
+            data = {'version': version,
+                    'scenes': {str(id_): {'digest': entry.digest, 'text': entry.text,
+                                          'block_starts': entry.block_starts,
+                                          'block_positions': entry.block_positions}
+                               for id_, entry in entries.items()}}
+            json_client.save_cache(self.novel, name, json.dumps(data))
+
+
+class _SearchIndexWriteRunnable(QRunnable):
+    def __init__(self, writer: _SearchIndexWriter, generation: int, name: str, version: int,
+                 entries: Dict[UUID, IndexedManuscript]):
+        super().__init__()
+        self._writer = writer
+        self._generation = generation
+        self._name = name
+        self._version = version
+        self._entries = entries
+
+    @overrides
+    def run(self) -> None:
+        self._writer.write(self._generation, self._name, self._version, self._entries)
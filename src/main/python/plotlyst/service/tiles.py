@@ -0,0 +1,191 @@
+"""
+Plotlyst
+Copyright (C) 2021-2025  Zsolt Kovari
+
+This file is part of Plotlyst.
+
+Plotlyst is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Plotlyst is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import math
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QRect, QSize, Qt
+from PyQt6.QtGui import QImage, QImageReader
+from atomicwrites import atomic_write
+from overrides import overrides
+
+from plotlyst.core.client import json_client
+from plotlyst.core.domain import Novel, ImageRef
+
+
+class MapTilePyramid:
+    """Tiles of a map image at decreasing resolutions, cached on disk.
+
+    Level 0 is the image in its original resolution, and each further level halves the previous one until the whole
+    image fits into a single tile. The tiles are sliced once, then only the tiles in view are loaded.
+    """
+    VERSION: int = 1
+    TILE_SIZE: int = 512
+    META_FILE: str = 'pyramid.json'
+    JPG_QUALITY: int = 90
+    MAX_WRITERS: int = 4
+
+    def __init__(self, path: Path, source: Path):
+        self.path = path
+        self.source = source
+        self.width: int = 0
+        self.height: int = 0
+        self.levels: int = 0
+        self.format: str = 'png'
+
+    @staticmethod
+    def for_image(novel: Novel, ref: ImageRef) -> 'MapTilePyramid':
+        return MapTilePyramid(json_client.cache_dir.joinpath(str(novel.id), 'maps', str(ref.id)),
+                              json_client.image_path(novel, ref))
+
+    def source_size(self) -> QSize:
+        """The size of the source image, read from its header only."""
+        if self.levels:
+            return QSize(self.width, self.height)
+        return QImageReader(str(self.source)).size()
+
+    def load(self) -> bool:
+        """Reads the metadata of the pyramid. Returns False if it was not built yet or the source changed since."""
+        try:
+            with open(self.path.joinpath(self.META_FILE), encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta['version'] != self.VERSION or meta['tile_size'] != self.TILE_SIZE
+                    or meta['stamp'] != self._stamp()):
+                return False
+            self.width = meta['width']
+            self.height = meta['height']
+            self.levels = meta['levels']
+            self.format = meta['format']
+        except (OSError, ValueError, KeyError):
+            return False
+        return True
+
+    def build(self, image: Optional[QImage] = None):
+        """Slices the image into tiles. The source is decoded if the image was not given."""
+        if image is None or image.isNull():
+            reader = QImageReader(str(self.source))
+            reader.setAutoTransform(True)
+            image = reader.read()
+            if image.isNull():
+                raise OSError(f'Could not read map image {self.source}: {reader.errorString()}')
+
+        self.remove()
+        self.width = image.width()
+        self.height = image.height()
+        self.levels = self.level_count(self.width, self.height)
+        self.format = 'png' if image.hasAlphaChannel() else 'jpg'
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WRITERS) as executor:
+            futures = []
+            for level in range(self.levels):
+                if level:
+                    image = image.scaled(math.ceil(image.width() / 2), math.ceil(image.height() / 2),
+                                         Qt.AspectRatioMode.IgnoreAspectRatio,
+                                         Qt.TransformationMode.SmoothTransformation)
+                os.makedirs(self.path.joinpath(str(level)), exist_ok=True)
+                columns, rows = self.grid(level)
+                for row in range(rows):
+                    for col in range(columns):
+                        futures.append(executor.submit(self._save_tile, image, level, col, row))
+            for future in futures:
+                future.result()
+
+        with atomic_write(self.path.joinpath(self.META_FILE), encoding='utf-8', overwrite=True) as f:
+            json.dump({'version': self.VERSION, 'stamp': self._stamp(), 'tile_size': self.TILE_SIZE,
+                       'width': self.width, 'height': self.height, 'levels': self.levels, 'format': self.format}, f)
+
+    def remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def grid(self, level: int) -> Tuple[int, int]:
+        """The number of tile columns and rows on the given level."""
+        span = self.TILE_SIZE << level
+        return math.ceil(self.width / span), math.ceil(self.height / span)
+
+    def tile_path(self, level: int, col: int, row: int) -> Path:
+        return self.path.joinpath(str(level), f'{col}_{row}.{self.format}')
+
+    def overview(self) -> QImage:
+        """The single tile of the lowest resolution."""
+        return QImage(str(self.tile_path(self.levels - 1, 0, 0)))
+
+    @classmethod
+    def level_count(cls, width: int, height: int) -> int:
+        longest = max(width, height, 1)
+        return max(1, math.ceil(math.log2(longest / cls.TILE_SIZE)) + 1)
+
+    def _save_tile(self, image: QImage, level: int, col: int, row: int):
+        rect = QRect(col * self.TILE_SIZE, row * self.TILE_SIZE, self.TILE_SIZE, self.TILE_SIZE)
+        tile = image.copy(rect.intersected(image.rect()))
+        quality = self.JPG_QUALITY if self.format == 'jpg' else -1
+        path = self.tile_path(level, col, row)
+        if not tile.save(str(path), self.format, quality):
+            raise OSError(f'Could not save map tile {path}')
+
+    def _stamp(self) -> str:
+        stat = os.stat(self.source)
+        return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+
+class MapTilesBuildResult(QObject):
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+
+class MapTilesBuildWorker(QRunnable):
+    def __init__(self, pyramid: MapTilePyramid, image: Optional[QImage], result: MapTilesBuildResult):
+        super().__init__()
+        self._pyramid = pyramid
+        self._image = image
+        self._result = result
+
+    @overrides
+    def run(self) -> None:
+        try:
+            self._pyramid.build(self._image)
+        except OSError as e:
+            self._result.failed.emit(str(e))
+            return
+        finally:
+            self._image = None
+        self._result.finished.emit()
+
+
+class MapTileLoadResult(QObject):
+    loaded = pyqtSignal(int, int, int, QImage)
+
+
+class MapTileLoader(QRunnable):
+    def __init__(self, pyramid: MapTilePyramid, level: int, col: int, row: int, result: MapTileLoadResult):
+        super().__init__()
+        self._pyramid = pyramid
+        self._level = level
+        self._col = col
+        self._row = row
+        self._result = result
+
+    @overrides
+    def run(self) -> None:
+        image = QImage(str(self._pyramid.tile_path(self._level, self._col, self._row)))
+        self._result.loaded.emit(self._level, self._col, self._row, image)
@@ -1,6 +1,10 @@
+from PyQt6.QtCore import QByteArray, QBuffer, QIODevice
+from PyQt6.QtGui import QImage, QColor
+
 from plotlyst.core.client import client, json_client
 from plotlyst.core.domain import Novel, Scene, default_story_structures, three_act_structure, \
-    SceneStoryBeat, ScenePurposeType
+    SceneStoryBeat, ScenePurposeType, DocumentProgress, NovelSection, Character, Diagram, DiagramData, \
+    DiagramChanges, Node, Connector, GraphicsItemType
 from plotlyst.env import app_env
 from plotlyst.test.conftest import init_project
 
@@ -56,3 +60,78 @@ def test_init_client(test_client):
     init_project()
 
     json_client.init(str(json_client.root_path))
+
+
+def test_update_novel_sections(test_client):
+    novel = Novel.new_novel(title='test1')
+    client.insert_novel(novel)
+
+    novel.manuscript_progress['2024-01-01'] = DocumentProgress(added=10)
+    novel.mark_dirty(NovelSection.ManuscriptProgress)
+    client.update_novel(novel)
+
+    saved_novel = client.fetch_novel(novel.id)
+    assert saved_novel.manuscript_progress['2024-01-01'].added == 10
+    assert saved_novel.story_structures == novel.story_structures
+
+
+def test_character_avatar_loaded_lazily(test_client):
+    novel = Novel(title='test1')
+    client.insert_novel(novel)
+
+    image = QImage(300, 200, QImage.Format.Format_RGB32)
+    image.fill(QColor('red'))
+    array = QByteArray()
+    buffer = QBuffer(array)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, 'PNG')
+    character = Character('Alice', avatar=array)
+    novel.characters.append(character)
+    client.insert_character(novel, character)
+
+    saved_character = client.fetch_novel(novel.id).characters[0]
+    assert saved_character.avatar is None
+    assert saved_character.avatar_id
+    assert saved_character.has_avatar()
+
+    avatar = json_client.load_avatar(saved_character.avatar_id, 64)
+    assert avatar.height() == 64
+
+    assert json_client.load_avatar_thumbnail(saved_character.avatar_id, 64) is None
+    json_client.save_avatar_thumbnail(saved_character.avatar_id, 64, avatar)
+    assert json_client.load_avatar_thumbnail(saved_character.avatar_id, 64).size() == avatar.size()
+
+
+def test_diagram_journal(test_client):
+    novel = Novel(title='test1')
+    client.insert_novel(novel)
+    first = Node(0, 0, GraphicsItemType.EVENT, text='First')
+    second = Node(100, 0, GraphicsItemType.EVENT, text='Second')
+    connector = Connector(first.id, second.id, 0, 180)
+    diagram = Diagram()
+    diagram.data = DiagramData(nodes=[first, second], connectors=[connector])
+    json_client.update_diagram(novel, diagram)
+
+    changes = DiagramChanges()
+    first.x = 50
+    changes.update_node(first)
+    third = Node(0, 100, GraphicsItemType.NOTE, text='Third')
+    changes.update_node(third)
+    json_client.update_diagram(novel, diagram, changes)
+    changes = DiagramChanges()
+    changes.remove_connector(connector)
+    changes.remove_node(second)
+    json_client.update_diagram(novel, diagram, changes)
+
+    loaded = Diagram(id=diagram.id)
+    json_client.load_diagram(novel, loaded)
+    assert [(x.id, x.x) for x in loaded.data.nodes] == [(first.id, 50), (third.id, 0)]
+    assert loaded.data.connectors == []
+    assert loaded.journal_size == 4
+
+    json_client.update_diagram(novel, loaded)
+    assert not json_client.diagrams_dir(novel).joinpath(f'{diagram.id}.jsonl').exists()
+    reloaded = Diagram(id=diagram.id)
+    json_client.load_diagram(novel, reloaded)
+    assert reloaded.data.nodes == [first, third]
+    assert reloaded.journal_size == 0
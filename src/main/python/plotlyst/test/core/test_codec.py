@@ -0,0 +1,39 @@
+from plotlyst.core import codec
+from plotlyst.core.client import SceneInfo, CharacterInfo, NovelInfo, ScenePlotReferenceInfo
+from plotlyst.core.domain import Novel, CharacterAgency, SceneStoryBeat, Document, DocumentStatistics, \
+    ScenePlotReferenceData
+from plotlyst.test.conftest import init_project
+
+
+def test_scene_info_codec(test_client):
+    novel = init_project()
+    structure = Novel.new_novel('Test').active_story_structure
+    scene = novel.scenes[0]
+    info = SceneInfo(title=scene.title, id=scene.id, synopsis='Synopsis', pov=novel.characters[0].id,
+                     characters=[x.id for x in novel.characters[1:3]],
+                     agency=[CharacterAgency(novel.characters[0].id, motivations={1: 2}, intensity=1)],
+                     plots=[ScenePlotReferenceInfo(novel.plots[0].id, ScenePlotReferenceData(charge=2))],
+                     beats=[SceneStoryBeat.of(structure, structure.beats[0])],
+                     manuscript=Document('', statistics=DocumentStatistics(wc=150)))
+
+    data = info.to_json()
+    assert codec.to_json(info) == data
+    assert codec.from_json(SceneInfo, data) == SceneInfo.from_json(data)
+
+
+def test_character_info_codec():
+    info = CharacterInfo(name='Alfred', id=Novel.new_scene().id, traits=['brave'], summary='Summary')
+
+    data = info.to_json()
+    assert codec.to_json(info) == data
+    assert codec.from_json(CharacterInfo, data) == CharacterInfo.from_json(data)
+
+
+def test_novel_info_codec():
+    novel = Novel.new_novel('Test')
+    info = NovelInfo(id=novel.id, scenes=[x.id for x in novel.scenes], plots=novel.plots,
+                     story_structures=novel.story_structures)
+
+    data = info.to_json()
+    assert codec.to_json(info) == data
+    assert codec.from_json(NovelInfo, data) == NovelInfo.from_json(data)
@@ -1,6 +1,6 @@
 from typing import Set
 
-from plotlyst.core.domain import default_story_structures, StoryBeatType
+from plotlyst.core.domain import default_story_structures, StoryBeatType, Novel, Scene
 
 
 def test_unique_story_structures():
@@ -29,3 +29,41 @@ def test_unique_story_structures():
 
             if beat.ends_act:
                 act += 1
+
+
+def test_scene_index_follows_list_changes():
+    novel = Novel('Test')
+    scenes = [Scene(f'Scene {i}') for i in range(5)]
+    novel.scenes.extend(scenes)
+
+    assert novel.scene_index(scenes[3]) == 3
+    assert novel.find_scene(scenes[1].id) is scenes[1]
+
+    novel.scenes.remove(scenes[0])
+    novel.scenes.insert(2, scenes[0])
+    assert [novel.scene_index(x) for x in scenes] == [2, 0, 1, 3, 4]
+
+    novel.scenes.remove(scenes[4])
+    assert novel.find_scene(scenes[4].id) is None
+
+
+def test_scene_index_miss():
+    novel = Novel('Test')
+    scenes = [Scene(f'Scene {i}') for i in range(5)]
+    novel.scenes.extend(scenes)
+    assert novel.scene_index(scenes[2]) == 2
+
+    missing = Scene('Missing')
+    positions = novel._scenes_index._positions
+    assert novel.find_scene(missing.id) is None
+    assert novel._scenes_index._positions is positions
+
+    novel.scenes.append(missing)
+    assert novel.find_scene(missing.id) is missing
+
+    novel.scenes.remove(scenes[0])
+    replacement = Scene('Replacement')
+    novel.scenes.append(replacement)
+    novel.invalidate_index()
+    assert novel.find_scene(replacement.id) is replacement
+    assert novel.find_scene(scenes[0].id) is None
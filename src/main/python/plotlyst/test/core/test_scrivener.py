@@ -79,3 +79,17 @@ def test_import_with_acts(test_client):
         assert c.avatar, 'Character avatar should have been loaded'
         c.avatar = None
     assert novel.characters == expected_novel.characters
+
+
+def test_skip_unchanged_documents(test_client):
+    folder = Path(sys.path[0]).joinpath('../../../resources/scrivener/v3/NovelWithParts')
+
+    importer = ScrivenerParser()
+    novel: Novel = importer.parse_project(str(folder))
+    assert importer.stamps
+    assert not importer.unchanged
+
+    synced_novel: Novel = importer.parse_project(str(folder), importer.stamps)
+    assert importer.unchanged == {x.id for x in novel.scenes if x.manuscript}
+    for scene in synced_novel.scenes:
+        assert scene.manuscript is None
@@ -0,0 +1,33 @@
+from plotlyst.core.client import client, json_client
+from plotlyst.core.domain import Novel, Scene
+from plotlyst.core.storage import pack_workspace, unpack_workspace, is_packed, PackedStorage
+from plotlyst.env import app_env
+
+
+def test_pack_and_unpack_workspace(test_client):
+    workspace = str(json_client.root_path)
+    novel = Novel(title='test1')
+    app_env.novel = novel
+    client.insert_novel(novel)
+    scene = Scene(title='Scene 1', synopsis='Test synopsis')
+    novel.scenes.append(scene)
+    client.insert_scene(novel, scene)
+
+    pack_workspace(workspace)
+    assert is_packed(workspace)
+    json_client.init(workspace)
+    assert isinstance(json_client._storage, PackedStorage)
+    assert client.fetch_novel(novel.id) == novel
+
+    scene.synopsis = 'Updated synopsis'
+    with json_client.transaction():
+        client.update_scene(scene)
+        client.update_novel(novel)
+
+    json_client._storage.close()
+    unpack_workspace(workspace)
+    assert not is_packed(workspace)
+    json_client.init(workspace)
+    saved_novel = client.fetch_novel(novel.id)
+    assert saved_novel == novel
+    assert saved_novel.scenes[0].synopsis == 'Updated synopsis'
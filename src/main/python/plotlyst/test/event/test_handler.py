@@ -0,0 +1,72 @@
+from plotlyst.core.domain import Character
+from plotlyst.event.core import Event, EventListener
+from plotlyst.event.handler import EventDispatcher
+from plotlyst.events import CharacterChangedEvent, CharacterDeletedEvent
+
+
+class RecordingListener(EventListener):
+    def __init__(self):
+        self.events = []
+        self.batches = 0
+
+    def event_received(self, event: Event):
+        self.events.append(event)
+
+    def events_received(self, events):
+        self.batches += 1
+        super().events_received(events)
+
+
+def test_dispatch_to_base_class_listeners():
+    dispatcher = EventDispatcher()
+    any_listener = RecordingListener()
+    changed_listener = RecordingListener()
+    dispatcher.register(any_listener, Event)
+    dispatcher.register(changed_listener, CharacterChangedEvent)
+
+    character = Character('Alice')
+    dispatcher.dispatch(CharacterChangedEvent(None, character))
+    dispatcher.dispatch(CharacterDeletedEvent(None, character))
+
+    assert len(any_listener.events) == 2
+    assert len(changed_listener.events) == 1
+
+    dispatcher.deregister(any_listener, Event)
+    dispatcher.dispatch(CharacterDeletedEvent(None, character))
+    assert len(any_listener.events) == 2
+
+
+def test_batch_coalesces_events():
+    dispatcher = EventDispatcher()
+    listener = RecordingListener()
+    dispatcher.register(listener, CharacterChangedEvent, CharacterDeletedEvent)
+
+    alice = Character('Alice')
+    bob = Character('Bob')
+    with dispatcher.batch():
+        with dispatcher.batch():
+            for _ in range(5):
+                dispatcher.dispatch(CharacterChangedEvent(None, alice))
+            dispatcher.dispatch(CharacterChangedEvent(None, bob))
+        assert not listener.events
+        dispatcher.dispatch(CharacterDeletedEvent(None, alice))
+
+    assert listener.batches == 1
+    assert [type(x) for x in listener.events] == [CharacterChangedEvent, CharacterChangedEvent,
+                                                  CharacterDeletedEvent]
+    assert listener.events[0].character is alice
+    assert listener.events[1].character is bob
+
+
+def test_listener_timing():
+    dispatcher = EventDispatcher()
+    dispatcher.set_timing_enabled(True)
+    listener = RecordingListener()
+    dispatcher.register(listener, CharacterChangedEvent)
+
+    dispatcher.dispatch(CharacterChangedEvent(None, Character('Alice')))
+    dispatcher.dispatch(CharacterChangedEvent(listener, Character('Alice')))
+
+    timing = dispatcher.timings()[('RecordingListener', 'CharacterChangedEvent')]
+    assert timing.calls == 1
+    assert timing.max_ms <= timing.total_ms
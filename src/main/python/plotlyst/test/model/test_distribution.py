@@ -0,0 +1,88 @@
+from typing import List
+
+import pytest
+
+from plotlyst.core.domain import Novel, Character, Scene, TagReference, SceneReaderInformation, \
+    ReaderInformationType
+from plotlyst.model.common import DistributionModel
+from plotlyst.model.distribution import CharactersScenesDistributionTableModel, \
+    InformationScenesDistributionTableModel, TagScenesDistributionTableModel
+
+
+@pytest.fixture
+def novel() -> Novel:
+    novel = Novel('Test')
+    alice, bob, carol = Character('Alice'), Character('Bob'), Character('Carol')
+    novel.characters.extend([alice, bob, carol])
+    tags = [tag for tags in novel.tags.values() for tag in tags][:3]
+
+    scene_1 = Scene('Scene 1', pov=alice, characters=[bob])
+    scene_1.tag_references.append(TagReference(tags[0].id))
+    scene_1.info.append(SceneReaderInformation(ReaderInformationType.Story, revelation=True))
+
+    scene_2 = Scene('Scene 2', pov=carol)
+    scene_2.tag_references.extend([TagReference(tags[1].id), TagReference(tags[2].id)])
+    scene_2.info.append(SceneReaderInformation(ReaderInformationType.World))
+
+    scene_3 = Scene('Scene 3', characters=[alice, carol])
+
+    novel.scenes.extend([scene_1, scene_2, scene_3])
+    return novel
+
+
+def _models(novel: Novel) -> List[DistributionModel]:
+    return [CharactersScenesDistributionTableModel(novel), InformationScenesDistributionTableModel(novel),
+            TagScenesDistributionTableModel(novel)]
+
+
+def _assert_incidence(model: DistributionModel):
+    for row in range(model.rowCount()):
+        for column in range(2, model.columnCount()):
+            assert model._hit(row, column) == model._match_by_row_col(row, column), (type(model).__name__, row,
+                                                                                     column)
+
+
+def test_incidence_matches_cells(qapp, novel):
+    for model in _models(novel):
+        assert any(model._row_bits(row) for row in range(model.rowCount()))
+        _assert_incidence(model)
+
+
+def test_update_scene(qapp, novel):
+    models = _models(novel)
+    for model in models:
+        model._matrix()
+
+    scene = novel.scenes[2]
+    scene.pov = novel.characters[1]
+    scene.characters.remove(novel.characters[0])
+    scene.tag_references.append(novel.scenes[0].tag_references[0])
+    scene.info.append(SceneReaderInformation(ReaderInformationType.Character, revelation=True))
+
+    for model in models:
+        changes = []
+        model.dataChanged.connect(lambda top_left, bottom_right: changes.append(
+            (top_left.column(), bottom_right.column())))
+        model.updateScene(scene)
+        assert changes == [(DistributionModel.IndexTags, DistributionModel.IndexTags), (4, 4)]
+        _assert_incidence(model)
+
+
+def test_update_scene_not_in_novel(qapp, novel):
+    model = CharactersScenesDistributionTableModel(novel)
+    model._matrix()
+
+    scene = novel.scenes.pop(1)
+    model.updateScene(scene)
+    _assert_incidence(model)
+
+
+def test_reorder_scenes(qapp, novel):
+    models = _models(novel)
+    for model in models:
+        model._matrix()
+
+    novel.scenes.reverse()
+    for model in models:
+        model.modelReset.emit()
+        _assert_incidence(model)
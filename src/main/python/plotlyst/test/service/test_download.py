@@ -0,0 +1,75 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+import requests
+
+from plotlyst.service.download import HttpClient, HttpCache, CachedResponse
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    documents = {'/feed.json': (b'{"items": [1, 2]}', '"v1"'), '/plain.txt': (b'plain', None)}
+    requests_log = []
+
+    def do_GET(self):
+        self.requests_log.append((self.path, self.headers.get('If-None-Match')))
+        if self.path not in self.documents:
+            self.send_response(404)
+            self.end_headers()
+            return
+        content, etag = self.documents[self.path]
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StubHandler.requests_log.clear()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_revalidate_cached_document(server, tmp_path):
+    client = HttpClient(HttpCache(str(tmp_path)))
+
+    assert client.get_json(f'{server}/feed.json') == {'items': [1, 2]}
+    assert client.get_json(f'{server}/feed.json') == {'items': [1, 2]}
+    assert StubHandler.requests_log == [('/feed.json', None), ('/feed.json', '"v1"')]
+
+    client.close()
+
+
+def test_cached_document_when_offline(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    client = HttpClient(cache)
+    url = 'http://127.0.0.1:1/feed.json'
+    with pytest.raises(requests.ConnectionError):
+        client.get(url)
+
+    cache.put(url, CachedResponse(b'{"items": []}', etag='"v0"'))
+    assert client.get_json(url) == {'items': []}
+
+
+def test_not_cached_without_validators(server, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    client = HttpClient(cache)
+
+    assert client.get(f'{server}/plain.txt') == b'plain'
+    assert cache.get(f'{server}/plain.txt') is None
+    with pytest.raises(requests.HTTPError):
+        client.get(f'{server}/missing')
@@ -0,0 +1,147 @@
+import os
+import re
+
+import pytest
+from jinja2 import Template
+
+from plotlyst import resources
+from plotlyst.service import formatting
+from plotlyst.service.formatting import LatexBuildCache, LatexBuildWorker, LatexBuildResult
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    converted = []
+
+    def convert_text(source, to, format, extra_args, outputfile):
+        converted.append(source)
+        with open(outputfile, 'w', encoding='utf-8') as f:
+            f.write(f'{to}: {source}')
+
+    monkeypatch.setattr(formatting.pypandoc, 'convert_text', convert_text)
+    return converted
+
+
+@pytest.fixture
+def pdflatex(monkeypatch):
+    runs = []
+
+    def run(args, cwd, check, stdout):
+        runs.append(args)
+        with open(os.path.join(cwd, 'main.pdf'), 'w') as f:
+            f.write('pdf')
+
+    monkeypatch.setattr(formatting.subprocess, 'run', run)
+    return runs
+
+
+def _build(cache: LatexBuildCache, main_tex: str, chapters):
+    result = LatexBuildResult()
+    outcome = {}
+    result.finished.connect(lambda path: outcome.setdefault('finished', path))
+    result.failed.connect(lambda error: outcome.setdefault('failed', error))
+    LatexBuildWorker(cache, main_tex, [(cache.key(html), html) for html in chapters], 'pdflatex', result).run()
+    return outcome
+
+
+def test_key(tmp_path, monkeypatch):
+    cache = LatexBuildCache(str(tmp_path))
+    assert cache.key('<p>Text</p>') == cache.key('<p>Text</p>')
+    assert cache.key('<p>Text</p>') != cache.key('<p>Other text</p>')
+
+    key = cache.key('<p>Text</p>')
+    monkeypatch.setattr(cache, 'PANDOC_ARGS', ['--top-level-division=chapter'])
+    assert cache.key('<p>Text</p>') != key
+
+
+def test_convert(tmp_path, conversions):
+    cache = LatexBuildCache(str(tmp_path))
+    key = cache.key('<p>Text</p>')
+    assert not cache.has(key)
+
+    cache.convert(key, '<p>Text</p>')
+    assert cache.has(key)
+    assert conversions == ['<p>Text</p>']
+    assert os.listdir(cache.chapters_dir) == [f'{key}.tex']
+
+
+def test_prune(tmp_path):
+    cache = LatexBuildCache(str(tmp_path))
+    for filename in ['a.tex', 'a.aux', 'b.tex', 'b.aux', 'c.tex']:
+        with open(os.path.join(cache.chapters_dir, filename), 'w') as f:
+            f.write('')
+
+    cache.prune(['a', 'c'])
+    assert sorted(os.listdir(cache.chapters_dir)) == ['a.aux', 'a.tex', 'c.tex']
+
+
+def test_build_key(tmp_path):
+    cache = LatexBuildCache(str(tmp_path))
+    cache.write_main('\\input{chapters/a}')
+    build_key = cache.build_key(['a'])
+    assert cache.build_key(['a']) == build_key
+    assert cache.build_key(['a', 'b']) != build_key
+
+    cache.write_main('\\input{chapters/b}')
+    assert cache.build_key(['a']) != build_key
+
+
+def test_is_built(tmp_path):
+    cache = LatexBuildCache(str(tmp_path))
+    cache.write_main('main')
+    build_key = cache.build_key(['a'])
+    cache.mark_built(build_key)
+    assert not cache.is_built(build_key)
+
+    with open(cache.pdf_path(), 'w') as f:
+        f.write('pdf')
+    assert cache.is_built(build_key)
+    assert not cache.is_built(cache.build_key(['a', 'b']))
+
+
+def test_build_converts_changed_chapters_only(tmp_path, conversions, pdflatex):
+    cache = LatexBuildCache(str(tmp_path))
+
+    assert _build(cache, 'main', ['<p>One</p>', '<p>Two</p>']) == {'finished': cache.pdf_path()}
+    assert sorted(conversions) == ['<p>One</p>', '<p>Two</p>']
+    assert len(pdflatex) == 1
+
+    assert _build(cache, 'main', ['<p>One</p>', '<p>Two</p>']) == {'finished': cache.pdf_path()}
+    assert len(conversions) == 2
+    assert len(pdflatex) == 1
+
+    assert _build(cache, 'main', ['<p>One</p>', '<p>Three</p>']) == {'finished': cache.pdf_path()}
+    assert conversions[2:] == ['<p>Three</p>']
+    assert len(pdflatex) == 2
+    assert not cache.has(cache.key('<p>Two</p>'))
+
+
+def test_build_failure(tmp_path, monkeypatch):
+    def convert_text(*args, **kwargs):
+        raise ValueError('Unknown format')
+
+    monkeypatch.setattr(formatting.pypandoc, 'convert_text', convert_text)
+    cache = LatexBuildCache(str(tmp_path))
+    assert _build(cache, 'main', ['<p>One</p>']) == {'failed': 'Unknown format'}
+
+
+TEMPLATES = [os.path.join(os.path.dirname(resources.__file__), 'images', 'manuscript.tex'),
+             os.path.join(os.path.dirname(resources.__file__), '..', '..', '..', 'resources', 'base', 'manuscript.tex')]
+
+
+@pytest.mark.parametrize('template_path', TEMPLATES)
+def test_template_includes_converted_chapters(tmp_path, conversions, template_path):
+    cache = LatexBuildCache(str(tmp_path))
+    keys = [cache.key(html) for html in ['<p>One</p>', '<p>Two</p>']]
+    for key, html in zip(keys, ['<p>One</p>', '<p>Two</p>']):
+        cache.convert(key, html)
+
+    with open(template_path, encoding='utf-8') as f:
+        template = Template(f.read())
+    tex = template.render({'font_size': '11pt', 'line_spacing': 'onehalf', 'full_path': cache.build_dir,
+                           'chapters': [cache.chapter_name(key) for key in keys]})
+
+    includes = [x.strip() for x in re.findall(r'\\include\{(.+?)\}\s*$', tex, re.MULTILINE)]
+    assert len(includes) == 2
+    for include in includes:
+        assert os.path.exists(os.path.join(cache.build_dir, f'{include}.tex'))
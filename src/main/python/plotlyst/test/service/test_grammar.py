@@ -0,0 +1,148 @@
+from typing import List, Callable, Optional
+
+import pytest
+
+from plotlyst.service.grammar import GrammarCheckService, language_tool_proxy
+
+
+class FakeTool:
+    def __init__(self):
+        self.checked: List[str] = []
+        self.on_check: Optional[Callable[[str], None]] = None
+
+    def check(self, text: str):
+        self.checked.append(text)
+        if self.on_check:
+            self.on_check(text)
+        return [f'match: {text}']
+
+
+class FakePool:
+    def __init__(self):
+        self.runnables = []
+
+    def start(self, runnable):
+        self.runnables.append(runnable)
+
+    def run(self):
+        while self.runnables:
+            self.runnables.pop(0).run()
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    tool = FakeTool()
+    monkeypatch.setattr(language_tool_proxy, '_language_tool', tool)
+    return tool
+
+
+@pytest.fixture
+def service():
+    service = GrammarCheckService()
+    service._pool = FakePool()
+    return service
+
+
+def _checked_keys(service: GrammarCheckService):
+    keys = []
+    service.checked.connect(keys.append)
+    return keys
+
+
+def test_request_is_checked_once(tool, service):
+    checked = _checked_keys(service)
+    key = service.key('Some text.', 'en-US')
+    service.request(key, 'Some text.')
+    service.request(key, 'Some text.')
+
+    service._pool.run()
+    assert tool.checked == ['Some text.']
+    assert checked == [key]
+    assert service.cached(key) == ['match: Some text.']
+
+
+def test_latest_request_first(tool, service):
+    first = service.key('First.', 'en-US')
+    second = service.key('Second.', 'en-US')
+    service.request(first, 'First.')
+    service.request(second, 'Second.')
+
+    service._pool.run()
+    assert tool.checked == ['Second.', 'First.']
+
+
+def test_cancel_pending_request(tool, service):
+    checked = _checked_keys(service)
+    key = service.key('Some text.', 'en-US')
+    service.request(key, 'Some text.')
+    service.cancel(key)
+
+    service._pool.run()
+    assert tool.checked == []
+    assert checked == []
+    assert service.cached(key) is None
+
+
+def test_cancel_one_of_many_requesters(tool, service):
+    key = service.key('Some text.', 'en-US')
+    service.request(key, 'Some text.')
+    service.request(key, 'Some text.')
+    service.cancel(key)
+
+    service._pool.run()
+    assert tool.checked == ['Some text.']
+    assert service.cached(key) == ['match: Some text.']
+
+
+def test_request_after_cancel_while_running(tool, service):
+    checked = _checked_keys(service)
+    key = service.key('Some text.', 'en-US')
+
+    def cancel_and_request_again(text: str):
+        tool.on_check = None
+        service.cancel(key)
+        service.request(key, text)
+
+    tool.on_check = cancel_and_request_again
+    service.request(key, 'Some text.')
+
+    service._pool.run()
+    assert tool.checked == ['Some text.']
+    assert checked == [key]
+    assert service.cached(key) == ['match: Some text.']
+    assert not service._requesters
+
+
+def test_failed_check_is_discarded(tool, service):
+    checked = _checked_keys(service)
+    discarded = []
+    service.discarded.connect(discarded.append)
+    key = service.key('Some text.', 'en-US')
+
+    def fail(_: str):
+        raise IOError('LanguageTool is down')
+
+    tool.on_check = fail
+    service.request(key, 'Some text.')
+    service._pool.run()
+    assert checked == []
+    assert discarded == [key]
+    assert service.cached(key) is None
+
+    tool.on_check = None
+    service.request(key, 'Some text.')
+    service._pool.run()
+    assert tool.checked == ['Some text.', 'Some text.']
+    assert checked == [key]
+
+
+def test_clear_discards_pending_requests(tool, service):
+    discarded = []
+    service.discarded.connect(discarded.append)
+    key = service.key('Some text.', 'en-US')
+    service.request(key, 'Some text.')
+    service.clear()
+
+    service._pool.run()
+    assert tool.checked == []
+    assert discarded == [key]
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from plotlyst.core.client import json_client
+from plotlyst.core.domain import Novel, Scene, Document
+from plotlyst.service import manuscript
+from plotlyst.service.manuscript import _scene_html_fragments, DOCX_FRAGMENTS_CACHE
+
+
+@pytest.fixture
+def conversions(monkeypatch):
+    converted = []
+
+    def convert_text(source, to, format, extra_args):
+        converted.append(source)
+        return f'<p>{source}</p>'
+
+    monkeypatch.setattr(manuscript.pypandoc, 'convert_text', convert_text)
+    monkeypatch.setattr(manuscript.pypandoc, 'get_pandoc_version', lambda: '3.1')
+    return converted
+
+
+def _novel(*contents: str) -> Novel:
+    novel = Novel('Test')
+    for i, content in enumerate(contents):
+        scene = Scene(f'Scene {i + 1}')
+        scene.manuscript = Document('', scene_id=scene.id)
+        scene.manuscript.content = content
+        novel.scenes.append(scene)
+    return novel
+
+
+def _cached_keys(novel: Novel):
+    return set(json.loads(json_client.load_cache(novel, DOCX_FRAGMENTS_CACHE))['fragments'].keys())
+
+
+def test_fragments_cache(qapp, test_client, conversions):
+    novel = _novel('One', 'Two')
+
+    fragments = _scene_html_fragments(novel, novel.scenes, {})
+    assert len(conversions) == 2
+    assert [fragments[scene] for scene in novel.scenes] == [f'<p>{x}</p>' for x in conversions]
+    assert len(_cached_keys(novel)) == 2
+
+    assert _scene_html_fragments(novel, novel.scenes, {}) == fragments
+    assert len(conversions) == 2
+
+    novel.scenes[1].manuscript.content = 'Three'
+    fragments = _scene_html_fragments(novel, novel.scenes, {})
+    assert len(conversions) == 3
+    assert fragments[novel.scenes[1]] == f'<p>{conversions[2]}</p>'
+
+
+def test_fragments_cache_prune(qapp, test_client, conversions):
+    novel = _novel('One', 'Two')
+    _scene_html_fragments(novel, novel.scenes, {})
+    keys = _cached_keys(novel)
+
+    novel.scenes.pop(1)
+    _scene_html_fragments(novel, novel.scenes, {})
+    assert len(conversions) == 2
+    assert len(_cached_keys(novel)) == 1
+    assert _cached_keys(novel) < keys
+
+
+def test_fragments_cache_pandoc_options(qapp, test_client, conversions, monkeypatch):
+    novel = _novel('One')
+    _scene_html_fragments(novel, novel.scenes, {})
+
+    monkeypatch.setattr(manuscript.pypandoc, 'get_pandoc_version', lambda: '3.2')
+    _scene_html_fragments(novel, novel.scenes, {})
+    assert len(conversions) == 2
+
+    monkeypatch.setattr(manuscript, 'DOCX_FRAGMENT_ARGS', ['--wrap=none'])
+    _scene_html_fragments(novel, novel.scenes, {})
+    assert len(conversions) == 3
+    assert len(_cached_keys(novel)) == 1
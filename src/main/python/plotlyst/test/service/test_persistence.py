@@ -0,0 +1,144 @@
+from plotlyst.core.client import client
+from plotlyst.core.domain import Novel, Character, DiagramData, Node, DiagramChanges, GlossaryItem, \
+    GraphicsItemType, Document, Task
+from plotlyst.env import app_env
+from plotlyst.service.persistence import RepositoryPersistenceManager, Operation, OperationType, _snapshot, \
+    delete_character
+
+
+def _novel_with_network() -> Novel:
+    novel = Novel.new_novel('test')
+    character = Character('Alice')
+    novel.characters.append(character)
+    diagram = novel.character_networks[0]
+    diagram.data = DiagramData()
+    diagram.data.nodes.append(Node(0, 0, GraphicsItemType.CHARACTER, character_id=character.id))
+    return novel
+
+
+def test_snapshot_copies_world():
+    novel = _novel_with_network()
+    novel.world.glossary['Dragon'] = GlossaryItem('Dragon')
+
+    snapshot = _snapshot(Operation(OperationType.UPDATE, novel=novel, world=novel.world))
+    assert snapshot.world is not novel.world
+    assert snapshot.world.glossary is not novel.world.glossary
+    assert snapshot.world.glossary.keys() == novel.world.glossary.keys()
+
+    novel.world.glossary['Griffin'] = GlossaryItem('Griffin')
+    assert 'Griffin' not in snapshot.world.glossary
+
+
+def test_snapshot_copies_diagram_data():
+    novel = _novel_with_network()
+    diagram = novel.character_networks[0]
+
+    snapshot = _snapshot(Operation(OperationType.UPDATE, novel=novel, diagram=diagram))
+    assert snapshot.diagram.data is not diagram.data
+    assert snapshot.diagram.data.nodes[0] is not diagram.data.nodes[0]
+    assert snapshot.diagram.data.nodes == diagram.data.nodes
+
+    diagram.data.nodes.clear()
+    assert len(snapshot.diagram.data.nodes) == 1
+
+
+def test_snapshot_shares_referenced_entities():
+    novel = _novel_with_network()
+    scene = novel.scenes[0]
+    scene.pov = novel.characters[0]
+    app_env.novel = novel
+
+    snapshot = _snapshot(Operation(OperationType.UPDATE, scene=scene))
+    assert snapshot.scene is not scene
+    assert snapshot.scene.pov is novel.characters[0]
+
+
+def test_updates_are_coalesced(qapp):
+    manager = RepositoryPersistenceManager()
+    novel = _novel_with_network()
+    diagram = novel.character_networks[0]
+    node = diagram.data.nodes[0]
+
+    first = DiagramChanges()
+    first.update_node(node)
+    manager._append(Operation(OperationType.UPDATE, novel=novel, diagram=diagram, diagram_changes=first))
+    second = DiagramChanges()
+    second.remove_node(node)
+    manager._append(Operation(OperationType.UPDATE, novel=novel, diagram=diagram, diagram_changes=second))
+    assert len(manager._operations) == 1
+    assert node.id in manager._operations[0].diagram_changes.removed_nodes
+
+    manager._append(Operation(OperationType.UPDATE, novel=novel, diagram=diagram))
+    assert len(manager._operations) == 1
+    assert manager._operations[0].diagram_changes is None
+
+    character = novel.characters[0]
+    manager._append(Operation(OperationType.UPDATE, character=character))
+    manager._append(Operation(OperationType.UPDATE, character=character, update_image=True))
+    assert len(manager._operations) == 2
+    assert manager._operations[1].update_image
+
+    manager._append(Operation(OperationType.DELETE, novel=novel, character=character))
+    assert len(manager._operations) == 2
+    assert manager._operations[1].type == OperationType.DELETE
+
+
+def test_flush_keeps_operations_while_writer_is_behind(qapp):
+    manager = RepositoryPersistenceManager()
+    for _ in range(manager.MAX_QUEUED_BATCHES):
+        manager._queue.put_nowait([])
+
+    novel = _novel_with_network()
+    manager._append(Operation(OperationType.UPDATE, character=novel.characters[0]))
+    assert not manager.flush()
+    assert len(manager._operations) == 1
+
+    manager._append(Operation(OperationType.UPDATE, character=novel.characters[0]))
+    assert len(manager._operations) == 1
+
+
+class _Hook:
+    def __init__(self, error: bool = False):
+        self.error = error
+        self.calls = 0
+
+    def flush(self):
+        self.calls += 1
+        if self.error:
+            raise RuntimeError('wrapped C/C++ object has been deleted')
+
+
+def test_failing_flush_hook_does_not_abort_flush(qapp):
+    manager = RepositoryPersistenceManager()
+    failing = _Hook(error=True)
+    hook = _Hook()
+    manager.register_flush_hook(failing.flush)
+    manager.register_flush_hook(hook.flush)
+
+    assert manager.flush()
+    assert failing.calls == 1
+    assert hook.calls == 1
+
+
+def test_delete_character_unlinks_documents_structures_and_tasks(test_client):
+    novel = Novel.new_novel('test')
+    character = Character('Alice')
+    novel.characters.append(character)
+    client.insert_novel(novel)
+    client.insert_character(novel, character)
+
+    novel.story_structures[0].set_character(character)
+    doc = Document('Alice', character_id=character.id)
+    novel.documents.append(Document('Notes', children=[doc]))
+    novel.board.tasks.append(Task('Interview', novel.board.statuses[0].id, character_id=character.id))
+
+    assert delete_character(novel, character, forced=True)
+    assert novel.story_structures[0].character_id is None
+    assert doc.character_id is None
+    assert doc.title == 'Character'
+    assert novel.board.tasks[0].character_id is None
+
+    saved_novel = client.fetch_novel(novel.id)
+    assert saved_novel.story_structures[0].character_id is None
+    assert saved_novel.documents[-1].children[0].character_id is None
+    assert saved_novel.board.tasks[0].character_id is None
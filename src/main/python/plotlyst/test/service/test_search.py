@@ -0,0 +1,87 @@
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtGui import QTextDocument, QTextCursor
+
+from plotlyst.core.domain import Novel, Scene, Document
+from plotlyst.service.search import ManuscriptSearchIndex, search_pattern
+
+
+def _novel(*contents: str) -> Novel:
+    novel = Novel('test')
+    for content in contents:
+        scene = Scene('')
+        scene.manuscript = Document('', scene_id=scene.id)
+        scene.manuscript.content = content
+        novel.scenes.append(scene)
+    return novel
+
+
+def _html(text: str) -> str:
+    doc = QTextDocument()
+    doc.setPlainText(text)
+    return doc.toHtml()
+
+
+def _matches(novel: Novel, term: str, **kwargs):
+    index = ManuscriptSearchIndex(novel)
+    pattern = search_pattern(term, **kwargs)
+    results = index.search(pattern, term, whole_word=kwargs.get('whole_word', False),
+                           regex=kwargs.get('regex', False))
+    return [x['match'] for matches in results.values() for x in matches]
+
+
+def test_search_options(test_client):
+    novel = _novel(_html('The cat sat on the mat.\nCatalogue of Cats.'))
+
+    assert _matches(novel, 'cat') == ['cat', 'Cat', 'Cat']
+    assert _matches(novel, 'cat', case_sensitive=True) == ['cat']
+    assert _matches(novel, 'cat', whole_word=True) == ['cat']
+    assert _matches(novel, 'Cats', whole_word=True, case_sensitive=True) == ['Cats']
+    assert _matches(novel, r'[cm]at\b', regex=True) == ['cat', 'mat']
+    assert _matches(novel, 'c.t') == []
+    assert _matches(novel, 'the cat', whole_word=True) == ['The cat']
+
+
+def test_match_positions(test_client):
+    doc = QTextDocument()
+    cursor = QTextCursor(doc)
+    cursor.insertText('First \U0001F600 paragraph')
+    cursor.insertBlock()
+    cursor.insertText('Soft\u2028break before the word')
+    cursor.insertBlock()
+    cursor.insertText('Last word')
+    novel = _novel(doc.toHtml())
+    scene = novel.scenes[0]
+
+    index = ManuscriptSearchIndex(novel)
+    matches = index.search_scene(scene, search_pattern('word', whole_word=True))
+    assert [x['block'] for x in matches] == [1, 2]
+
+    indexed_doc = QTextDocument()
+    indexed_doc.setHtml(scene.manuscript.content)
+    for match in matches:
+        block = indexed_doc.findBlockByNumber(match['block'])
+        start, end = match['pos_in_block']
+        assert block.text()[start:end] == 'word'
+        assert match['start'] == block.position() + start
+        cursor = QTextCursor(indexed_doc)
+        cursor.setPosition(match['start'])
+        cursor.setPosition(match['end'], QTextCursor.MoveMode.KeepAnchor)
+        assert cursor.selectedText() == 'word'
+
+    matches = index.search_scene(scene, search_pattern('paragraph'))
+    assert matches[0]['block'] == 0
+    assert matches[0]['pos_in_block'] == (9, 18)
+
+
+def test_index_is_restored_from_cache(test_client):
+    novel = _novel(_html('Soft\u2028break before the word'))
+    index = ManuscriptSearchIndex(novel)
+    index.search(search_pattern('word'), 'word')
+    index.save()
+    QThreadPool.globalInstance().waitForDone()
+
+    restored = ManuscriptSearchIndex(novel)
+    restored._restore()
+    entry = restored._entries[novel.scenes[0].id]
+    assert entry.block_starts == [0]
+    assert restored.search_scene(novel.scenes[0], search_pattern('word'))[0]['block'] == 0
@@ -0,0 +1,28 @@
+from PyQt6.QtGui import QImage, QColor
+
+from plotlyst.service.tiles import MapTilePyramid
+
+
+def test_build_pyramid(tmp_path):
+    source = tmp_path / 'map.png'
+    image = QImage(1200, 700, QImage.Format.Format_ARGB32)
+    image.fill(QColor('#2a9d8f'))
+    assert image.save(str(source))
+
+    pyramid = MapTilePyramid(tmp_path / 'tiles', source)
+    assert not pyramid.load()
+    pyramid.build()
+
+    pyramid = MapTilePyramid(tmp_path / 'tiles', source)
+    assert pyramid.load()
+    assert (pyramid.width, pyramid.height) == (1200, 700)
+    assert pyramid.levels == 3
+    assert pyramid.grid(0) == (3, 2)
+    assert pyramid.grid(2) == (1, 1)
+    assert QImage(str(pyramid.tile_path(0, 2, 1))).size().width() == 1200 - 2 * MapTilePyramid.TILE_SIZE
+    assert pyramid.overview().width() == 300
+
+    image.fill(QColor('#e76f51'))
+    image.save(str(source.with_name('other.png')))
+    source.with_name('other.png').replace(source)
+    assert not pyramid.load()
@@ -132,6 +132,15 @@ def test_character_distribution_display(qtbot, filled_window: MainWindow):
     assert_not_painted(model.index(4, 2))
     assert_not_painted(model.index(4, 3))
 
+    view.novel.scenes.reverse()
+    view._handle_scene_order_changed()
+    assert_painted(model.index(2, 3))
+    assert_not_painted(model.index(2, 2))
+    assert_painted(model.index(3, 2))
+    assert_not_painted(model.index(3, 3))
+    view.novel.scenes.reverse()
+    view._handle_scene_order_changed()
+
     # click brushed scene cell
     click_on_item(qtbot, view.characters_distribution.tblSceneDistribution, 0, 2)
     assert model.flags(model.index(3, 1)) == Qt.ItemFlag.NoItemFlags
@@ -0,0 +1,84 @@
+from typing import Any
+
+from PyQt6.QtWidgets import QScrollArea
+
+from plotlyst.test.common import show_widget
+from plotlyst.view.widget.cards import Card, VirtualCardsView
+
+
+class ItemCard(Card):
+    created: int = 0
+
+    def __init__(self, item: Any, parent=None):
+        super().__init__(parent)
+        self.item = item
+        ItemCard.created += 1
+
+    def mimeType(self) -> str:
+        return 'application/test-card'
+
+    def data(self) -> Any:
+        return self.item
+
+    def copy(self) -> 'Card':
+        return ItemCard(self.item)
+
+    def rebind(self, data: Any):
+        self.item = data
+
+
+def _cards_view(qtbot, items: int):
+    scroll = QScrollArea()
+    scroll.setWidgetResizable(True)
+    view = VirtualCardsView()
+    view.setCardFactory(ItemCard)
+    view.setCardsWidth(100)
+    scroll.setWidget(view)
+    scroll.resize(400, 500)
+    show_widget(qtbot, scroll)
+    view.setItems(range(items))
+    return scroll, view
+
+
+def _visible_items(view: VirtualCardsView):
+    return sorted(card.data() for card in view.cards() if card.isVisible())
+
+
+def test_only_visible_rows_have_cards(qtbot):
+    ItemCard.created = 0
+    scroll, view = _cards_view(qtbot, 300)
+
+    assert view._columns == 3
+    visible = view._visibleRange()
+    assert visible.start == 0
+    assert len(view.cards()) == len(visible)
+    assert _visible_items(view) == list(visible)
+    assert ItemCard.created < 300
+
+
+def test_cards_are_recycled_when_scrolling(qtbot):
+    ItemCard.created = 0
+    scroll, view = _cards_view(qtbot, 300)
+    created = ItemCard.created
+
+    scroll.verticalScrollBar().setValue(scroll.verticalScrollBar().maximum() // 2)
+    visible = view._visibleRange()
+    assert visible.start > 0
+    assert _visible_items(view) == list(visible)
+
+    scroll.verticalScrollBar().setValue(scroll.verticalScrollBar().maximum())
+    scroll.verticalScrollBar().setValue(0)
+    assert ItemCard.created <= created + len(visible)
+    assert _visible_items(view) == list(view._visibleRange())
+
+
+def test_card_at_after_scrolling(qtbot):
+    scroll, view = _cards_view(qtbot, 300)
+    scroll.verticalScrollBar().setValue(scroll.verticalScrollBar().maximum())
+
+    assert view.cardAt(299).data() == 299
+    card = view.cardAt(0)
+    assert card.data() == 0
+    assert card.geometry() == view._slotRect(0)
+    assert view.cardAt(300) is None
+    assert view.cardAt(-1) is None
@@ -0,0 +1,64 @@
+from plotlyst.core.domain import Character, CharacterPersonalityAttribute, CharacterProfileSectionType, \
+    NovelSetting
+from plotlyst.core.template import protagonist_role
+from plotlyst.view.widget.characters import CharacterProgress
+
+
+def _disable_sections_except(character: Character, *types: CharacterProfileSectionType):
+    for section in character.profile:
+        section.enabled = section.type in types
+
+
+def test_progress_of_empty_character():
+    character = Character('')
+    _disable_sections_except(character)
+    progress = CharacterProgress(character)
+
+    assert progress.scores[CharacterProgress.Name] == (0, 1)
+    assert progress.scores[CharacterProgress.Overall] == (0, 2)
+    assert progress.percentage() == 0
+
+
+def test_progress_of_basic_info():
+    character = Character('Alice', gender='female', role=protagonist_role)
+    _disable_sections_except(character)
+    progress = CharacterProgress(character)
+
+    assert progress.scores[CharacterProgress.Name] == (1, 1)
+    assert progress.scores[CharacterProgress.Role] == (1, 1)
+    assert progress.scores[CharacterProgress.Gender] == (1, 1)
+    assert progress.scores[CharacterProgress.Overall] == (2, 2)
+    assert progress.percentage() == 100
+
+
+def test_personality_progress():
+    character = Character('Alice')
+    _disable_sections_except(character, CharacterProfileSectionType.Personality)
+    for setting in [NovelSetting.Character_enneagram, NovelSetting.Character_mbti,
+                    NovelSetting.Character_love_style, NovelSetting.Character_work_style]:
+        character.prefs.settings[setting.value] = False
+
+    assert CharacterProgress(character).scores[CharacterProfileSectionType.Personality] == (0, 1)
+    character.traits.append('brave')
+    assert CharacterProgress(character).scores[CharacterProfileSectionType.Personality] == (1, 1)
+
+    character.prefs.settings.clear()
+    assert CharacterProgress(character).scores[CharacterProfileSectionType.Personality] == (1, 5)
+    character.personality.mbti = CharacterPersonalityAttribute('ISTJ')
+    progress = CharacterProgress(character)
+    assert progress.scores[CharacterProfileSectionType.Personality] == (2, 5)
+    assert progress.scores[CharacterProgress.Overall] == (2, 7)
+
+
+def test_section_progress():
+    character = Character('Alice')
+    _disable_sections_except(character, CharacterProfileSectionType.Summary, CharacterProfileSectionType.Faculties)
+    progress = CharacterProgress(character)
+    assert progress.scores[CharacterProfileSectionType.Summary] == (0, 1)
+    assert progress.scores[CharacterProfileSectionType.Faculties] == (0, 5)
+    assert CharacterProfileSectionType.Personality not in progress.scores
+
+    character.summary = 'Summary'
+    progress = CharacterProgress(character)
+    assert progress.scores[CharacterProfileSectionType.Summary] == (1, 1)
+    assert progress.scores[CharacterProgress.Overall] == (1, 8)
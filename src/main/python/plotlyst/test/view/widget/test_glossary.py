@@ -0,0 +1,58 @@
+import re
+
+from plotlyst.core.domain import GlossaryItem
+from plotlyst.view.widget.world.glossary import GlossaryMatcher, glossary_matcher, clear_glossary_matchers, \
+    invalidate_glossary_matcher
+
+
+def _glossary(*keys: str):
+    return {key: GlossaryItem(key, key=key) for key in keys}
+
+
+def _refs(matcher: GlossaryMatcher, text: str):
+    return sorted((ref.start, ref.length, ref.glossary.key) for ref in matcher.find(text))
+
+
+def test_trie_expression():
+    expr = GlossaryMatcher._trie_expression(['High Elves', 'High Elven King', 'Dark Lord'])
+    pattern = re.compile(expr)
+
+    assert pattern.fullmatch('High Elves')
+    assert pattern.fullmatch('High Elven King')
+    assert pattern.fullmatch('Dark Lord')
+    assert not pattern.fullmatch('High Elven')
+    assert not pattern.fullmatch('Dark')
+    assert GlossaryMatcher._trie_expression([]) == ''
+
+
+def test_single_word_offsets():
+    matcher = GlossaryMatcher(_glossary('Mordor', 'ring'))
+
+    assert _refs(matcher, 'The ring went to Mordor.') == [(4, 4, 'ring'), (17, 7, 'Mordor')]
+    assert _refs(matcher, '(ring) rings') == [(0, 6, 'ring')]
+    assert _refs(matcher, 'Nothing here') == []
+
+
+def test_longest_phrase_match():
+    matcher = GlossaryMatcher(_glossary('Elder Council', 'Elder Council of Ash', 'Ash'))
+
+    assert _refs(matcher, 'The Elder Council of Ash met') == [(4, 20, 'Elder Council of Ash'), (21, 3, 'Ash')]
+    assert _refs(matcher, 'The Elder Council met') == [(4, 13, 'Elder Council')]
+
+
+def test_matcher_cache():
+    glossary = _glossary('Mordor')
+    matcher = glossary_matcher(glossary)
+    assert glossary_matcher(glossary) is matcher
+
+    glossary['Gondor'] = GlossaryItem('Gondor', key='Gondor')
+    assert glossary_matcher(glossary) is not matcher
+
+    matcher = glossary_matcher(glossary)
+    invalidate_glossary_matcher(glossary)
+    assert glossary_matcher(glossary) is not matcher
+
+    matcher = glossary_matcher(glossary)
+    clear_glossary_matchers()
+    assert glossary_matcher(glossary) is not matcher
+    clear_glossary_matchers()
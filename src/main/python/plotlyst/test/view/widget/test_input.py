@@ -1,7 +1,8 @@
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextCursor
 
 from plotlyst.test.common import show_widget
-from plotlyst.view.widget.input import PowerBar, Toggle
+from plotlyst.view.widget.input import PowerBar, Toggle, TextEditBase
 
 
 def test_powerbar(qtbot):
@@ -25,3 +26,39 @@ def test_toggle(qtbot):
 
     qtbot.mouseClick(toggle, Qt.MouseButton.LeftButton)
     assert not toggle.isChecked()
+
+
+def test_text_statistics(qtbot):
+    textedit = TextEditBase()
+    show_widget(qtbot, textedit)
+
+    qtbot.keyClicks(textedit, 'Once upon a time')
+    assert textedit.statistics().word_count == 4
+
+    cursor = textedit.textCursor()
+    cursor.insertBlock()
+    cursor.insertText('there was a king')
+    assert textedit.statistics().word_count == 8
+
+    cursor.movePosition(QTextCursor.MoveOperation.Start)
+    cursor.movePosition(QTextCursor.MoveOperation.NextBlock, QTextCursor.MoveMode.KeepAnchor)
+    cursor.removeSelectedText()
+    assert textedit.statistics().word_count == 4
+
+    textedit.setHtml('<p>One</p><p>Two three</p>')
+    assert textedit.statistics().word_count == 3
+
+
+def test_text_statistics_multi_block_replacement(qtbot):
+    textedit = TextEditBase()
+    show_widget(qtbot, textedit)
+
+    textedit.setPlainText('one two\nsix ten\nred fox')
+    assert textedit.statistics().word_count == 6
+
+    cursor = textedit.textCursor()
+    cursor.movePosition(QTextCursor.MoveOperation.Start)
+    cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+    cursor.insertText('abc def\nghi jkl\nmno pqr')
+    assert textedit.document().blockCount() == 3
+    assert textedit.statistics().word_count == 6
@@ -40,6 +40,7 @@ class AbstractView(QObject, EventListener):
     def __init__(self, global_event_types: Optional[List[Any]] = None):
         super().__init__(None)
         self._refresh_on_activation: bool = False
+        self._batched_refresh: Optional[bool] = None
         self.widget = QWidget()
         self.title: Optional[QWidget] = None
         self._navigable_button_group: Optional[QButtonGroup] = None
@@ -62,10 +63,24 @@ class AbstractView(QObject, EventListener):
 
     @overrides
     def event_received(self, event: Event):
-        if self.widget.isVisible():
-            self.refresh()
-        else:
+        if not self.widget.isVisible():
             self._refresh_on_activation = True
+        elif self._batched_refresh is not None:
+            self._batched_refresh = True
+        else:
+            self.refresh()
+
+    @overrides
+    def events_received(self, events: List[Event]):
+        self._batched_refresh = False
+        try:
+            for event in events:
+                self.event_received(event)
+            refresh = self._batched_refresh
+        finally:
+            self._batched_refresh = None
+        if refresh:
+            self.refresh()
 
     def activate(self):
         if self._refresh_on_activation:
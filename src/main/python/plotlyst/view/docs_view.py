@@ -101,18 +101,16 @@ class DocumentsView(AbstractNovelView):
                 self.textEditor.setTitleIcon(avatars.avatar(event.character))
             return
         if isinstance(event, CharacterDeletedEvent):
+            # the documents were already unlinked from the character by the deletion service
             for doc in self.ui.treeDocuments.documents():
-                if doc.character_id == event.character.id:
-                    doc.reset_character()
-                    doc.title = 'Character'
+                if doc.character_id is None:
                     self.ui.treeDocuments.updateDocument(doc)
-
-                    if self._current_doc == doc:
-                        self.textEditor.setTitle(doc.title)
-                        self.textEditor.setTitleIcon(IconRegistry.from_name(doc.icon))
-                        self.textEditor.setTitleReadOnly(False)
-
-                    self.repo.update_novel(self.novel)
+            if self._current_doc and self._current_doc.character_id is None and self.textEditor:
+                self.textEditor.setTitle(self._current_doc.title)
+                if self._current_doc.icon:
+                    self.textEditor.setTitleIcon(
+                        IconRegistry.from_name(self._current_doc.icon, self._current_doc.icon_color))
+                self.textEditor.setTitleReadOnly(False)
             return
 
         super().event_received(event)
@@ -19,20 +19,24 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import os
 import subprocess
+from typing import List, Tuple
 
-import pypandoc
+from PyQt6.QtCore import QThreadPool
 from PyQt6.QtGui import QShowEvent
-from PyQt6.QtWidgets import QWidget
+from PyQt6.QtWidgets import QWidget, QProgressBar
 from jinja2 import Template
 from overrides import overrides
-from qthandy import hbox
+from qthandy import vbox, spacer
 
 from plotlyst.core.client import json_client
 from plotlyst.core.domain import Novel
 from plotlyst.env import app_env
 from plotlyst.resources import resource_registry
+from plotlyst.service.formatting import LatexBuildCache, LatexBuildResult, LatexBuildWorker
 from plotlyst.view._view import AbstractNovelView
+from plotlyst.view.common import label
 from plotlyst.view.generated.formatting_view_ui import Ui_FormattingView
+from plotlyst.view.layout import group
 from plotlyst.view.widget.pdf import PdfView
 
 
@@ -62,7 +66,14 @@ class FormattingWidget(QWidget):
     def __init__(self, novel: Novel, parent=None):
         super().__init__(parent)
         self.novel = novel
-        hbox(self, 10, 6)
+        vbox(self, 10, 6)
+        self._lblStatus = label('', description=True)
+        self._progress = QProgressBar()
+        self._progress.setMaximumWidth(600)
+        self._progress.setTextVisible(False)
+        self._wdgStatus = group(self._lblStatus, self._progress, spacer())
+        self._wdgStatus.setHidden(True)
+        self.layout().addWidget(self._wdgStatus)
         self._pdfView = PdfView()
         self._pdfView.setMaximumWidth(600)
         self.layout().addWidget(self._pdfView)
@@ -72,9 +83,10 @@ class FormattingWidget(QWidget):
 
         self._template = Template(template_content)
         self._novel_dir = os.path.join(app_env.cache_dir, str(self.novel.id))
-        self._chapters_dir = os.path.join(self._novel_dir, 'chapters')
-        os.makedirs(self._novel_dir, exist_ok=True)
-        os.makedirs(self._chapters_dir, exist_ok=True)
+        self._cache = LatexBuildCache(self._novel_dir)
+        self._thread_pool = QThreadPool()
+        self._building: bool = False
+        self._rebuild: bool = False
 
         self._config = {
             "title": "The Picture of Dorian Gray",
@@ -82,35 +94,76 @@ class FormattingWidget(QWidget):
             "subtitle": "A novel about beauty, corruption, and consequence.",
             "font_size": "11pt",
             "line_spacing": "onehalf",
-            "full_path": str(self._chapters_dir),
-            "chapters": ["chapter1", "chapter2"]
+            "full_path": str(self._cache.build_dir),
+            "chapters": []
         }
-        self._output_tex_path = os.path.join(self._novel_dir, 'main.tex')
 
     @overrides
     def showEvent(self, event: QShowEvent) -> None:
-        self._renderMain()
-        self._generateChapters()
-        self._generatePdf()
-
-    def _renderMain(self):
-        rendered_tex = self._template.render(self._config)
-        with open(self._output_tex_path, "w", encoding="utf-8") as f:
-            f.write(rendered_tex)
-
-    def _generateChapters(self):
+        self._build()
+
+    def _build(self):
+        if self._building:
+            self._rebuild = True
+            return
+
+        chapters = self._chapters()
+        self._config['chapters'] = [self._cache.chapter_name(key) for key, _ in chapters]
+        main_tex = self._template.render(self._config)
+
+        self._building = True
+        self._lblStatus.setText('Preparing manuscript...')
+        self._progress.setRange(0, 0)
+        self._progress.setVisible(True)
+        self._wdgStatus.setVisible(True)
+
+        result = LatexBuildResult()
+        result.progress.connect(self._buildProgressed)
+        result.finished.connect(self._buildFinished)
+        result.failed.connect(self._buildFailed)
+        runnable = LatexBuildWorker(self._cache, main_tex, chapters,
+                                    os.path.join(app_env.cache_dir, 'tinytex/.TinyTeX/bin/x86_64-linux/pdflatex'),
+                                    result)
+        self._thread_pool.start(runnable)
+
+    def _chapters(self) -> List[Tuple[str, str]]:
         json_client.load_manuscript(self.novel)
+        chapters = []
         if self.novel.prefs.is_scenes_organization():
             pass
         else:
-            for i, scene in enumerate(self.novel.scenes):
-                output = os.path.join(self._chapters_dir, f'chapter{i + 1}.tex')
-                pypandoc.convert_text(scene.manuscript.content, to='latex', format='html', outputfile=output)
-
-    def _generatePdf(self):
-        subprocess.run(
-            [os.path.join(app_env.cache_dir, 'tinytex/.TinyTeX/bin/x86_64-linux/pdflatex'), str(self._output_tex_path)])
-        self._pdfView.load('main.pdf')
+            for scene in self.novel.scenes:
+                if scene.manuscript:
+                    chapters.append((self._cache.key(scene.manuscript.content), scene.manuscript.content))
+
+        return chapters
+
+    def _buildProgressed(self, converted: int, total: int):
+        if total:
+            self._lblStatus.setText(f'Converting chapters ({converted}/{total})...')
+            self._progress.setRange(0, total)
+            self._progress.setValue(converted)
+            if converted == total:
+                self._lblStatus.setText('Typesetting...')
+                self._progress.setRange(0, 0)
+        else:
+            self._lblStatus.setText('Typesetting...')
+
+    def _buildFinished(self, pdf_path: str):
+        self._pdfView.load(pdf_path)
+        self._wdgStatus.setHidden(True)
+        self._buildDone()
+
+    def _buildFailed(self, msg: str):
+        self._lblStatus.setText(f'Could not build the manuscript: {msg}')
+        self._progress.setHidden(True)
+        self._buildDone()
+
+    def _buildDone(self):
+        self._building = False
+        if self._rebuild:
+            self._rebuild = False
+            self._build()
 
 
 class FormattingView(AbstractNovelView):
@@ -17,18 +17,21 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import Dict, Optional
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple, Any
 
 import qtawesome
-from PyQt6.QtCore import QSize
-from PyQt6.QtGui import QIcon, QPixmap
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QIcon, QPixmap, QImage, QColor
 from PyQt6.QtWidgets import QLabel
 
 from plotlyst.common import CONFLICT_CHARACTER_COLOR, \
     CONFLICT_SOCIETY_COLOR, CONFLICT_NATURE_COLOR, CONFLICT_TECHNOLOGY_COLOR, CONFLICT_SUPERNATURAL_COLOR, \
     CONFLICT_SELF_COLOR, CHARACTER_MAJOR_COLOR, CHARACTER_MINOR_COLOR, CHARACTER_SECONDARY_COLOR, \
     PLOTLYST_SECONDARY_COLOR, PLOTLYST_MAIN_COLOR, NEUTRAL_EMOTION_COLOR, EMOTION_COLORS, RED_COLOR, act_color, \
-    BLACK_COLOR, RELAXED_WHITE_COLOR, LIGHTGREY_ACTIVE_COLOR
+    BLACK_COLOR, RELAXED_WHITE_COLOR, LIGHTGREY_ACTIVE_COLOR, NAV_BAR_BUTTON_DEFAULT_COLOR, NAV_BAR_BUTTON_CHECKED_COLOR
+from plotlyst.core.client import json_client
 from plotlyst.core.domain import Character, \
     Scene, PlotType, MALE, FEMALE, TRANSGENDER, NON_BINARY, GENDERLESS, ScenePurposeType, StoryStructure, Tier, \
     ConflictType
@@ -36,6 +39,57 @@ from plotlyst.core.template import SelectionItem
 from plotlyst.view.common import rounded_pixmap
 
 
+IconKey = Tuple[str, Any, Any, Optional[float], bool, bool, int]
+
+
+class IconCache:
+    """LRU cache of the font icons built by IconRegistry.from_name."""
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self._icons: OrderedDict[IconKey, QIcon] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._icons)
+
+    def get(self, key: IconKey) -> Optional[QIcon]:
+        icon = self._icons.get(key)
+        if icon is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._icons.move_to_end(key)
+        return icon
+
+    def put(self, key: IconKey, icon: QIcon):
+        self._icons[key] = icon
+        self._icons.move_to_end(key)
+        while len(self._icons) > self.max_size:
+            self._icons.popitem(last=False)
+
+    def clear(self):
+        self._icons.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0
+        return f'{len(self._icons)}/{self.max_size} icons, {self.hits} hits, {self.misses} misses ' \
+               f'({ratio:.0%} hit rate)'
+
+
+icon_cache = IconCache()
+
+
+def _color_key(color: Any) -> Any:
+    if isinstance(color, QColor):
+        return color.name(QColor.NameFormat.HexArgb)
+    return color
+
+
 class IconRegistry:
 
     @staticmethod
@@ -213,9 +267,7 @@ class IconRegistry:
             color = '#d4a373'
         else:
             color = '#CB4D4D'
-        return qtawesome.icon('fa5s.circle', 'fa5s.yin-yang',
-                              options=[{'color': 'white', 'scale_factor': 1},
-                                       {'color': color, 'color_disabled': 'black'}])
+        return IconRegistry._stacked_scene_icon(color)
 
     @staticmethod
     def scene_type_icon(scene: Scene) -> Optional[QIcon]:
@@ -237,9 +289,18 @@ class IconRegistry:
 
     @staticmethod
     def reaction_scene_icon() -> QIcon:
-        return qtawesome.icon('fa5s.circle', 'fa5s.yin-yang',
-                              options=[{'color': 'white', 'scale_factor': 1},
-                                       {'color': '#4b86b4', 'color_disabled': 'black'}])
+        return IconRegistry._stacked_scene_icon('#4b86b4')
+
+    @staticmethod
+    def _stacked_scene_icon(color: str) -> QIcon:
+        key = ('fa5s.circle+fa5s.yin-yang', color, 'black', 1, False, False, 0)
+        icon = icon_cache.get(key)
+        if icon is None:
+            icon = QIcon(qtawesome.icon('fa5s.circle', 'fa5s.yin-yang',
+                                        options=[{'color': 'white', 'scale_factor': 1},
+                                                 {'color': color, 'color_disabled': 'black'}]))
+            icon_cache.put(key, icon)
+        return QIcon(icon)
 
     @staticmethod
     def happening_scene_icon() -> QIcon:
@@ -753,10 +814,19 @@ class IconRegistry:
                   hflip: bool = False,
                   vflip: bool = False, rotated: int = 0) -> QIcon:
         _color_on = color_on if color_on else color
+        key = (name, _color_key(color), _color_key(_color_on), scale, hflip, vflip, rotated)
+        icon = icon_cache.get(key)
+        if icon is None:
+            icon = IconRegistry._build_icon(name, color, _color_on, scale, hflip, vflip, rotated)
+            icon_cache.put(key, icon)
+        return QIcon(icon)
 
+    @staticmethod
+    def _build_icon(name: str, color, color_on, scale: Optional[float], hflip: bool, vflip: bool,
+                    rotated: int) -> QIcon:
         icon_args = {
             'color': color,
-            'color_on': _color_on
+            'color_on': color_on
         }
 
         if (scale is not None) or (
@@ -776,14 +846,44 @@ class IconRegistry:
 
         return QIcon(qtawesome.icon(name, **icon_args))
 
+    @staticmethod
+    def warm_up():
+        """Builds the icons of the navigation bar and the scene and distribution tables ahead of the first paint."""
+        for color, color_on in [('black', PLOTLYST_SECONDARY_COLOR),
+                                (NAV_BAR_BUTTON_DEFAULT_COLOR, NAV_BAR_BUTTON_CHECKED_COLOR)]:
+            IconRegistry.board_icon(color, color_on)
+            IconRegistry.book_icon(color, color_on)
+            IconRegistry.scene_icon(color, color_on)
+            IconRegistry.manuscript_icon(color, color_on)
+            IconRegistry.world_building_icon(color, color_on)
+            IconRegistry.document_edition_icon(color, color_on)
+            IconRegistry.reports_icon(color, color_on)
+            IconRegistry.formatting_icon(color, color_on)
+        IconRegistry.action_scene_icon()
+        IconRegistry.action_scene_icon(resolved=True)
+        IconRegistry.action_scene_icon(trade_off=True)
+        IconRegistry.action_scene_icon(motion=True)
+        IconRegistry.reaction_scene_icon()
+        IconRegistry.character_development_scene_icon()
+        IconRegistry.mood_scene_icon()
+        IconRegistry.setup_scene_icon()
+        IconRegistry.exposition_scene_icon()
+        IconRegistry.wip_icon()
+        IconRegistry.hashtag_icon()
+        IconRegistry.goal_icon()
+        IconRegistry.storylines_icon()
+
 
 class AvatarsRegistry:
+    THUMBNAIL_SIZES = (32, 64, 128, 256)
+
     def __init__(self):
-        self._images: Dict[Character, QPixmap] = {}
+        self._images: Dict[Character, List[QPixmap]] = {}
+        self._icons: Dict[Character, QIcon] = {}
 
     def avatar(self, character: Character, fallback: bool = True) -> QIcon:
-        if character.prefs.avatar.use_image and character.avatar:
-            return QIcon(self.image(character))
+        if character.prefs.avatar.use_image and character.has_avatar():
+            return self._image_icon(character)
         elif character.prefs.avatar.use_role and character.role:
             return IconRegistry.from_name(character.role.icon, character.role.icon_color)
         elif character.prefs.avatar.use_custom_icon and character.prefs.avatar.icon:
@@ -797,18 +897,10 @@ class AvatarsRegistry:
             return None
 
     def image(self, character: Character) -> QPixmap:
-        if character in self._images.keys():
-            return self._images[character]
-
-        pixmap = QPixmap()
-        if not character.avatar:
-            return pixmap
-
-        pixmap.loadFromData(character.avatar)
-        rounded = rounded_pixmap(pixmap)
-        self._images[character] = rounded
-
-        return rounded
+        thumbnails = self._thumbnails(character)
+        if thumbnails:
+            return thumbnails[-1]
+        return QPixmap()
 
     def has_name_initial_icon(self, character: Character) -> bool:
         if character.name and (character.name[0].isnumeric() or character.name[0].isalpha()):
@@ -838,13 +930,62 @@ class AvatarsRegistry:
         return IconRegistry.from_name(icon, color, color_on)
 
     def update_image(self, character: Character):
-        if character in self._images.keys():
-            self._images.pop(character)
+        self._images.pop(character, None)
+        self._icons.pop(character, None)
         self.image(character)
 
     def _dummy_avatar(self) -> QIcon:
         return IconRegistry.character_icon(color_on='black')
 
+    def _image_icon(self, character: Character) -> QIcon:
+        icon = self._icons.get(character)
+        if icon is None:
+            icon = QIcon()
+            for pixmap in self._thumbnails(character):
+                icon.addPixmap(pixmap)
+            self._icons[character] = icon
+        return icon
+
+    def _thumbnails(self, character: Character) -> List[QPixmap]:
+        if character in self._images.keys():
+            return self._images[character]
+
+        thumbnails = []
+        if character.avatar:
+            source = QImage.fromData(character.avatar)
+            if not source.isNull():
+                thumbnails = [self._rounded_thumbnail(source, size) for size in self.THUMBNAIL_SIZES]
+        elif character.avatar_id:
+            thumbnails = self._cached_thumbnails(character.avatar_id)
+        self._images[character] = thumbnails
+
+        return thumbnails
+
+    def _cached_thumbnails(self, avatar_id: uuid.UUID) -> List[QPixmap]:
+        thumbnails = []
+        source: Optional[QImage] = None
+        for size in self.THUMBNAIL_SIZES:
+            image = json_client.load_avatar_thumbnail(avatar_id, size)
+            if image is not None:
+                thumbnails.append(QPixmap.fromImage(image))
+                continue
+
+            if source is None:
+                source = json_client.load_avatar(avatar_id, self.THUMBNAIL_SIZES[-1])
+                if source is None:
+                    return []
+            pixmap = self._rounded_thumbnail(source, size)
+            json_client.save_avatar_thumbnail(avatar_id, size, pixmap.toImage())
+            thumbnails.append(pixmap)
+
+        return thumbnails
+
+    @staticmethod
+    def _rounded_thumbnail(source: QImage, size: int) -> QPixmap:
+        scaled = source.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                               Qt.TransformationMode.SmoothTransformation)
+        return rounded_pixmap(QPixmap.fromImage(scaled))
+
 
 avatars = AvatarsRegistry()
 
@@ -17,8 +17,11 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import logging
+import time
+from dataclasses import dataclass
 from functools import partial
-from typing import Optional, List
+from typing import Optional, List, Dict, Callable
 
 import qtanim
 from PyQt6.QtCore import Qt, QThreadPool, QEvent, QMimeData, QTimer
@@ -72,7 +75,7 @@ from plotlyst.view.docs_view import DocumentsView
 from plotlyst.view.formating_view import FormattingView
 from plotlyst.view.generated.main_window_ui import Ui_MainWindow
 from plotlyst.view.home_view import HomeView
-from plotlyst.view.icons import IconRegistry
+from plotlyst.view.icons import IconRegistry, icon_cache
 from plotlyst.view.manuscript_view import ManuscriptView
 from plotlyst.view.novel_view import NovelView
 from plotlyst.view.reports_view import ReportsView
@@ -90,12 +93,22 @@ from plotlyst.view.widget.tour.core import TutorialNovelOpenTourEvent, tutorial_
     TutorialNovelCloseTourEvent, NovelTopLevelButtonTourEvent, HomeTopLevelButtonTourEvent, NovelEditorDisplayTourEvent, \
     AllNovelViewsTourEvent, GeneralNovelViewTourEvent, CharacterViewTourEvent, ScenesViewTourEvent, \
     DocumentsViewTourEvent, ManuscriptViewTourEvent, AnalysisViewTourEvent, BoardViewTourEvent, BaseNovelViewTourEvent
+from plotlyst.view.widget.world.glossary import clear_glossary_matchers
 from plotlyst.view.world_building_view import WorldBuildingView
 
 textstat.sentence_count = sentence_count
 
 
+@dataclass
+class _NovelPanel:
+    attr: str
+    page: QWidget
+    factory: Callable[[Novel], AbstractView]
+
+
 class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
+    PREWARM_DELAY: int = 1500
+
     def __init__(self, *args, **kwargs):
         super(MainWindow, self).__init__(*args, **kwargs)
         self.setupUi(self)
@@ -149,8 +162,29 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
         self.pageHome.layout().addWidget(self.home_view.widget)
         self.home_view.loadNovel.connect(self._load_new_novel)
 
+        self.novel_view: Optional[NovelView] = None
         self.characters_view: Optional[CharactersView] = None
         self.scenes_outline_view: Optional[ScenesOutlineView] = None
+        self.world_building_view: Optional[WorldBuildingView] = None
+        self.notes_view: Optional[DocumentsView] = None
+        self.board_view: Optional[BoardView] = None
+        self.manuscript_view: Optional[ManuscriptView] = None
+        self.reports_view: Optional[ReportsView] = None
+        self.formatting_view: Optional[FormattingView] = None
+        self._current_view: Optional[AbstractView] = None
+        self._panels: Dict[QAbstractButton, _NovelPanel] = {
+            self.btnNovel: _NovelPanel('novel_view', self.pageNovel, NovelView),
+            self.btnCharacters: _NovelPanel('characters_view', self.pageCharacters,
+                                            partial(CharactersView, main_window=self)),
+            self.btnScenes: _NovelPanel('scenes_outline_view', self.pageScenes, ScenesOutlineView),
+            self.btnWorld: _NovelPanel('world_building_view', self.pageWorld,
+                                       partial(WorldBuildingView, main_window=self)),
+            self.btnNotes: _NovelPanel('notes_view', self.pageNotes, DocumentsView),
+            self.btnBoard: _NovelPanel('board_view', self.pageBoard, BoardView),
+            self.btnManuscript: _NovelPanel('manuscript_view', self.pageManuscript, ManuscriptView),
+            self.btnReports: _NovelPanel('reports_view', self.pageAnalysis, ReportsView),
+            self.btnFormatting: _NovelPanel('formatting_view', self.pageFormatting, FormattingView),
+        }
 
         self._init_menubar()
         self._init_toolbar()
@@ -322,12 +356,11 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
                 if series:
                     self.seriesLabel.setSeries(series)
                     self._actionSeries.setVisible(True)
-                    self.characters_view.set_series_enabled(True)
-                    self.world_building_view.set_series_enabled(True)
                 else:
                     self._actionSeries.setVisible(False)
-                    self.characters_view.set_series_enabled(False)
-                    self.world_building_view.set_series_enabled(False)
+                for view in [self.characters_view, self.world_building_view]:
+                    if view is not None:
+                        view.set_series_enabled(bool(series))
             elif self.novel and self.novel.parent == event.novel.id:
                 self.seriesLabel.setSeries(event.novel)
 
@@ -447,27 +480,7 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
         self.btnProgress.setNovel(self.novel)
         self._actionProgress.setVisible(True)
 
-        self._current_view: Optional[AbstractView] = None
-        self.novel_view = NovelView(self.novel)
-        self.characters_view = CharactersView(self.novel, main_window=self)
-        self.scenes_outline_view = ScenesOutlineView(self.novel)
-        self.world_building_view = WorldBuildingView(self.novel, main_window=self)
-        self.notes_view = DocumentsView(self.novel)
-        self.board_view = BoardView(self.novel)
-        self.manuscript_view = ManuscriptView(self.novel)
-        self.reports_view = ReportsView(self.novel)
-        self.formatting_view = FormattingView(self.novel)
-
-        self.pageNovel.layout().addWidget(self.novel_view.widget)
-        self.pageCharacters.layout().addWidget(self.characters_view.widget)
-        self.pageScenes.layout().addWidget(self.scenes_outline_view.widget)
-        self.pageWorld.layout().addWidget(self.world_building_view.widget)
-        self.pageNotes.layout().addWidget(self.notes_view.widget)
-        self.pageBoard.layout().addWidget(self.board_view.widget)
-        self.pageManuscript.layout().addWidget(self.manuscript_view.widget)
-        self.pageAnalysis.layout().addWidget(self.reports_view.widget)
-        self.pageFormatting.layout().addWidget(self.formatting_view.widget)
-
+        self._current_view = None
         if self.novel.prefs.panels.scenes_view == ScenesView.NOVEL:
             self.btnNovel.setChecked(True)
         elif self.novel.prefs.panels.scenes_view == ScenesView.CHARACTERS:
@@ -507,42 +520,66 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
         flag = app_env.profile().get('tasks', False)
         self.actionDetachTask.setVisible(flag)
 
+        if not app_env.test_env():
+            QTimer.singleShot(self.PREWARM_DELAY, partial(self._prewarm_panel, self.novel))
+
+    def _panel_view(self, btn: QAbstractButton) -> AbstractView:
+        """Returns the view of a novel panel. The view is created the first time its panel is needed, and only
+        then does it register for the novel's events."""
+        panel = self._panels[btn]
+        view = getattr(self, panel.attr)
+        if view is None:
+            start = time.perf_counter()
+            view = panel.factory(self.novel)
+            panel.page.layout().addWidget(view.widget)
+            setattr(self, panel.attr, view)
+            logging.info('%s created in %.1f ms', type(view).__name__, (time.perf_counter() - start) * 1000)
+        return view
+
+    def _prewarm_panel(self, novel: Novel):
+        if self.novel is not novel:
+            return
+        for btn in [self.btnScenes, self.btnManuscript, self.btnCharacters, self.btnNovel]:
+            if not btn.isHidden() and getattr(self, self._panels[btn].attr) is None:
+                self._panel_view(btn)
+                return
+
     def _on_view_changed(self, btn=None, checked: bool = True):
         if not checked:
             return
 
         if self.btnBoard.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageBoard)
-            self._current_view = self.board_view
+            self._current_view = self._panel_view(self.btnBoard)
         elif self.btnNovel.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageNovel)
-            self.novel_view.activate()
-            self._current_view = self.novel_view
+            self._current_view = self._panel_view(self.btnNovel)
+            self._current_view.activate()
         elif self.btnCharacters.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageCharacters)
-            self.characters_view.activate()
-            self._current_view = self.characters_view
+            self._current_view = self._panel_view(self.btnCharacters)
+            self._current_view.activate()
         elif self.btnScenes.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageScenes)
-            self.scenes_outline_view.activate()
-            self._current_view = self.scenes_outline_view
+            self._current_view = self._panel_view(self.btnScenes)
+            self._current_view.activate()
         elif self.btnWorld.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageWorld)
-            self._current_view = self.world_building_view
+            self._current_view = self._panel_view(self.btnWorld)
         elif self.btnNotes.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageNotes)
-            self.notes_view.activate()
-            self._current_view = self.notes_view
+            self._current_view = self._panel_view(self.btnNotes)
+            self._current_view.activate()
         elif self.btnManuscript.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageManuscript)
-            self.manuscript_view.activate()
-            self._current_view = self.manuscript_view
+            self._current_view = self._panel_view(self.btnManuscript)
+            self._current_view.activate()
         elif self.btnReports.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageAnalysis)
-            self._current_view = self.reports_view
+            self._current_view = self._panel_view(self.btnReports)
         elif self.btnFormatting.isChecked():
             self.stackedWidget.setCurrentWidget(self.pageFormatting)
-            self._current_view = self.formatting_view
+            self._current_view = self._panel_view(self.btnFormatting)
         else:
             self._current_view = None
 
@@ -758,51 +795,17 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
 
         event_senders.pop(self.novel)
         event_dispatchers.pop(self.novel)
-
-        self.pageNovel.layout().removeWidget(self.novel_view.widget)
-        gc(self.novel_view.widget)
-        gc(self.novel_view)
-        self.novel_view = None
-
-        self.pageCharacters.layout().removeWidget(self.characters_view.widget)
-        gc(self.characters_view.widget)
-        gc(self.characters_view)
-        self.characters_view = None
-
-        self.pageScenes.layout().removeWidget(self.scenes_outline_view.widget)
-        gc(self.scenes_outline_view.widget)
-        gc(self.scenes_outline_view)
-        self.scenes_outline_view = None
-
-        self.pageNotes.layout().removeWidget(self.notes_view.widget)
-        gc(self.notes_view.widget)
-        gc(self.notes_view)
-        self.notes_view = None
-
-        self.pageWorld.layout().removeWidget(self.world_building_view.widget)
-        gc(self.world_building_view.widget)
-        gc(self.world_building_view)
-        self.world_building_view = None
-
-        self.pageBoard.layout().removeWidget(self.board_view.widget)
-        gc(self.board_view.widget)
-        gc(self.board_view)
-        self.board_view = None
-
-        self.pageAnalysis.layout().removeWidget(self.reports_view.widget)
-        gc(self.reports_view.widget)
-        gc(self.reports_view)
-        self.reports_view = None
-
-        self.pageFormatting.layout().removeWidget(self.formatting_view.widget)
-        gc(self.formatting_view.widget)
-        gc(self.formatting_view)
-        self.formatting_view = None
-
-        self.pageManuscript.layout().removeWidget(self.manuscript_view.widget)
-        gc(self.manuscript_view.widget)
-        gc(self.manuscript_view)
-        self.manuscript_view = None
+        clear_glossary_matchers()
+        logging.debug('Icon cache: %s', icon_cache.stats())
+
+        for panel in self._panels.values():
+            view = getattr(self, panel.attr)
+            if view is not None:
+                panel.page.layout().removeWidget(view.widget)
+                gc(view.widget)
+                gc(view)
+                setattr(self, panel.attr, None)
+        self._current_view = None
 
         self._actionProgress.setVisible(False)
         self._actionScrivener.setVisible(False)
@@ -902,7 +905,7 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
 
     def _settings_link_clicked(self):
         self.btnNovel.setChecked(True)
-        self.novel_view.show_settings()
+        self._panel_view(self.btnNovel).show_settings()
 
     def _kb_link_clicked(self):
         self.home_mode.setChecked(True)
@@ -910,26 +913,21 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
 
     def _detach_panel(self, panel: NovelSetting):
         if panel == NovelSetting.Characters:
-            view = self.characters_view
             btn = self.btnCharacters
         elif panel == NovelSetting.Scenes:
-            view = self.scenes_outline_view
             btn = self.btnScenes
         elif panel == NovelSetting.Documents:
-            view = self.notes_view
             btn = self.btnNotes
         elif panel == NovelSetting.World_building:
-            view = self.world_building_view
             btn = self.btnWorld
         elif panel == NovelSetting.Management:
-            view = self.board_view
             btn = self.btnBoard
         elif panel == NovelSetting.Reports:
-            view = self.reports_view
             btn = self.btnReports
         else:
             return
 
+        view = self._panel_view(btn)
         if view.isDetached():
             return
 
@@ -961,15 +959,15 @@ class MainWindow(QMainWindow, Ui_MainWindow, EventListener):
             self.home_view.selectSeries(series)
 
     def _import_characters(self):
-        if self.novel and self.characters_view:
-            self.characters_view.import_from_series()
+        if self.novel:
+            self._panel_view(self.btnCharacters).import_from_series()
 
     def _import_locations(self):
         if not app_env.profile().get('world-building', False):
             PremiumMessagePopup.popup('Locations', 'mdi.globe-model', 'https://plotlyst.com/docs/world-building/')
             return
-        if self.novel and self.world_building_view:
-            self.world_building_view.import_from_series()
+        if self.novel:
+            self._panel_view(self.btnWorld).import_from_series()
 
     def _capture_snapshot(self, type_: SnapshotType = SnapshotType.MonthlyWriting):
         if self.novel:
@@ -352,9 +352,8 @@ class ScenesOutlineView(AbstractNovelView):
             self._handle_scene_deletion(event.scene)
             return
         elif isinstance(event, SceneAddedEvent):
-            i = self.novel.scenes.index(event.scene)
-            card = self.__init_card_widget(event.scene)
-            self.ui.cards.insertAt(i, card)
+            i = self.novel.scene_index(event.scene)
+            self.ui.cards.insertAt(i, event.scene)
             self._handle_scene_added()
             return
         elif isinstance(event, SceneEditRequested):
@@ -412,14 +411,7 @@ class ScenesOutlineView(AbstractNovelView):
     def _sync(self, event: NovelSyncEvent):
         self.selected_card = None
         self.ui.cards.clearSelection()
-
-        for scene in event.new_scenes:
-            card = self.__init_card_widget(scene)
-            self.ui.cards.addCard(card)
-
         self.ui.cards.reorderCards(self.novel.scenes)
-        for card in self.ui.cards.cards():
-            card.quickRefresh()
 
         self.refresh()
         self._storyGrid.sync(event)
@@ -569,8 +561,7 @@ class ScenesOutlineView(AbstractNovelView):
         self.novel.scenes.append(scene)
         self.repo.insert_scene(self.novel, scene)
 
-        card = self.__init_card_widget(scene)
-        self.ui.cards.addCard(card)
+        self.ui.cards.addItem(scene)
         self._scene_added = scene
         self._switch_to_editor(scene)
 
@@ -595,11 +586,8 @@ class ScenesOutlineView(AbstractNovelView):
 
     def _init_cards(self):
         self.selected_card = None
-        self.ui.cards.clear()
-
-        for scene in self.novel.scenes:
-            card = self.__init_card_widget(scene)
-            self.ui.cards.addCard(card)
+        self.ui.cards.setCardFactory(self.__init_card_widget)
+        self.ui.cards.setItems(self.novel.scenes)
 
         self._filter_cards()
 
@@ -634,7 +622,15 @@ class ScenesOutlineView(AbstractNovelView):
 
     @busy
     def _active_story_structure_changed(self, structure: StoryStructure):
+        for struct in self.novel.story_structures:
+            struct.active = False
+        structure.active = True
+        acts_registry.refresh()
+        self.repo.update_novel(self.novel)
+
         emit_event(self.novel, NovelStoryStructureActivationRequest(self, self.novel, structure))
+        emit_event(self.novel, NovelStoryStructureUpdated(self))
+        self._handle_structure_update()
 
     def _card_selected(self, card: SceneCard):
         if self.selected_card and self.selected_card is not card:
@@ -646,8 +642,7 @@ class ScenesOutlineView(AbstractNovelView):
         emit_event(self.novel, SceneSelectedEvent(self, card.scene))
 
     def _story_grid_card_selected(self, card: SceneCard):
-        real_card = self.ui.cards.card(card.scene)
-        real_card.select()
+        self.ui.cards.selectCard(card.scene)
 
     def _storymap_scene_selected(self, scene: Scene):
         self.ui.wdgStoryStructure.highlightScene(scene)
@@ -760,9 +755,7 @@ class ScenesOutlineView(AbstractNovelView):
         new_scene = self.novel.insert_scene_after(scene, chapter)
         self.repo.insert_scene(self.novel, new_scene)
 
-        ref_card = self.ui.cards.card(scene)
-        card = self.__init_card_widget(new_scene)
-        self.ui.cards.insertAfter(ref_card, card)
+        self.ui.cards.insertAfter(scene, new_scene)
 
         for card in self.ui.cards.cards():
             card.quickRefresh()
@@ -828,6 +821,8 @@ class ScenesOutlineView(AbstractNovelView):
         self.repo.update_novel(self.novel)
         for card in self.ui.cards.cards():
             card.quickRefresh()
+        if self.characters_distribution:
+            self.characters_distribution.refresh()
 
     def _handle_scene_deletion(self, scene: Scene):
         self.selected_card = None
@@ -967,7 +962,8 @@ class ScenesOutlineView(AbstractNovelView):
             scene.remove_beat(self.novel)
 
         card = self.ui.cards.card(scene)
-        card.refreshBeat()
+        if card:
+            card.refreshBeat()
         self._storyGrid.refreshBeatFor(scene)
         self.repo.update_scene(scene)
         emit_event(self.novel, SceneStoryBeatChangedEvent(self, scene, beat, toggled=toggled))
@@ -19,13 +19,13 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from abc import abstractmethod
 from functools import partial
-from typing import Optional, List, Dict, Iterable, Set, Any
+from typing import Optional, List, Dict, Iterable, Set, Any, Callable
 
 import qtanim
 from PyQt6 import QtGui
-from PyQt6.QtCore import pyqtSignal, QSize, Qt, QEvent, QPoint, QMimeData, QTimer
+from PyQt6.QtCore import pyqtSignal, QSize, Qt, QEvent, QPoint, QMimeData, QTimer, QMargins, QRect
 from PyQt6.QtGui import QDragEnterEvent, QDragMoveEvent, QColor, QAction, QIcon
-from PyQt6.QtWidgets import QFrame, QApplication, QToolButton, QTextBrowser, QWidget
+from PyQt6.QtWidgets import QFrame, QApplication, QToolButton, QTextBrowser, QWidget, QScrollArea
 from overrides import overrides
 from qthandy import clear_layout, retain_when_hidden, transparent, flow, translucent, gc, incr_icon, vbox, pointy, \
     incr_font, hbox, margins
@@ -125,6 +125,10 @@ class Card(QFrame):
     def copy(self) -> 'Card':
         pass
 
+    @abstractmethod
+    def rebind(self, data: Any):
+        pass
+
     def _setStyleSheet(self, selected: bool = False):
         border_color = self._borderColor(selected)
         border_size = self._borderSize(selected)
@@ -173,6 +177,12 @@ class CharacterCard(Ui_CharacterCard, Card):
     def copy(self) -> 'Card':
         return CharacterCard(self.character)
 
+    @overrides
+    def rebind(self, data: Any):
+        self.character = data
+        self.clearSelection()
+        self.refresh()
+
     @overrides
     def refresh(self):
         super().refresh()
@@ -302,6 +312,12 @@ class SceneCard(Ui_SceneCard, Card):
     def copy(self) -> 'Card':
         return SceneCard(self.scene, self.novel)
 
+    @overrides
+    def rebind(self, data: Any):
+        self.scene = data
+        self.clearSelection()
+        self.refresh()
+
     def setSetting(self, setting: NovelSetting, value: Any):
         if setting == NovelSetting.SCENE_CARD_POV:
             # self.btnPov.setVisible(value)
@@ -423,6 +439,12 @@ class NovelCard(Card):
     def copy(self) -> 'Card':
         return NovelCard(self.novel)
 
+    @overrides
+    def rebind(self, data: Any):
+        self.novel = data
+        self.clearSelection()
+        self.refresh()
+
     @overrides
     def refresh(self):
         super().refresh()
@@ -472,6 +494,10 @@ class PlaceholderCard(Card):
     def copy(self) -> 'Card':
         pass
 
+    @overrides
+    def rebind(self, data: Any):
+        pass
+
     @overrides
     def _setStyleSheet(self, selected: bool = False):
         self.setStyleSheet('''
@@ -483,6 +509,9 @@ class PlaceholderCard(Card):
 
 class CardFilter:
     def filter(self, card: Card) -> bool:
+        return self.filterData(card.data())
+
+    def filterData(self, data: Any) -> bool:
         return True
 
 
@@ -494,11 +523,11 @@ class SceneCardFilter(CardFilter):
         self._povs: Set[Character] = set()
 
     @overrides
-    def filter(self, card: SceneCard) -> bool:
-        if not self._actsFilter.get(acts_registry.act(card.scene), True):
+    def filterData(self, scene: Scene) -> bool:
+        if not self._actsFilter.get(acts_registry.act(scene), True):
             return False
 
-        if card.scene.pov and card.scene.pov not in self._povs:
+        if scene.pov and scene.pov not in self._povs:
             return False
 
         return True
@@ -753,3 +782,377 @@ class CardsView(QFrame):
         self._dragged = None
 
         self._wasDropped = False
+
+
+class VirtualCardsView(QFrame):
+    """A flow of cards where only the rows around the visible area of the enclosing scroll area have card widgets.
+
+    Items are kept in a plain list and laid out on a grid computed from the cards' size. Cards scrolled out of view
+    are returned to a pool and rebound to other items instead of being destroyed. The selected card is kept alive.
+    """
+    cardSelected = pyqtSignal(Card)
+    cardEntered = pyqtSignal(Card)
+    cardLeft = pyqtSignal(Card)
+    cardDoubleClicked = pyqtSignal(Card)
+    cardCustomContextMenuRequested = pyqtSignal(Card, QPoint)
+    orderChanged = pyqtSignal(list, Card)  # dropped Card
+    selectionCleared = pyqtSignal()
+
+    BUFFER_ROWS: int = 1
+
+    def __init__(self, parent=None, margin: int = 9, spacing: int = 15):
+        super().__init__(parent)
+        self._margins = QMargins(15, 15, margin, margin)
+        self._spacing = spacing
+        self._factory: Optional[Callable[[Any], Card]] = None
+        self._items: List[Any] = []
+        self._filter: Optional[CardFilter] = None
+        self._filteredOut: Set[Any] = set()
+        self._laidOut: List[Any] = []
+        self._slots: Dict[Any, int] = {}
+        self._columns: int = 1
+        self._cards: Dict[Any, Card] = {}
+        self._pool: List[Card] = []
+        self._scrollArea: Optional[QScrollArea] = None
+
+        self.setAcceptDrops(True)
+        self._selected: Optional[Card] = None
+        self._cardsWidth: int = 135
+        self._cardsRatio = CardSizeRatio.RATIO_3_4
+        self._dragPlaceholder: Optional[Card] = None
+        self._dragged: Optional[Card] = None
+        self._dropIndex: Optional[int] = None
+        self._wasDropped = False
+
+    def setCardFactory(self, factory: Callable[[Any], Card]):
+        self._factory = factory
+
+    @overrides
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        super().showEvent(event)
+        if self._scrollArea is None:
+            parent = self.parentWidget()
+            while parent is not None and not isinstance(parent, QScrollArea):
+                parent = parent.parentWidget()
+            if parent is not None:
+                self._scrollArea = parent
+                parent.verticalScrollBar().valueChanged.connect(self._updateVisibleCards)
+        self._relayout()
+
+    @overrides
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        super().resizeEvent(event)
+        self._relayout()
+
+    @overrides
+    def dragEnterEvent(self, event: QDragEnterEvent) -> None:
+        event.acceptProposedAction()
+        super().dragEnterEvent(event)
+
+    @overrides
+    def dragMoveEvent(self, event: QDragMoveEvent) -> None:
+        event.acceptProposedAction()
+
+    @overrides
+    def mouseReleaseEvent(self, a0: QtGui.QMouseEvent) -> None:
+        self.clearSelection()
+
+    def clearSelection(self):
+        if self._selected:
+            self._selected.clearSelection()
+            self._selected = None
+            self.selectionCleared.emit()
+
+    def clear(self):
+        self._selected = None
+        self._items.clear()
+        self._filteredOut.clear()
+        for card in self._cards.values():
+            gc(card)
+        self._cards.clear()
+        self._relayout()
+
+    def setItems(self, items: Iterable[Any]):
+        self.clear()
+        self.reorderCards(items)
+
+    def addItem(self, item: Any):
+        self.insertAt(len(self._items), item)
+
+    def insertAfter(self, ref: Any, item: Any):
+        self.insertAt(self._items.index(ref) + 1, item)
+
+    def insertAt(self, index: int, item: Any):
+        self._items.insert(index, item)
+        if self._filter is not None and not self._filter.filterData(item):
+            self._filteredOut.add(item)
+        self._relayout()
+
+    def remove(self, obj: Any):
+        self._selected = None
+        if obj in self._items:
+            self._items.remove(obj)
+        self._filteredOut.discard(obj)
+        card = self._cards.pop(obj, None)
+        if card:
+            self._release(card)
+        self._relayout()
+
+        for card in self._cards.values():
+            card.quickRefresh()
+
+    def reorderCards(self, data: Iterable[Any]):
+        self._items = list(data)
+        items = set(self._items)
+        self._filteredOut.intersection_update(items)
+        if self._filter is not None:
+            for item in self._items:
+                if not self._filter.filterData(item):
+                    self._filteredOut.add(item)
+        for obj in [x for x in self._cards.keys() if x not in items]:
+            card = self._cards.pop(obj)
+            if card is self._selected:
+                self._selected = None
+            self._release(card)
+        self._relayout()
+        for card in self._cards.values():
+            card.quickRefresh()
+
+    def items(self) -> List[Any]:
+        return list(self._items)
+
+    def selectCard(self, ref: Any):
+        slot = self._slots.get(ref)
+        if slot is None:
+            return
+        if ref not in self._cards and self._scrollArea is not None:
+            rect = self._slotRect(slot)
+            self._scrollArea.ensureVisible(rect.center().x(), rect.center().y(), 0, rect.height() // 2)
+            self._updateVisibleCards()
+        card = self._cards.get(ref)
+        if card is None:
+            card = self._materialize(ref)
+            card.setGeometry(self._slotRect(slot))
+        card.select()
+
+    def cardAt(self, pos: int) -> Optional[Card]:
+        if pos < 0 or pos >= len(self._laidOut):
+            return None
+        item = self._laidOut[pos]
+        card = self._cards.get(item)
+        if card is None:
+            card = self._materialize(item)
+            card.setGeometry(self._slotRect(self._slots[item]))
+        return card
+
+    def card(self, item: Any) -> Optional[Card]:
+        return self._cards.get(item, None)
+
+    def cards(self) -> Iterable[Card]:
+        return self._cards.values()
+
+    def setCardsWidth(self, value: int):
+        self._cardsWidth = value
+        self._resizeAllCards()
+
+    def setCardsSizeRatio(self, ratio: CardSizeRatio):
+        self._cardsRatio = ratio
+        self._resizeAllCards()
+
+    def setSetting(self, setting: NovelSetting, value: Any):
+        for card in self._cards.values():
+            card.setSetting(setting, value)
+        self._clearPool()
+
+    def applyFilter(self, cardFilter: CardFilter):
+        self._filter = cardFilter
+        self._filteredOut = {x for x in self._items if not cardFilter.filterData(x)}
+        self._relayout()
+
+    def _cardSize(self) -> QSize:
+        if self._cardsRatio == CardSizeRatio.RATIO_3_4:
+            height = self._cardsWidth * 1.3
+        else:
+            height = self._cardsWidth / 2 * 3
+        return QSize(self._cardsWidth, int(height))
+
+    def _slotRect(self, slot: int) -> QRect:
+        size = self._cardSize()
+        row, col = divmod(slot, self._columns)
+        origin = self.contentsRect().topLeft()
+        x = origin.x() + self._margins.left() + col * (size.width() + self._spacing)
+        y = origin.y() + self._margins.top() + row * (size.height() + self._spacing)
+        return QRect(QPoint(x, y), size)
+
+    def _relayout(self):
+        size = self._cardSize()
+        available = self.contentsRect().width() - self._margins.left() - self._margins.right()
+        self._columns = max(1, (available + self._spacing) // (size.width() + self._spacing))
+
+        self._laidOut = [x for x in self._items if x not in self._filteredOut and (
+                self._dragged is None or x != self._dragged.data())]
+        if self._dropIndex is not None:
+            self._dropIndex = min(self._dropIndex, len(self._laidOut))
+        self._slots.clear()
+        for i, item in enumerate(self._laidOut):
+            self._slots[item] = i if self._dropIndex is None or i < self._dropIndex else i + 1
+
+        slots = len(self._laidOut) + (1 if self._dropIndex is not None else 0)
+        rows = (slots + self._columns - 1) // self._columns
+        row_height = size.height() + self._spacing
+        height = self._margins.top() + self._margins.bottom() + max(0, rows * row_height - self._spacing)
+        frame = self.frameWidth() * 2
+        self.setMinimumHeight(height + frame)
+
+        self._updateVisibleCards()
+
+    def _visibleRange(self) -> range:
+        if not self.isVisible():
+            return range(0)
+        if self._scrollArea is not None:
+            viewport = self._scrollArea.viewport()
+            top = self.mapFrom(viewport, QPoint(0, 0)).y()
+            bottom = top + viewport.height()
+        else:
+            top = 0
+            bottom = self.height()
+
+        rowHeight = self._cardSize().height() + self._spacing
+        offset = self.contentsRect().top() + self._margins.top()
+        first = max(0, (top - offset) // rowHeight - self.BUFFER_ROWS)
+        last = max(0, (bottom - offset) // rowHeight + self.BUFFER_ROWS)
+        return range(first * self._columns, (last + 1) * self._columns)
+
+    def _updateVisibleCards(self):
+        visible = self._visibleRange()
+        pinned = {self._selected, self._dragged}
+
+        for item in list(self._cards.keys()):
+            card = self._cards[item]
+            if card in pinned:
+                continue
+            if self._slots.get(item, -1) not in visible:
+                del self._cards[item]
+                self._release(card)
+
+        for item in self._laidOut:
+            slot = self._slots[item]
+            if slot not in visible and item not in self._cards:
+                continue
+            card = self._cards.get(item)
+            if card is None:
+                card = self._materialize(item)
+            card.setGeometry(self._slotRect(slot))
+            card.setVisible(True)
+
+        for item, card in self._cards.items():
+            if item not in self._slots and card is not self._dragged:
+                card.setHidden(True)
+
+        if self._dragPlaceholder is not None and self._dropIndex is not None:
+            self._dragPlaceholder.setGeometry(self._slotRect(self._dropIndex))
+            self._dragPlaceholder.setVisible(True)
+            self._dragPlaceholder.raise_()
+
+    def _materialize(self, item: Any) -> Card:
+        if self._pool:
+            card = self._pool.pop()
+            card.rebind(item)
+        else:
+            card = self._factory(item)
+            self._initCardWidget(card)
+        self._cards[item] = card
+        return card
+
+    def _release(self, card: Card):
+        card.setHidden(True)
+        card.setGraphicsEffect(None)
+        self._pool.append(card)
+
+    def _clearPool(self):
+        for card in self._pool:
+            gc(card)
+        self._pool.clear()
+
+    def _initCardWidget(self, card: Card):
+        card.setParent(self)
+        card.setAcceptDrops(True)
+        if card.isDragEnabled():
+            card.installEventFilter(DragEventFilter(card, card.mimeType(), lambda x: card.data(),
+                                                    startedSlot=partial(self._dragStarted, card),
+                                                    finishedSlot=partial(self._dragFinished, card)))
+        card.selected.connect(lambda: self._cardSelected(card))
+        card.doubleClicked.connect(lambda: self.cardDoubleClicked.emit(card))
+        card.cursorEntered.connect(lambda: self.cardEntered.emit(card))
+        card.cursorLeft.connect(lambda: self.cardLeft.emit(card))
+        card.customContextMenuRequested.connect(partial(self.cardCustomContextMenuRequested.emit, card))
+        card.installEventFilter(DropEventFilter(card, [card.mimeType()], motionDetection=Qt.Orientation.Horizontal,
+                                                motionSlot=partial(self._dragMoved, card),
+                                                droppedSlot=self._dropped))
+        self._resizeCard(card)
+
+    def _resizeAllCards(self):
+        for card in self._cards.values():
+            self._resizeCard(card)
+        for card in self._pool:
+            self._resizeCard(card)
+        self._relayout()
+
+    def _resizeCard(self, card: Card):
+        size = self._cardSize()
+        card.setFixedSize(size.width(), size.height())
+
+    def _cardSelected(self, card: Card):
+        self._selected = card
+        self.cardSelected.emit(card)
+
+    def _dragStarted(self, card: Card):
+        card.setHidden(True)
+        self._dragged = card
+        self._dragPlaceholder = card.copy()
+        self._resizeCard(self._dragPlaceholder)
+        translucent(self._dragPlaceholder)
+        self._dragPlaceholder.setHidden(True)
+        self._dragPlaceholder.setParent(self)
+        self._dragPlaceholder.setAcceptDrops(True)
+        self._dragPlaceholder.installEventFilter(
+            DropEventFilter(self._dragPlaceholder, mimeTypes=[card.mimeType()], droppedSlot=self._dropped))
+        self._dropIndex = self._slots.get(card.data())
+        self._relayout()
+
+    def _dragMoved(self, card: Card, edge: Qt.Edge, _: QPoint):
+        i = self._laidOut.index(card.data()) if card.data() in self._slots else None
+        if i is None or card is self._dragged:
+            return
+        if edge == Qt.Edge.LeftEdge or edge == Qt.Edge.TopEdge:
+            dropIndex = i
+        else:
+            dropIndex = i + 1
+        if dropIndex != self._dropIndex:
+            self._dropIndex = dropIndex
+            self._relayout()
+
+    def _dropped(self, _: QMimeData):
+        self.clearSelection()
+        dragged = self._dragged.data()
+        data = [x for x in self._items if x != dragged]
+        if self._dropIndex is not None and self._dropIndex < len(self._laidOut):
+            data.insert(data.index(self._laidOut[self._dropIndex]), dragged)
+        elif self._laidOut:
+            data.insert(data.index(self._laidOut[-1]) + 1, dragged)
+        else:
+            data.append(dragged)
+        self._items = data
+
+        droppedCard = self._dragged
+        QTimer.singleShot(10, lambda: self.orderChanged.emit(data, droppedCard))
+        self._wasDropped = True
+
+    def _dragFinished(self, card: Card):
+        if self._dragPlaceholder:
+            gc(self._dragPlaceholder)
+            self._dragPlaceholder = None
+        self._dropIndex = None
+        self._dragged = None
+        self._wasDropped = False
+        self._relayout()
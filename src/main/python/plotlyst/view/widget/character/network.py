@@ -27,7 +27,7 @@ from qtmenu import GridMenuWidget
 
 from plotlyst.common import BLACK_COLOR
 from plotlyst.core.client import json_client
-from plotlyst.core.domain import Diagram, Relation, Node
+from plotlyst.core.domain import Diagram, Relation, Node, DiagramChanges
 from plotlyst.core.domain import Novel, GraphicsItemType
 from plotlyst.service.image import LoadedImage, upload_image, load_image
 from plotlyst.service.persistence import RepositoryPersistenceManager
@@ -62,6 +62,10 @@ class RelationsEditorScene(NetworkScene):
     def _save(self):
         self.repo.update_diagram(self._novel, self._diagram)
 
+    @overrides
+    def _saveChanges(self, changes: DiagramChanges):
+        self.repo.update_diagram(self._novel, self._diagram, changes)
+
     @overrides
     def _uploadImage(self) -> Optional[LoadedImage]:
         return upload_image(self._novel)
@@ -21,26 +21,27 @@ import string
 import uuid
 from dataclasses import dataclass
 from functools import partial
-from typing import Iterable, List, Optional, Dict, Union, Set
+from typing import Iterable, List, Optional, Dict, Union, Set, Any, Tuple
 
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QByteArray, QBuffer, QIODevice
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QByteArray, QBuffer, QIODevice, QEvent, QRect, QPoint
 from PyQt6.QtGui import QIcon, QColor, QImageReader, QImage, QPixmap, \
-    QShowEvent
-from PyQt6.QtWidgets import QWidget, QToolButton, QButtonGroup, QSizePolicy, QLabel, QPushButton, \
-    QFileDialog, QMessageBox, QGridLayout, QFrame
+    QShowEvent, QPainter, QPen, QPaintEvent, QMouseEvent, QHelpEvent
+from PyQt6.QtWidgets import QWidget, QToolButton, QButtonGroup, QSizePolicy, QPushButton, \
+    QFileDialog, QMessageBox, QFrame, QToolTip
 from overrides import overrides
-from qthandy import vspacer, transparent, gc, line, spacer, clear_layout, hbox, flow, translucent, margins, pointy, \
+from qthandy import vspacer, transparent, gc, line, clear_layout, hbox, flow, translucent, margins, pointy, \
     vbox, retain_when_hidden, incr_icon
 from qthandy.filter import OpacityEventFilter
 from qtmenu import MenuWidget, ScrollableMenuWidget
 
-from plotlyst.common import RELAXED_WHITE_COLOR
+from plotlyst.common import RELAXED_WHITE_COLOR, PLOTLYST_SECONDARY_COLOR
 from plotlyst.core.domain import Novel, Character, CharacterProfileSectionType, NovelSetting, CharacterMultiAttribute
-from plotlyst.core.template import SelectionItem, TemplateField, RoleImportance
+from plotlyst.core.template import RoleImportance
 from plotlyst.env import app_env
 from plotlyst.event.core import EventListener, Event
 from plotlyst.event.handler import event_dispatchers
-from plotlyst.events import CharacterSummaryChangedEvent, CharacterBackstoryChangedEvent
+from plotlyst.events import CharacterSummaryChangedEvent, CharacterBackstoryChangedEvent, CharacterChangedEvent, \
+    CharacterDeletedEvent
 from plotlyst.resources import resource_registry
 from plotlyst.service.cache import entities_registry
 from plotlyst.settings import CHARACTER_INITIAL_AVATAR_COLOR_CODES
@@ -48,10 +49,9 @@ from plotlyst.view.common import action, ButtonPressResizeEventFilter, tool_btn,
 from plotlyst.view.generated.characters_progress_widget_ui import Ui_CharactersProgressWidget
 from plotlyst.view.icons import avatars, IconRegistry
 from plotlyst.view.style.base import apply_border_image, transparent_menu
-from plotlyst.view.widget.display import IconText, Icon, OverlayWidget
+from plotlyst.view.widget.display import OverlayWidget
 from plotlyst.view.widget.labels import CharacterLabel
-from plotlyst.view.widget.progress import CircularProgressBar, ProgressTooltipMode, \
-    CharacterRoleProgressChart
+from plotlyst.view.widget.progress import CharacterRoleProgressChart
 from plotlyst.view.widget.utility import ColorPicker, IconSelectorDialog, ImageCropDialog
 
 
@@ -431,7 +431,7 @@ class AvatarSelectors(QWidget):
         self.btnUploadAvatar = push_btn(IconRegistry.upload_icon(color=RELAXED_WHITE_COLOR), text='Upload image',
                                         properties=['base', 'positive'])
         self.btnUploadAvatar.clicked.connect(self._upload_avatar)
-        if character.avatar:
+        if character.has_avatar():
             pass
         else:
             self.btnImage.setHidden(True)
@@ -468,7 +468,7 @@ class AvatarSelectors(QWidget):
         if avatars.has_name_initial_icon(self.character):
             self.btnInitial.setIcon(
                 avatars.name_initial_icon(self.character, color='black', color_on=RELAXED_WHITE_COLOR))
-        if self.character.avatar:
+        if self.character.has_avatar():
             self.btnImage.setIcon(QIcon(avatars.image(self.character)))
 
         clear_layout(self.wdgFirstLetterVariants)
@@ -658,34 +658,373 @@ class CharacterAvatar(QWidget):
         self.updateAvatar()
 
 
-class CharactersProgressWidget(QWidget, Ui_CharactersProgressWidget, EventListener):
+class CharacterProgress:
+    """Profile-completion scores of a character, one (value, max value) pair per row of the progress overview."""
+    Overall: str = 'overall'
+    Name: str = 'name'
+    Role: str = 'role'
+    Gender: str = 'gender'
+    Backstory: str = 'backstory'
+    Topics: str = 'topics'
+
+    def __init__(self, character: Character):
+        self.character = character
+        self.scores: Dict[Any, Tuple[int, int]] = {}
+        self.value: int = 0
+        self.max_value: int = 0
+        self._calculate()
+
+    def percentage(self) -> int:
+        return int(100 * self.value / self.max_value) if self.max_value else 0
+
+    def _calculate(self):
+        character = self.character
+        name = 1 if character.name else 0
+        role = 1 if character.role else 0
+        gender = 1 if character.gender else 0
+        self.scores[self.Name] = (name, 1)
+        self.scores[self.Role] = (role, 1)
+        self.scores[self.Gender] = (gender, 1)
+        self.value = (name + gender) // 2 + role
+        self.max_value = 2
+
+        for section in character.profile:
+            if section.enabled:
+                self._add(section.type, *self._section_score(section.type))
+
+        if not character.is_minor() and app_env.profile().get('backstory', False):
+            self._add(self.Backstory, len(character.backstory), 5 if character.is_major() else 3)
+        if character.topics and app_env.profile().get('origin', False):
+            self._add(self.Topics, len([x for x in character.topics if x.blocks and x.blocks[0].text]),
+                      len(character.topics))
+
+        self.scores[self.Overall] = (min(self.value, self.max_value), self.max_value)
+
+    def _add(self, key: Any, value: int, max_value: int):
+        value = max(0, min(value, max_value))
+        if max_value == 0:
+            max_value = 1
+        self.scores[key] = (value, max_value)
+        self.value += value
+        self.max_value += max_value
+
+    def _section_score(self, sectionType: CharacterProfileSectionType) -> Tuple[int, int]:
+        character = self.character
+        if sectionType == CharacterProfileSectionType.Summary:
+            return (1 if character.summary else 0), 1
+        elif sectionType == CharacterProfileSectionType.Philosophy:
+            return (1 if character.values else 0), 1
+        elif sectionType == CharacterProfileSectionType.Faculties:
+            return len(character.faculties.values()), 5
+        elif sectionType == CharacterProfileSectionType.Strengths:
+            value = max_value = 0
+            for attr in character.strengths:
+                if attr.has_strength and attr.has_weakness:
+                    max_value += 2
+                if attr.has_strength and attr.strength:
+                    value += 1
+                if attr.has_weakness and attr.weakness:
+                    value += 1
+            return value, max_value
+        elif sectionType == CharacterProfileSectionType.Goals:
+            return self._multi_attribute_score(character.gmc)
+        elif sectionType == CharacterProfileSectionType.Lack:
+            return self._multi_attribute_score(character.lack)
+        elif sectionType == CharacterProfileSectionType.Flaws:
+            return self._multi_attribute_score(character.flaws)
+        elif sectionType == CharacterProfileSectionType.Baggage:
+            return self._multi_attribute_score(character.baggage)
+        elif sectionType == CharacterProfileSectionType.Personality:
+            value, max_value = 0, 1
+            for setting, attribute in [(NovelSetting.Character_enneagram, character.personality.enneagram),
+                                       (NovelSetting.Character_mbti, character.personality.mbti),
+                                       (NovelSetting.Character_love_style, character.personality.love),
+                                       (NovelSetting.Character_work_style, character.personality.work)]:
+                if character.prefs.toggled(setting):
+                    max_value += 1
+                    if attribute:
+                        value += 1
+            if character.traits:
+                value += 1
+            return value, max_value
+
+        return 0, 1
+
+    @staticmethod
+    def _multi_attribute_score(attributes: List[CharacterMultiAttribute]) -> Tuple[int, int]:
+        value = max_value = 0
+        for attrs in attributes:
+            max_value += 1
+            if attrs.value:
+                value += 1
+            for attr in attrs.attributes.values():
+                max_value += 1
+                if attr.value:
+                    value += 1
+        return value, max_value
+
+
+@dataclass
+class _HeatmapRow:
+    key: Any
+    title: str
+    icon: Optional[QIcon] = None
+    separated: bool = False
+
+
+class CharactersProgressHeatmap(QWidget):
+    """Profile completion of every character painted as a heatmap: one column per character, one row per
+    profile section. Only the cells in the exposed area are painted, and a changed character repaints its
+    column only."""
     characterClicked = pyqtSignal(Character)
 
-    RowOverall: int = 1
-    RowName: int = 3
-    RowRole: int = 4
-    RowGender: int = 5
+    LabelWidth: int = 150
+    HeaderHeight: int = 60
+    ColumnWidth: int = 55
+    RowHeight: int = 32
+    CellSize: int = 22
+    AvatarSize: int = 45
+    SeparatorSpacing: int = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self._rows: List[_HeatmapRow] = []
+        self._rowTops: List[int] = []
+        self._progress: List[CharacterProgress] = []
+        self._columns: Dict[uuid.UUID, int] = {}
+        self._pixmaps: Dict[Any, QPixmap] = {}
+        self._hoveredColumn: int = -1
+        self._heatColor = QColor(PLOTLYST_SECONDARY_COLOR)
+        self._emptyColor = QColor('lightgrey')
+
+    def setCharacters(self, characters: List[Character]):
+        self._rows.clear()
+        self._rows.append(_HeatmapRow(CharacterProgress.Overall, 'Overall', IconRegistry.progress_check_icon(),
+                                      separated=True))
+        self._rows.append(_HeatmapRow(CharacterProgress.Name, 'Name', IconRegistry.character_icon()))
+        self._rows.append(_HeatmapRow(CharacterProgress.Role, 'Role', IconRegistry.major_character_icon()))
+        self._rows.append(
+            _HeatmapRow(CharacterProgress.Gender, 'Gender', IconRegistry.male_gender_icon(), separated=True))
+        for sectionType in CharacterProfileSectionType:
+            self._rows.append(_HeatmapRow(sectionType, sectionType.name))
+        self._rows[-1].separated = True
+        if app_env.profile().get('backstory', False):
+            self._rows.append(_HeatmapRow(CharacterProgress.Backstory, 'Backstory', IconRegistry.backstory_icon()))
+        if app_env.profile().get('origin', False):
+            self._rows.append(_HeatmapRow(CharacterProgress.Topics, 'Topics', IconRegistry.topics_icon()))
+
+        self._rowTops.clear()
+        y = self.HeaderHeight
+        for row in self._rows:
+            self._rowTops.append(y)
+            y += self.RowHeight
+            if row.separated:
+                y += self.SeparatorSpacing
+
+        self._progress = [CharacterProgress(x) for x in characters]
+        self._columns = {x.id: i for i, x in enumerate(characters)}
+        self._pixmaps.clear()
+        self._hoveredColumn = -1
+
+        self.setFixedSize(self.LabelWidth + self.ColumnWidth * len(characters), y)
+        self.update()
+
+    def progress(self) -> List[CharacterProgress]:
+        return self._progress
+
+    def updateCharacter(self, character: Character) -> bool:
+        """Recalculates the scores of the character and repaints its column only."""
+        col = self._columns.get(character.id)
+        if col is None:
+            return False
+        self._progress[col] = CharacterProgress(character)
+        self._pixmaps.pop(character.id, None)
+        self.update(self._columnRect(col))
+        return True
+
+    @overrides
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = event.rect()
+
+        firstCol = max(0, (rect.left() - self.LabelWidth) // self.ColumnWidth)
+        lastCol = min(len(self._progress) - 1, (rect.right() - self.LabelWidth) // self.ColumnWidth)
+        rows = [i for i, top in enumerate(self._rowTops) if top < rect.bottom() and top + self.RowHeight > rect.top()]
+
+        if rect.left() < self.LabelWidth:
+            self._paintLabels(painter, rows)
+
+        painter.setPen(QPen(self._emptyColor, 1))
+        for i in rows:
+            if self._rows[i].separated:
+                y = self._rowTops[i] + self.RowHeight + self.SeparatorSpacing // 2
+                painter.drawLine(max(rect.left(), 0), y, rect.right(), y)
+
+        for col in range(firstCol, lastCol + 1):
+            x = self.LabelWidth + col * self.ColumnWidth
+            progress = self._progress[col]
+            if col == self._hoveredColumn:
+                painter.fillRect(x, 0, self.ColumnWidth, self.height(), QColor(RELAXED_WHITE_COLOR).darker(105))
+            if rect.top() < self.HeaderHeight:
+                painter.drawPixmap(x + (self.ColumnWidth - self.AvatarSize) // 2,
+                                   (self.HeaderHeight - self.AvatarSize) // 2, self._avatar(progress.character))
+            for i in rows:
+                self._paintCell(painter, progress, self._rows[i], x, self._rowTops[i])
+
+        painter.end()
+
+    @overrides
+    def event(self, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.ToolTip:
+            self._showToolTip(event)
+            return True
+        return super().event(event)
+
+    @overrides
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        col = self._columnAt(event.pos())
+        if col != self._hoveredColumn:
+            if self._hoveredColumn >= 0:
+                self.update(self._columnRect(self._hoveredColumn))
+            self._hoveredColumn = col
+            if col >= 0:
+                self.update(self._columnRect(col))
+        if col >= 0 and event.pos().y() < self.HeaderHeight:
+            self.setCursor(Qt.CursorShape.PointingHandCursor)
+        else:
+            self.unsetCursor()
+
+    @overrides
+    def leaveEvent(self, event: QEvent) -> None:
+        if self._hoveredColumn >= 0:
+            self.update(self._columnRect(self._hoveredColumn))
+            self._hoveredColumn = -1
+
+    @overrides
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        col = self._columnAt(event.pos())
+        if col >= 0 and event.pos().y() < self.HeaderHeight and event.button() == Qt.MouseButton.LeftButton:
+            self.characterClicked.emit(self._progress[col].character)
+
+    def _paintLabels(self, painter: QPainter, rows: List[int]):
+        painter.setPen(QColor('black'))
+        for i in rows:
+            row = self._rows[i]
+            rect = QRect(0, self._rowTops[i], self.LabelWidth - 10, self.RowHeight)
+            if row.icon:
+                iconRect = QRect(rect.left() + 2, rect.center().y() - 9, 18, 18)
+                row.icon.paint(painter, iconRect)
+                rect.setLeft(iconRect.right() + 4)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, row.title)
+
+    def _paintCell(self, painter: QPainter, progress: CharacterProgress, row: _HeatmapRow, x: int, y: int):
+        score = progress.scores.get(row.key)
+        if score is None:
+            return
+        cell = QRect(x + (self.ColumnWidth - self.CellSize) // 2, y + (self.RowHeight - self.CellSize) // 2,
+                     self.CellSize, self.CellSize)
+        value, max_value = score
+        if row.key == CharacterProgress.Role and progress.character.role:
+            role = progress.character.role
+            painter.drawPixmap(cell, self._icon(role.icon, role.icon_color))
+            return
+        if row.key == CharacterProgress.Gender and progress.character.gender:
+            painter.drawPixmap(cell, self._genderIcon(progress.character.gender))
+            return
+
+        if value == 0:
+            painter.setPen(QPen(self._emptyColor, 1, Qt.PenStyle.DotLine))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+        else:
+            color = QColor(self._heatColor)
+            color.setAlpha(50 + int(205 * value / max_value))
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+        painter.drawRoundedRect(cell, 4, 4)
+
+        if row.key == CharacterProgress.Overall:
+            painter.setPen(QColor(RELAXED_WHITE_COLOR) if 2 * value > max_value else QColor('black'))
+            font = painter.font()
+            font.setPointSize(7)
+            painter.setFont(font)
+            painter.drawText(cell, Qt.AlignmentFlag.AlignCenter, str(progress.percentage()))
+            painter.setFont(self.font())
+        elif value == max_value:
+            painter.drawPixmap(cell.adjusted(3, 3, -3, -3), self._icon('fa5s.check', RELAXED_WHITE_COLOR))
+
+    def _avatar(self, character: Character) -> QPixmap:
+        pixmap = self._pixmaps.get(character.id)
+        if pixmap is None:
+            pixmap = avatars.avatar(character).pixmap(self.AvatarSize, self.AvatarSize)
+            self._pixmaps[character.id] = pixmap
+        return pixmap
+
+    def _icon(self, name: str, color: str) -> QPixmap:
+        key = (name, color)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = IconRegistry.from_name(name, color).pixmap(self.CellSize, self.CellSize)
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def _genderIcon(self, gender: str) -> QPixmap:
+        key = ('gender', gender)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = IconRegistry.gender_icon(gender).pixmap(self.CellSize, self.CellSize)
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def _showToolTip(self, event: QHelpEvent):
+        col = self._columnAt(event.pos())
+        if col < 0:
+            QToolTip.hideText()
+            return
+        progress = self._progress[col]
+        if event.pos().y() < self.HeaderHeight:
+            QToolTip.showText(event.globalPos(), progress.character.name, self)
+            return
+        for i, top in enumerate(self._rowTops):
+            if top <= event.pos().y() < top + self.RowHeight:
+                row = self._rows[i]
+                score = progress.scores.get(row.key)
+                if score is None:
+                    break
+                if row.key == CharacterProgress.Role and progress.character.role:
+                    text = progress.character.role.text
+                elif row.key == CharacterProgress.Overall:
+                    text = f'{progress.percentage()}%'
+                else:
+                    text = f'{score[0]}/{score[1]}'
+                QToolTip.showText(event.globalPos(), f'{progress.character.name} - {row.title}: {text}', self)
+                return
+        QToolTip.hideText()
+
+    def _columnAt(self, pos: QPoint) -> int:
+        if pos.x() < self.LabelWidth:
+            return -1
+        col = (pos.x() - self.LabelWidth) // self.ColumnWidth
+        return col if col < len(self._progress) else -1
+
+    def _columnRect(self, col: int) -> QRect:
+        return QRect(self.LabelWidth + col * self.ColumnWidth, 0, self.ColumnWidth, self.height())
 
-    @dataclass
-    class Header:
-        header: TemplateField
-        row: int
-        max_value: int = 0
 
-        def __hash__(self):
-            return hash(str(self.header.id))
+class CharactersProgressWidget(QWidget, Ui_CharactersProgressWidget, EventListener):
+    characterClicked = pyqtSignal(Character)
 
     def __init__(self, parent=None):
         super(CharactersProgressWidget, self).__init__(parent)
         self.setupUi(self)
-        self._layout = QGridLayout()
-        self.scrollAreaProgress.setLayout(self._layout)
         margins(self, 2, 2, 2, 2)
-        self._layout.setSpacing(5)
         self._refreshNext: bool = False
-        self._sectionRows: Dict[CharacterProfileSectionType, int] = {}
-        self._backstoryRow: int = -1
-        self._topicRow: int = -1
+
+        self._heatmap = CharactersProgressHeatmap(self.scrollAreaProgress)
+        self._heatmap.characterClicked.connect(self.characterClicked)
+        vbox(self.scrollAreaProgress, 0, 0).addWidget(self._heatmap, alignment=Qt.AlignmentFlag.AlignLeft)
+        self.scrollAreaProgress.layout().addWidget(vspacer())
 
         self.novel: Optional[Novel] = None
 
@@ -707,11 +1046,16 @@ class CharactersProgressWidget(QWidget, Ui_CharactersProgressWidget, EventListen
     def setNovel(self, novel: Novel):
         self.novel = novel
         dispatcher = event_dispatchers.instance(self.novel)
-        dispatcher.register(self, CharacterSummaryChangedEvent, CharacterBackstoryChangedEvent)
+        dispatcher.register(self, CharacterChangedEvent, CharacterSummaryChangedEvent, CharacterBackstoryChangedEvent,
+                            CharacterDeletedEvent)
 
     @overrides
     def event_received(self, event: Event):
-        self._refreshNext = True
+        if isinstance(event, CharacterDeletedEvent):
+            self.refreshNext()
+        elif isinstance(event, (CharacterChangedEvent, CharacterSummaryChangedEvent, CharacterBackstoryChangedEvent)):
+            if self._heatmap.updateCharacter(event.character):
+                self._updateCharts()
 
     @overrides
     def showEvent(self, event: QShowEvent) -> None:
@@ -730,215 +1074,28 @@ class CharactersProgressWidget(QWidget, Ui_CharactersProgressWidget, EventListen
         if not self.novel:
             return
 
-        clear_layout(self._layout)
-        for chart_ in [self._chartMajor, self._chartSecondary, self._chartMinor]:
+        self._heatmap.setCharacters(self.novel.characters)
+        self._updateCharts()
+
+    def _updateCharts(self):
+        charts = {RoleImportance.MAJOR: self._chartMajor, RoleImportance.SECONDARY: self._chartSecondary,
+                  RoleImportance.MINOR: self._chartMinor}
+        for chart_ in charts.values():
             chart_.setValue(0)
             chart_.setMaxValue(0)
 
-        for i, char in enumerate(self.novel.characters):
-            btn = tool_btn(avatars.avatar(char), tooltip=char.name, transparent_=True, parent=self)
-            btn.setIconSize(QSize(45, 45))
-            btn.installEventFilter(OpacityEventFilter(btn, 0.8, 1.0))
-            btn.clicked.connect(partial(self.characterClicked.emit, char))
-            self._layout.addWidget(btn, 0, i + 1)
-        self._layout.addWidget(spacer(), 0, self._layout.columnCount())
-
-        self._addLabel(self.RowOverall, 'Overall', IconRegistry.progress_check_icon(), Qt.AlignmentFlag.AlignCenter)
-        self._addLine(self.RowOverall + 1)
-        self._addLabel(self.RowName, 'Name', IconRegistry.character_icon())
-        self._addLabel(self.RowRole, 'Role', IconRegistry.major_character_icon())
-        self._addLabel(self.RowGender, 'Gender', IconRegistry.male_gender_icon())
-
-        row = self.RowGender + 1
-        self._addLine(row)
-
-        row += 1
-
-        for sectionType in CharacterProfileSectionType:
-            self._sectionRows[sectionType] = row
-            self._addLabel(row, sectionType.name)
-            row += 1
-        self._addLine(row)
-
-        if app_env.profile().get('backstory', False):
-            row += 1
-            self._backstoryRow = row
-            self._addLabel(row, 'Backstory', IconRegistry.backstory_icon())
-
-        if app_env.profile().get('origin', False):
-            row += 1
-            self._topicRow = row
-            self._addLabel(row, 'Topics', IconRegistry.topics_icon())
-
-        row += 1
-        self._layout.addWidget(vspacer(), row, 0)
-
-        for col, char in enumerate(self.novel.characters):
-            self._updateForCharacter(char, col + 1)
-
-        self._chartMajor.refresh()
-        self._chartSecondary.refresh()
-        self._chartMinor.refresh()
-
-    def _updateForCharacter(self, character: Character, col: int):
-        def handleMultiAttribute(attributes: List[CharacterMultiAttribute]):
-            for attrs in attributes:
-                progress.addMaxValue(1)
-                if attrs.value:
-                    progress.addValue(1)
-                for attr in attrs.attributes.values():
-                    progress.addMaxValue(1)
-                    if attr.value:
-                        progress.addValue(1)
-
-        name_progress = CircularProgressBar(parent=self)
-        if character.name:
-            name_progress.setValue(1)
-        self._addWidget(name_progress, self.RowName, col)
-
-        role_value = 0
-        if character.role:
-            role_value = 1
-            self._addItem(character.role, self.RowRole, col)
-        else:
-            self._addWidget(CircularProgressBar(parent=self), self.RowRole, col)
-
-        gender_value = 0
-        if character.gender:
-            gender_value = 1
-            self._addIcon(IconRegistry.gender_icon(character.gender), self.RowGender, col)
-        else:
-            self._addWidget(CircularProgressBar(parent=self), self.RowGender, col)
-
-        overall_progress = CircularProgressBar(maxValue=2, parent=self)
-        overall_progress.setTooltipMode(ProgressTooltipMode.PERCENTAGE)
-        overall_progress.setValue((name_progress.value() + gender_value) // 2 + role_value)
-
-        for section in character.profile:
-            if not section.enabled:
+        for progress in self._heatmap.progress():
+            character = progress.character
+            if character.is_major():
+                chart_ = self._chartMajor
+            elif character.is_secondary():
+                chart_ = self._chartSecondary
+            elif character.is_minor():
+                chart_ = self._chartMinor
+            else:
                 continue
+            chart_.setMaxValue(chart_.maxValue() + progress.max_value)
+            chart_.setValue(chart_.value() + progress.value)
 
-            row = self._sectionRows[section.type]
-            progress = CircularProgressBar(parent=self)
-            if section.type == CharacterProfileSectionType.Summary:
-                if character.summary:
-                    progress.setValue(1)
-            elif section.type == CharacterProfileSectionType.Philosophy:
-                if character.values:
-                    progress.setValue(1)
-            elif section.type == CharacterProfileSectionType.Faculties:
-                progress.setMaxValue(5)
-                progress.setValue(len(character.faculties.values()))
-            elif section.type == CharacterProfileSectionType.Strengths:
-                progress.setMaxValue(0)
-                for attr in character.strengths:
-                    if attr.has_strength and attr.has_weakness:
-                        progress.addMaxValue(2)
-                    if attr.has_strength and attr.strength:
-                        progress.addValue(1)
-                    if attr.has_weakness and attr.weakness:
-                        progress.addValue(1)
-            elif section.type == CharacterProfileSectionType.Goals:
-                progress.setMaxValue(0)
-                handleMultiAttribute(character.gmc)
-            elif section.type == CharacterProfileSectionType.Lack:
-                progress.setMaxValue(0)
-                handleMultiAttribute(character.lack)
-            elif section.type == CharacterProfileSectionType.Flaws:
-                progress.setMaxValue(0)
-                handleMultiAttribute(character.flaws)
-            elif section.type == CharacterProfileSectionType.Baggage:
-                progress.setMaxValue(0)
-                handleMultiAttribute(character.baggage)
-            elif section.type == CharacterProfileSectionType.Personality:
-                if character.prefs.toggled(NovelSetting.Character_enneagram):
-                    progress.addMaxValue(1)
-                    if character.personality.enneagram:
-                        progress.addValue(1)
-                if character.prefs.toggled(NovelSetting.Character_mbti):
-                    progress.addMaxValue(1)
-                    if character.personality.mbti:
-                        progress.addValue(1)
-                if character.prefs.toggled(NovelSetting.Character_love_style):
-                    progress.addMaxValue(1)
-                    if character.personality.love:
-                        progress.addValue(1)
-                if character.prefs.toggled(NovelSetting.Character_work_style):
-                    progress.addMaxValue(1)
-                    if character.personality.work:
-                        progress.addValue(1)
-                if character.traits:
-                    progress.addValue(1)
-
-            if progress.maxValue() == 0:
-                progress.setMaxValue(1)
-            overall_progress.addMaxValue(progress.maxValue())
-            overall_progress.addValue(progress.value())
-            self._addWidget(progress, row, col)
-
-        # for h, v in headers.items():
-        #     if not h.header.required and char.is_minor():
-        #         continue
-        #     if not char.disabled_template_headers.get(str(h.header.id), h.header.enabled):
-        #         continue
-        #     value_progress = CircularProgressBar(v, h.max_value, parent=self)
-        #     self._addWidget(value_progress, h.row, col + 1)
-        #     overall_progress.addMaxValue(h.max_value)
-        #     overall_progress.addValue(v)
-        if not character.is_minor() and app_env.profile().get('backstory', False):
-            backstory_progress = CircularProgressBar(parent=self)
-            backstory_progress.setMaxValue(5 if character.is_major() else 3)
-            backstory_progress.setValue(len(character.backstory))
-            overall_progress.addMaxValue(backstory_progress.maxValue())
-            overall_progress.addValue(backstory_progress.value())
-            self._addWidget(backstory_progress, self._backstoryRow, col)
-
-        if character.topics and app_env.profile().get('origin', False):
-            topics_progress = CircularProgressBar(parent=self)
-            topics_progress.setMaxValue(len(character.topics))
-            topics_progress.setValue(len([x for x in character.topics if x.blocks and x.blocks[0].text]))
-            overall_progress.addMaxValue(topics_progress.maxValue())
-            overall_progress.addValue(topics_progress.value())
-            self._addWidget(topics_progress, self._topicRow, col)
-
-        self._addWidget(overall_progress, self.RowOverall, col)
-
-        if character.is_major():
-            self._chartMajor.setMaxValue(self._chartMajor.maxValue() + overall_progress.maxValue())
-            self._chartMajor.setValue(self._chartMajor.value() + overall_progress.value())
-        elif character.is_secondary():
-            self._chartSecondary.setMaxValue(self._chartSecondary.maxValue() + overall_progress.maxValue())
-            self._chartSecondary.setValue(self._chartSecondary.value() + overall_progress.value())
-        elif character.is_minor():
-            self._chartMinor.setMaxValue(self._chartMinor.maxValue() + overall_progress.maxValue())
-            self._chartMinor.setValue(self._chartMinor.value() + overall_progress.value())
-
-    def _addLine(self, row: int):
-        self._layout.addWidget(line(), row, 0, 1, self._layout.columnCount() - 1)
-
-    def _addLabel(self, row: int, text: str, icon=None, alignment=Qt.AlignmentFlag.AlignRight):
-        if icon:
-            wdg = IconText(self)
-            wdg.setIcon(icon)
-        else:
-            wdg = QLabel(parent=self)
-        wdg.setText(text)
-
-        self._layout.addWidget(wdg, row, 0, alignment=alignment)
-
-    def _addWidget(self, progress: QWidget, row: int, col: int):
-        if row > self.RowOverall:
-            progress.installEventFilter(OpacityEventFilter(parent=progress))
-        self._layout.addWidget(progress, row, col, alignment=Qt.AlignmentFlag.AlignCenter)
-
-    def _addIcon(self, icon: QIcon, row: int, col: int):
-        _icon = Icon()
-        _icon.setIcon(icon)
-        self._addWidget(_icon, row, col)
-
-    def _addItem(self, item: SelectionItem, row: int, col: int):
-        icon = Icon()
-        icon.iconName = item.icon
-        icon.iconColor = item.icon_color
-        icon.setToolTip(item.text)
-        self._addWidget(icon, row, col)
+        for chart_ in charts.values():
+            chart_.refresh()
@@ -83,6 +83,13 @@ def alt_modifier(event: QGraphicsSceneHoverEvent) -> bool:
     return event.modifiers() & Qt.KeyboardModifier.AltModifier
 
 
+LOW_DETAIL_SCALE: float = 0.5
+
+
+def low_detail(painter: QPainter, option: QStyleOptionGraphicsItem) -> bool:
+    return option.levelOfDetailFromTransform(painter.worldTransform()) < LOW_DETAIL_SCALE
+
+
 class ResizeIconItem(QAbstractGraphicsShapeItem):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -464,6 +471,8 @@ class ConnectorItem(QGraphicsPathItem):
         self._relation: Optional[Relation] = None
         self._icon: Optional[str] = None
         self._defaultLineType: ConnectorType = ConnectorType.Curved
+        self._detailed: bool = True
+        self._pathDirty: bool = False
         self._cp = BezierCPSocket(parent=self)
         self._cp.setVisible(False)
 
@@ -625,7 +634,7 @@ class ConnectorItem(QGraphicsPathItem):
 
         self._relation = relation
         self._iconBadge.setIcon(IconRegistry.from_name(relation.icon, relation.icon_color), self._color)
-        self._iconBadge.setVisible(True)
+        self._iconBadge.setVisible(self._detailed)
         self._label.setText(relation.text)
 
         self.rearrange()
@@ -643,7 +652,7 @@ class ConnectorItem(QGraphicsPathItem):
         self._icon = icon
         if self._icon:
             self._iconBadge.setIcon(IconRegistry.from_name(self._icon, self._color.name()), self._color)
-            self._iconBadge.setVisible(True)
+            self._iconBadge.setVisible(self._detailed)
         else:
             self._iconBadge.setVisible(False)
         self.rearrange()
@@ -679,13 +688,38 @@ class ConnectorItem(QGraphicsPathItem):
         path.addRect(rect)
         return path
 
+    @overrides
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = ...) -> None:
+        if low_detail(painter, option):
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        super().paint(painter, option, widget)
+
     @overrides
     def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any) -> Any:
         if change == QGraphicsItem.GraphicsItemChange.ItemSelectedChange:
             self._onSelection(value)
+        elif change == QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged:
+            if value is not None and self._pathDirty:
+                value.scheduleRearrange(self)
         return super().itemChange(change, value)
 
+    def setDetailed(self, detailed: bool):
+        self._detailed = detailed
+        self._iconBadge.setVisible(detailed and bool(self._icon))
+        self._label.setVisible(detailed and bool(self._label.text()))
+
     def rearrange(self):
+        """Requests the path to be recalculated. It is recalculated once per event loop iteration by the scene,
+        no matter how many times the connected items moved in the meantime."""
+        self._pathDirty = True
+        scene = self.networkScene()
+        if scene is not None:
+            scene.scheduleRearrange(self)
+
+    def rearrangeNow(self):
+        if not self._pathDirty:
+            return
+        self._pathDirty = False
         self.setPos(self._source.sceneBoundingRect().center())
 
         start: QPointF = self.scenePos()
@@ -796,7 +830,7 @@ class ConnectorItem(QGraphicsPathItem):
             point = path.pointAtPercent(0.5)
             point -= QPointF(self._label.boundingRect().width() / 2, self._label.boundingRect().height() / 2)
         self._label.setPos(point)
-        self._label.setVisible(True)
+        self._label.setVisible(self._detailed)
 
     def _setColor(self, color: QColor):
         self._color = color
@@ -830,6 +864,7 @@ class NodeItem(QAbstractGraphicsShapeItem):
 
         self._stickyPoint: Optional[QPointF] = None
         self._stickyRange: int = 0
+        self._detailed: bool = True
 
         self.setPos(node.x, node.y)
         self._sockets: List[AbstractSocketItem] = []
@@ -959,6 +994,14 @@ class NodeItem(QAbstractGraphicsShapeItem):
     def activate(self):
         pass
 
+    def setDetailed(self, detailed: bool):
+        self._detailed = detailed
+        self.activate()
+
+    def _shadowEnabled(self) -> bool:
+        scene = self.networkScene()
+        return scene is None or scene.shadowsEnabled()
+
     def _onPosChanged(self):
         self.rearrangeConnectors()
         self.networkScene().itemMovedEvent(self)
@@ -1128,6 +1171,11 @@ class CharacterItem(CircleShapedNodeItem):
     def setLabelVisible(self, visible: bool):
         self._label.setVisible(visible)
 
+    @overrides
+    def setDetailed(self, detailed: bool):
+        super().setDetailed(detailed)
+        self.setLabelVisible(detailed)
+
     def setColor(self, color: QColor):
         pass
 
@@ -1138,6 +1186,12 @@ class CharacterItem(CircleShapedNodeItem):
     def paint(self, painter: QPainter, option: 'QStyleOptionGraphicsItem', widget: Optional[QWidget] = ...) -> None:
         super().paint(painter, option, widget)
 
+        if low_detail(painter, option):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(self._character.prefs.avatar.icon_color))
+            painter.drawEllipse(self.Margin, self.Margin, self._size, self._size)
+            return
+
         avatar = avatars.avatar(self._character)
         avatar.paint(painter, self.Margin, self.Margin, self._size, self._size)
 
@@ -1388,8 +1442,12 @@ class EventItem(NodeItem):
 
     @overrides
     def activate(self):
-        if not self._node.transparent:
+        if self._node.transparent:
+            return
+        if self._shadowEnabled():
             shadow(self)
+        else:
+            self.setGraphicsEffect(None)
 
     @overrides
     def boundingRect(self) -> QRectF:
@@ -1405,6 +1463,8 @@ class EventItem(NodeItem):
         if not self._node.transparent:
             painter.setBrush(QColor(WHITE_COLOR))
             painter.drawRoundedRect(self.Margin, self.Margin, self._nestedRectWidth, self._nestedRectHeight, 16, 16)
+        if low_detail(painter, option):
+            return
         painter.setFont(self._font)
         painter.drawText(self._textRect, Qt.AlignmentFlag.AlignCenter,
                          self._text if self._text else self._placeholderText)
@@ -1504,6 +1564,8 @@ class NoteItem(NodeItem):
         self._width = self._nestedRectWidth + 2 * self.Padding + 2 * self.Margin
         self._height = self._nestedRectHeight + 2 * self.Padding + 2 * self.Margin
         self._placeholderText = 'Begin typing'
+        self._doc: Optional[QTextDocument] = None
+        self._docText: str = ''
 
         self._socketLeft = DotCircleSocketItem(180, parent=self)
         self._socketTopCenter = DotCircleSocketItem(90, parent=self)
@@ -1520,8 +1582,12 @@ class NoteItem(NodeItem):
 
     @overrides
     def activate(self):
-        if not self._node.transparent:
+        if self._node.transparent:
+            return
+        if self._shadowEnabled():
             shadow(self)
+        else:
+            self.setGraphicsEffect(None)
 
     def text(self) -> str:
         return self._node.text
@@ -1602,6 +1668,8 @@ class NoteItem(NodeItem):
             painter.setBrush(QColor(WHITE_COLOR))
             painter.drawRoundedRect(self.Margin + self.Padding, self.Margin + self.Padding, self._nestedRectWidth,
                                     self._nestedRectHeight, 6, 6)
+        if low_detail(painter, option):
+            return
 
         if self._node.text:
             painter.setPen(QPen(QColor(self._node.color), 1))
@@ -1609,11 +1677,8 @@ class NoteItem(NodeItem):
             painter.setPen(QPen(QColor('grey'), 1))
         painter.setFont(self._font)
         if self._node.text:
-            doc = QTextDocument()
-            doc.setTextWidth(self._textRect.width())
-            doc.setMarkdown(self._node.text)
             painter.translate(self._textRect.x(), self._textRect.y())
-            doc.drawContents(painter)
+            self._document().drawContents(painter)
         else:
             painter.drawText(self._textRect, Qt.AlignmentFlag.AlignLeft, self._placeholderText)
 
@@ -1621,6 +1686,14 @@ class NoteItem(NodeItem):
     def mouseDoubleClickEvent(self, event: QGraphicsSceneMouseEvent) -> None:
         self.networkScene().editItemEvent(self)
 
+    def _document(self) -> QTextDocument:
+        if self._doc is None or self._docText != self._node.text or self._doc.textWidth() != self._textRect.width():
+            self._doc = QTextDocument()
+            self._doc.setTextWidth(self._textRect.width())
+            self._doc.setMarkdown(self._node.text)
+            self._docText = self._node.text
+        return self._doc
+
     def _setSocketsVisible(self, visible: bool = True):
         for socket in self._sockets:
             socket.setVisible(visible)
@@ -22,21 +22,24 @@ from dataclasses import dataclass
 from typing import Optional, Dict, Set, Union
 
 import qtanim
-from PyQt6.QtCore import Qt, pyqtSignal, QPointF, QPoint, QObject
+from PyQt6.QtCore import Qt, pyqtSignal, QPointF, QPoint, QObject, QTimer
 from PyQt6.QtGui import QTransform, \
     QKeyEvent, QKeySequence, QCursor, QImage, QUndoStack, QColor
 from PyQt6.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsSceneMouseEvent, QApplication, \
     QGraphicsSceneDragDropEvent
 from overrides import overrides
+from qtpy import sip
 
 from plotlyst.core.domain import Node, Diagram, GraphicsItemType, Connector, PlaceholderCharacter, \
-    to_node, Character
+    to_node, Character, DiagramChanges
 from plotlyst.service.cache import entities_registry
 from plotlyst.service.image import LoadedImage
+from plotlyst.service.persistence import RepositoryPersistenceManager
 from plotlyst.view.widget.graphics import NodeItem, CharacterItem, PlaceholderSocketItem, ConnectorItem, \
     AbstractSocketItem, EventItem
 from plotlyst.view.widget.graphics.commands import ItemAdditionCommand, ItemRemovalCommand
-from plotlyst.view.widget.graphics.items import NoteItem, ImageItem, IconItem, CircleShapedNodeItem, ResizeIconItem
+from plotlyst.view.widget.graphics.items import NoteItem, ImageItem, IconItem, CircleShapedNodeItem, ResizeIconItem, \
+    LOW_DETAIL_SCALE
 
 
 @dataclass
@@ -63,6 +66,8 @@ class NetworkScene(QGraphicsScene):
     itemMoved = pyqtSignal(NodeItem)
     hideItemEditor = pyqtSignal()
     contextMenu = pyqtSignal(NodeItem)
+    MAX_SHADOWED_NODES: int = 300
+    SAVE_DELAY: int = 500
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -78,6 +83,21 @@ class NetworkScene(QGraphicsScene):
         self._placeholder: Optional[PlaceholderSocketItem] = None
         self._connectorPlaceholder: Optional[ConnectorItem] = None
 
+        self._detailed: bool = True
+        self._pendingConnectors: Set[ConnectorItem] = set()
+        self._rearrangeTimer = QTimer(self)
+        self._rearrangeTimer.setSingleShot(True)
+        self._rearrangeTimer.setInterval(0)
+        self._rearrangeTimer.timeout.connect(self._rearrangePendingConnectors)
+
+        self._changes = DiagramChanges()
+        self._saveTimer = QTimer(self)
+        self._saveTimer.setSingleShot(True)
+        self._saveTimer.setInterval(self.SAVE_DELAY)
+        self._saveTimer.timeout.connect(self.commitChanges)
+        RepositoryPersistenceManager.instance().register_flush_hook(self.commitChanges)
+        self.destroyed.connect(lambda: self.commitChanges())
+
     def undoStack(self) -> QUndoStack:
         return self._undoStack
 
@@ -85,11 +105,15 @@ class NetworkScene(QGraphicsScene):
         self._undoStack = stack
 
     def setDiagram(self, diagram: Diagram):
+        self.commitChanges()
         self._diagram = diagram
+        self._pendingConnectors.clear()
         self.clear()
         if not self._diagram.loaded:
             self._load()
 
+        # index the items in one pass instead of rebalancing the BSP tree after every insertion
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
         nodes: Dict[str, NodeItem] = {}
         for node in self._diagram.data.nodes:
             nodeItem = self._addNode(node)
@@ -99,10 +123,47 @@ class NetworkScene(QGraphicsScene):
             target = nodes.get(str(connector.target_id), None)
             if source and target:
                 self._addConnector(connector, source, target)
+        self._rearrangePendingConnectors()
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        if not self._detailed:
+            self._applyLevelOfDetail()
 
         # trigger scene calculation early so that the view won't jump around for the first click
         self.sceneRect()
 
+    def isDetailed(self) -> bool:
+        return self._detailed
+
+    def setLevelOfDetail(self, scale: float):
+        detailed = scale >= LOW_DETAIL_SCALE
+        if detailed != self._detailed:
+            self._detailed = detailed
+            self._applyLevelOfDetail()
+
+    def shadowsEnabled(self) -> bool:
+        """Drop shadows are rendered offscreen on every repaint, therefore they are dropped when zoomed out or
+        when the diagram is too large."""
+        if not self._detailed:
+            return False
+        return self._diagram is None or len(self._diagram.data.nodes) <= self.MAX_SHADOWED_NODES
+
+    def commitChanges(self):
+        """Saves the changes recorded since the last commit. Changes are committed once a mouse gesture is over,
+        when no further change happened for SAVE_DELAY milliseconds, before a flush, and when the scene is
+        destroyed."""
+        if not sip.isdeleted(self):
+            self._saveTimer.stop()
+        if not self._changes:
+            return
+        changes = self._changes
+        self._changes = DiagramChanges()
+        self._saveChanges(changes)
+
+    def scheduleRearrange(self, connector: ConnectorItem):
+        self._pendingConnectors.add(connector)
+        if not self._rearrangeTimer.isActive():
+            self._rearrangeTimer.start()
+
     def isAdditionMode(self) -> bool:
         return self._additionDescriptor is not None
 
@@ -187,7 +248,8 @@ class NetworkScene(QGraphicsScene):
         connectorItem.setConnector(connector)
         if self._diagram:
             self._diagram.data.connectors.append(connector)
-        self._save()
+        self._changes.update_connector(connector)
+        self._scheduleSave()
 
         self.addItem(connectorItem)
         self.endLink()
@@ -261,6 +323,7 @@ class NetworkScene(QGraphicsScene):
             self._addNewItem(event.scenePos(), self._additionDescriptor.mode, self._additionDescriptor.subType)
 
         super().mouseReleaseEvent(event)
+        self.commitChanges()
 
     @overrides
     def mouseDoubleClickEvent(self, event: 'QGraphicsSceneMouseEvent') -> None:
@@ -302,7 +365,8 @@ class NetworkScene(QGraphicsScene):
             self._movedItems.add(item)
 
     def nodeChangedEvent(self, node: Node):
-        self._save()
+        self._changes.update_node(node)
+        self._scheduleSave()
 
     def requestImageUpload(self, item: ImageItem):
         image = self._uploadImage()
@@ -315,7 +379,9 @@ class NetworkScene(QGraphicsScene):
             item.setImage(image)
 
     def connectorChangedEvent(self, connector: ConnectorItem):
-        self._save()
+        if connector.connector() is not None:
+            self._changes.update_connector(connector.connector())
+        self._scheduleSave()
 
     def addNetworkItem(self, item: Union[NodeItem, ConnectorItem], connectors=None):
         def addConnectorItem(connectorItem: ConnectorItem):
@@ -324,11 +390,13 @@ class NetworkScene(QGraphicsScene):
             connectorItem.source().addConnector(connectorItem)
             connectorItem.target().addConnector(connectorItem)
             self._diagram.data.connectors.append(connectorItem.connector())
+            self._changes.update_connector(connectorItem.connector())
             self.addItem(connectorItem)
             connectorItem.setVisible(True)
 
         if isinstance(item, NodeItem):
             self._diagram.data.nodes.append(item.node())
+            self._changes.update_node(item.node())
             self.addItem(item)
             item.setVisible(True)
             if connectors:
@@ -336,7 +404,7 @@ class NetworkScene(QGraphicsScene):
                     addConnectorItem(connector)
         elif isinstance(item, ConnectorItem):
             addConnectorItem(item)
-        self._save()
+        self._scheduleSave()
 
     def removeNetworkItem(self, item: Union[NodeItem, ConnectorItem]):
         self._removeItem(item)
@@ -403,17 +471,19 @@ class NetworkScene(QGraphicsScene):
             # item.clearConnectors()
             if self._diagram:
                 self._diagram.data.nodes.remove(item.node())
+                self._changes.remove_node(item.node())
         elif isinstance(item, ConnectorItem):
             self._clearUpConnectorItem(item)
 
         if item.scene():
             item.setVisible(False)
             self.removeItem(item)
-        self._save()
+        self._scheduleSave()
 
     def _clearUpConnectorItem(self, item: ConnectorItem):
         try:
             self._diagram.data.connectors.remove(item.connector())
+            self._changes.remove_connector(item.connector())
             item.source().removeConnector(item)
             item.target().removeConnector(item)
         except ValueError:
@@ -429,6 +499,8 @@ class NetworkScene(QGraphicsScene):
 
         self.addItem(connectorItem)
         connectorItem.setConnector(connector)
+        if not self._detailed:
+            connectorItem.setDetailed(False)
 
         self._onLink(source, sourceSocket, target, targetSocket)
 
@@ -511,7 +583,8 @@ class NetworkScene(QGraphicsScene):
         self.endAdditionMode()
 
         self._diagram.data.nodes.append(item.node())
-        self._save()
+        self._changes.update_node(item.node())
+        self._scheduleSave()
 
         self._undoStack.push(ItemAdditionCommand(self, item))
 
@@ -533,6 +606,8 @@ class NetworkScene(QGraphicsScene):
             item = EventItem(node)
 
         self.addItem(item)
+        if not self.shadowsEnabled():
+            item.setDetailed(self._detailed)
         return item
 
     @abstractmethod
@@ -543,12 +618,31 @@ class NetworkScene(QGraphicsScene):
     def _save(self):
         pass
 
+    def _saveChanges(self, changes: DiagramChanges):
+        self._save()
+
+    def _scheduleSave(self):
+        self._saveTimer.start()
+
     def _uploadImage(self) -> Optional[LoadedImage]:
         pass
 
     def _loadImage(self, node: Node) -> Optional[QImage]:
         pass
 
+    def _applyLevelOfDetail(self):
+        for item in self.items():
+            if isinstance(item, (NodeItem, ConnectorItem)):
+                item.setDetailed(self._detailed)
+
+    def _rearrangePendingConnectors(self):
+        self._rearrangeTimer.stop()
+        pending = self._pendingConnectors
+        self._pendingConnectors = set()
+        for connector in pending:
+            if not sip.isdeleted(connector) and connector.scene() is self:
+                connector.rearrangeNow()
+
     def _onLink(self, sourceNode: NodeItem, sourceSocket: AbstractSocketItem, targetNode: NodeItem,
                 targetSocket: AbstractSocketItem):
         if isinstance(sourceNode, CircleShapedNodeItem):
@@ -222,11 +222,13 @@ class NetworkGraphicsView(BaseGraphicsView):
     def resetZoom(self):
         super().resetZoom()
         self._wdgZoomBar.updateScaledFactor(self.scaledFactor())
+        self._scene.setLevelOfDetail(self.transform().m11())
 
     @overrides
     def _scale(self, scale: float):
         super()._scale(scale)
         self._wdgZoomBar.updateScaledFactor(self.scaledFactor())
+        self._scene.setLevelOfDetail(self.transform().m11())
 
     def _mainControlClicked(self, itemType: GraphicsItemType, checked: bool):
         if checked:
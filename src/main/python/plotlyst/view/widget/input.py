@@ -21,7 +21,7 @@ import math
 from dataclasses import dataclass
 from enum import Enum
 from functools import partial
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 import emoji
 import qtanim
@@ -29,7 +29,7 @@ from PyQt6 import QtGui
 from PyQt6.QtCore import Qt, QObject, QEvent, QTimer, QPoint, QSize, pyqtSignal, QModelIndex, QItemSelectionModel
 from PyQt6.QtGui import QFont, QTextCursor, QTextCharFormat, QKeyEvent, QPaintEvent, QPainter, QBrush, QLinearGradient, \
     QColor, QSyntaxHighlighter, \
-    QTextDocument, QTextBlockUserData, QIcon, QResizeEvent, QFocusEvent, QTextBlockFormat
+    QTextDocument, QTextBlockUserData, QIcon, QResizeEvent, QFocusEvent, QTextBlockFormat, QTextBlock
 from PyQt6.QtWidgets import QTextEdit, QFrame, QPushButton, QStylePainter, QStyleOptionButton, QStyle, QMenu, \
     QApplication, QToolButton, QLineEdit, QWidgetAction, QListView, QSpinBox, QWidget, QLabel, QDialog
 from language_tool_python import LanguageTool
@@ -54,7 +54,7 @@ from plotlyst.event.handler import global_event_dispatcher
 from plotlyst.events import LanguageToolSet
 from plotlyst.model.characters_model import CharactersTableModel
 from plotlyst.model.common import proxy
-from plotlyst.service.grammar import language_tool_proxy, dictionary
+from plotlyst.service.grammar import language_tool_proxy, dictionary, grammar_service, GrammarCheckKey
 from plotlyst.service.persistence import RepositoryPersistenceManager
 from plotlyst.view.common import action, label, push_btn, tool_btn, insert_before, fade_out_and_gc, shadow, emoji_font, \
     fade_in, ButtonPressResizeEventFilter, columns, link_editor_to_btn
@@ -143,6 +143,7 @@ class TextBlockData(QTextBlockUserData):
         super(TextBlockData, self).__init__()
         self._misspellings = []
         self._wordCount: int = -1
+        self._grammarKey: Optional[GrammarCheckKey] = None
 
     @property
     def misspellings(self):
@@ -161,6 +162,14 @@ class TextBlockData(QTextBlockUserData):
     def wordCount(self, value):
         self._wordCount = value
 
+    @property
+    def grammarKey(self) -> Optional[GrammarCheckKey]:
+        return self._grammarKey
+
+    @grammarKey.setter
+    def grammarKey(self, value: Optional[GrammarCheckKey]):
+        self._grammarKey = value
+
 
 class AbstractTextBlockHighlighter(QSyntaxHighlighter):
     def _currentblockData(self) -> TextBlockData:
@@ -216,10 +225,9 @@ class GrammarHighlighter(AbstractTextBlockHighlighter, EventListener):
         if language_tool_proxy.is_set():
             self._language_tool = language_tool_proxy.tool
 
-        self._currentAsyncBlock: int = 0
-        self._asyncTimer = QTimer()
-        self._asyncTimer.setInterval(20)
-        self._asyncTimer.timeout.connect(self._highlightNextBlock)
+        self._pendingBlocks: Dict[GrammarCheckKey, List[QTextBlock]] = {}
+        grammar_service.checked.connect(self._grammarChecked)
+        grammar_service.discarded.connect(self._grammarDiscarded)
 
         global_event_dispatcher.register(self, LanguageToolSet)
 
@@ -229,7 +237,7 @@ class GrammarHighlighter(AbstractTextBlockHighlighter, EventListener):
     def setCheckEnabled(self, enabled: bool):
         self._checkEnabled = enabled
         if not enabled:
-            self._asyncTimer.stop()
+            self._cancelPendingChecks()
 
     def setHighlights(self, highlights: list):
         self._highlights_index.clear()
@@ -248,7 +256,7 @@ class GrammarHighlighter(AbstractTextBlockHighlighter, EventListener):
 
     @overrides
     def setDocument(self, doc: Optional[QTextDocument]) -> None:
-        self._asyncTimer.stop()
+        self._cancelPendingChecks()
         super(GrammarHighlighter, self).setDocument(doc)
 
     @overrides
@@ -261,7 +269,7 @@ class GrammarHighlighter(AbstractTextBlockHighlighter, EventListener):
     def highlightBlock(self, text: str) -> None:
         data = self._currentblockData()
         if self._checkEnabled and self._language_tool:
-            matches = self._language_tool.check(text)
+            matches = self._grammarMatches(data, text)
             misspellings = []
             for m in matches:
                 if dictionary.is_known_word(text[m.offset:m.offset + m.errorLength]):
@@ -282,24 +290,97 @@ class GrammarHighlighter(AbstractTextBlockHighlighter, EventListener):
 
     def asyncRehighlight(self):
         if self._checkEnabled and self._language_tool:
-            self._currentAsyncBlock = 0
-            self._asyncTimer.start()
+            self.rehighlight()
+
+    def _grammarMatches(self, data: TextBlockData, text: str) -> list:
+        key = grammar_service.key(text, str(self._language_tool.language))
+        if data.grammarKey is not None and data.grammarKey != key:
+            self._releasePendingBlock(data.grammarKey, self.currentBlock())
+        data.grammarKey = key
+
+        if not text.strip():
+            return []
+        matches = grammar_service.cached(key)
+        if matches is not None:
+            return matches
+
+        if key not in self._pendingBlocks:
+            self._pendingBlocks[key] = []
+            grammar_service.request(key, text)
+        if self.currentBlock() not in self._pendingBlocks[key]:
+            self._pendingBlocks[key].append(self.currentBlock())
+        return []
+
+    def _releasePendingBlock(self, key: GrammarCheckKey, block: QTextBlock):
+        blocks = self._pendingBlocks.get(key)
+        if blocks is None:
+            return
+        if block in blocks:
+            blocks.remove(block)
+        if not blocks:
+            self._pendingBlocks.pop(key)
+            grammar_service.cancel(key)
+
+    def _grammarChecked(self, key: GrammarCheckKey):
+        blocks = self._pendingBlocks.pop(key, None)
+        if not blocks or not self._checkEnabled:
+            return
+        for block in blocks:
+            if not block.isValid():
+                continue
+            data = block.userData()
+            if isinstance(data, TextBlockData) and data.grammarKey == key:
+                self.rehighlightBlock(block)
 
-    def _highlightNextBlock(self):
-        if self._currentAsyncBlock >= self.document().blockCount():
-            return self._asyncTimer.stop()
+    def _grammarDiscarded(self, key: GrammarCheckKey):
+        self._pendingBlocks.pop(key, None)
 
-        block = self.document().findBlockByNumber(self._currentAsyncBlock)
-        self.rehighlightBlock(block)
-        self._currentAsyncBlock += 1
+    def _cancelPendingChecks(self):
+        for key in self._pendingBlocks.keys():
+            grammar_service.cancel(key)
+        self._pendingBlocks.clear()
 
 
 class BlockStatistics(AbstractTextBlockHighlighter):
+    """Keeps a running word count from the per-block deltas. The total is recounted from the blocks only after
+    blocks were removed or more than one character was inserted or replaced, since the removed blocks are never
+    highlighted."""
+
+    def __init__(self, document: QTextDocument):
+        super(BlockStatistics, self).__init__(document)
+        self._wordCount: int = 0
+        self._stale: bool = False
+        document.blockCountChanged.connect(self._invalidate)
+        document.contentsChange.connect(self._contentsChanged)
 
     @overrides
     def highlightBlock(self, text: str) -> None:
         data = self._currentblockData()
-        data.wordCount = wc(text)
+        count = wc(text)
+        if data.wordCount > 0:
+            self._wordCount -= data.wordCount
+        self._wordCount += count
+        data.wordCount = count
+
+    def wordCount(self) -> int:
+        if self._stale:
+            self._wordCount = 0
+            block = self.document().begin()
+            while block.isValid():
+                data = block.userData()
+                if isinstance(data, TextBlockData) and data.wordCount > 0:
+                    self._wordCount += data.wordCount
+                block = block.next()
+            self._stale = False
+
+        return self._wordCount
+
+    def _invalidate(self):
+        self._stale = True
+
+    def _contentsChanged(self, _: int, removed: int, added: int):
+        if removed > 1 or added > 1:
+            self._invalidate()
 
 
 class CharacterContentAssistMenu(QMenu):
@@ -511,14 +592,7 @@ class TextEditBase(EnhancedTextEdit):
         self._replacementInfo: Optional[ReplacementInfo] = None
 
     def statistics(self) -> TextStatistics:
-        wc = 0
-        for i in range(self.document().blockCount()):
-            block = self.document().findBlockByNumber(i)
-            data = block.userData()
-            if isinstance(data, TextBlockData):
-                wc += data.wordCount
-
-        return TextStatistics(wc)
+        return TextStatistics(self._blockStatistics.wordCount())
 
     # @overrides
     # def keyPressEvent(self, event: QtGui.QKeyEvent) -> None:
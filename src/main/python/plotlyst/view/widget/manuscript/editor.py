@@ -31,6 +31,7 @@ from overrides import overrides
 from qthandy import vbox, clear_layout, vspacer, margins, transparent, gc, hbox, italic, translucent, sp, spacer, \
     decr_font, retain_when_hidden, pointy
 from qthandy.filter import OpacityEventFilter
+from qtpy import sip
 from qttextedit import remove_font, TextBlockState, DashInsertionMode, AutoCapitalizationMode, EllipsisInsertionMode
 from qttextedit.ops import Heading1Operation, Heading2Operation, Heading3Operation, InsertListOperation, \
     InsertNumberedListOperation, BoldOperation, ItalicOperation, UnderlineOperation, StrikethroughOperation, \
@@ -246,6 +247,7 @@ class SceneSeparator(QPushButton):
 
 class ManuscriptTextEdit(TextEditBase):
     sceneSeparatorClicked = pyqtSignal(Scene)
+    focusLost = pyqtSignal()
 
     def __init__(self, parent=None, readOnly: bool = False):
         super(ManuscriptTextEdit, self).__init__(parent)
@@ -308,6 +310,7 @@ class ManuscriptTextEdit(TextEditBase):
     @overrides
     def focusOutEvent(self, event: QFocusEvent):
         super().focusOutEvent(event)
+        self.focusLost.emit()
         if self._sentenceHighlighter and self._sentenceHighlighter.sentenceHighlightEnabled():
             self._sentenceHighlighter.rehighlight()
         if self.textCursor().hasSelection() and not self._menuIsShown:
@@ -461,6 +464,7 @@ class ManuscriptTextEdit(TextEditBase):
 
 
 class ManuscriptEditor(QWidget, EventListener):
+    SERIALIZATION_DELAY: int = 1000
     textChanged = pyqtSignal()
     selectionChanged = pyqtSignal()
     progressChanged = pyqtSignal(DocumentProgress)
@@ -488,6 +492,12 @@ class ManuscriptEditor(QWidget, EventListener):
         self._settings: Optional[ManuscriptEditorSettingsWidget] = None
         self._lockCursorMove: bool = False
         self._lockTextChanged: bool = False
+        self._dirtyTextEdits: List[ManuscriptTextEdit] = []
+
+        self._serializationTimer = QTimer(self)
+        self._serializationTimer.setSingleShot(True)
+        self._serializationTimer.setInterval(self.SERIALIZATION_DELAY)
+        self._serializationTimer.timeout.connect(self.flush)
 
         self._find: Optional[ManuscriptFindWidget] = None
 
@@ -530,6 +540,7 @@ class ManuscriptEditor(QWidget, EventListener):
         self.layout().addWidget(self.wdgFrame)
 
         self.repo = RepositoryPersistenceManager.instance()
+        self.repo.register_flush_hook(self.flush)
 
     @overrides
     def event_received(self, event: Event):
@@ -562,6 +573,8 @@ class ManuscriptEditor(QWidget, EventListener):
                     gc(removedLbl)
                 if removedTextedit:
                     self._textedits.remove(removedTextedit)
+                    if removedTextedit in self._dirtyTextEdits:
+                        self._dirtyTextEdits.remove(removedTextedit)
                     gc(removedTextedit)
                 self._scenes.remove(event.scene)
                 self.textChanged.emit()
@@ -712,6 +725,7 @@ class ManuscriptEditor(QWidget, EventListener):
             self.setChapterScenes(self._chapter, scenes)
 
     def clear(self):
+        self.flush()
         self._textedits.clear()
         self._sceneLabels.clear()
         self._scenes.clear()
@@ -783,6 +797,18 @@ class ManuscriptEditor(QWidget, EventListener):
 
         self._settings.immersionSettings.typeWriterChanged.connect(self._typeWriterChanged)
 
+    def flush(self):
+        if not sip.isdeleted(self._serializationTimer):
+            self._serializationTimer.stop()
+        textedits = self._dirtyTextEdits
+        self._dirtyTextEdits = []
+        for textedit in textedits:
+            if sip.isdeleted(textedit):
+                continue
+            scene = textedit.scene()
+            scene.manuscript.content = textedit.toHtml()
+            self.repo.update_doc(self._novel, scene.manuscript)
+
     def statistics(self) -> TextStatistics:
         overall_stats = TextStatistics(0)
         if self.hasScenes():
@@ -841,11 +867,12 @@ class ManuscriptEditor(QWidget, EventListener):
         wc = textedit.statistics().word_count
         updated_progress = self._updateProgress(scene, wc, ignoreDiff=textedit.isTextBeingPasted())
 
-        scene.manuscript.content = textedit.toHtml()
-        self.repo.update_doc(self._novel, scene.manuscript)
+        if textedit not in self._dirtyTextEdits:
+            self._dirtyTextEdits.append(textedit)
+        self._serializationTimer.start()
         if updated_progress:
             self.repo.update_scene(scene)
-            self.repo.update_novel(self._novel)
+            self.repo.update_manuscript_progress(self._novel)
 
         self.textChanged.emit()
 
@@ -904,6 +931,7 @@ class ManuscriptEditor(QWidget, EventListener):
         _textedit.setScene(scene)
         _textedit.applyBlockFormat()
         _textedit.textChanged.connect(partial(self._textChanged, _textedit, scene))
+        _textedit.focusLost.connect(self.flush)
         _textedit.cursorPositionChanged.connect(partial(self._cursorPositionChanged, _textedit))
         self._textedits.append(_textedit)
 
@@ -1011,6 +1039,7 @@ class ManuscriptEditor(QWidget, EventListener):
             self.sceneTitleChanged.emit(self._scene)
 
     def _updateFind(self, scene: Scene):
+        self.flush()
         matches = self._find.updateScene(scene)
         for textedit in self._textedits:
             if textedit.scene() == scene:
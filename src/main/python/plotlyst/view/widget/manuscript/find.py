@@ -17,8 +17,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import html
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional, Pattern
 
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QShowEvent, QTextDocument, QTextCursor, QSyntaxHighlighter, QTextCharFormat, QColor, \
@@ -32,6 +33,7 @@ from plotlyst.core.client import json_client
 from plotlyst.core.domain import Novel, Scene
 from plotlyst.core.text import wc
 from plotlyst.service.persistence import RepositoryPersistenceManager
+from plotlyst.service.search import ManuscriptSearchIndex, search_pattern
 from plotlyst.view.common import DelayedSignalSlotConnector, push_btn, label
 from plotlyst.view.icons import IconRegistry
 from plotlyst.view.layout import group
@@ -115,7 +117,9 @@ class ManuscriptFindWidget(QWidget):
         vbox(self, 1, spacing=2)
         margins(self, top=0)
         self._term: str = ''
+        self._pattern: Optional[Pattern] = None
         self._results: Dict[Scene, list] = {}
+        self._index = ManuscriptSearchIndex(self.novel)
 
         self.search = SearchField(ignoreCapitalization=True)
         decr_icon(self.search.lineSearch)
@@ -133,6 +137,12 @@ class ManuscriptFindWidget(QWidget):
         decr_icon(self.btnWord, 4)
         self.btnWord.clicked.connect(self._settingChanged)
 
+        self.btnRegex = SelectorToggleButton(Qt.ToolButtonStyle.ToolButtonIconOnly, minWidth=40, animated=False)
+        self.btnRegex.setIcon(IconRegistry.from_name('msc.regex', 'grey', 'black'))
+        self.btnRegex.setToolTip('Use regular expression')
+        decr_icon(self.btnRegex, 4)
+        self.btnRegex.clicked.connect(self._settingChanged)
+
         self.replace = SearchField(ignoreCapitalization=True)
         decr_font(self.replace.lineSearch)
         self.replace.lineSearch.setPlaceholderText('Replace with...')
@@ -165,7 +175,8 @@ class ManuscriptFindWidget(QWidget):
         self._textBlockFormat.setLeftMargin(10)
 
         self.layout().addWidget(self.search, alignment=Qt.AlignmentFlag.AlignLeft)
-        self.layout().addWidget(group(self.btnCase, self.btnWord, margin_left=20), alignment=Qt.AlignmentFlag.AlignLeft)
+        self.layout().addWidget(group(self.btnCase, self.btnWord, self.btnRegex, margin_left=20),
+                                alignment=Qt.AlignmentFlag.AlignLeft)
         self.layout().addWidget(self.replace, alignment=Qt.AlignmentFlag.AlignLeft)
         self.layout().addWidget(self.btnReplace, alignment=Qt.AlignmentFlag.AlignCenter)
         self.layout().addWidget(self.lblResults, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -183,6 +194,7 @@ class ManuscriptFindWidget(QWidget):
         self.search.lineSearch.clear()
         self.replace.lineSearch.clear()
         self._term = ''
+        self._pattern = None
         self.btnReplace.setDisabled(True)
         self.lblResults.clear()
         self.wdgResults.clear()
@@ -193,6 +205,8 @@ class ManuscriptFindWidget(QWidget):
 
     @busy
     def updateScene(self, scene: Scene) -> List:
+        if self._pattern is None:
+            return []
         scene_matches = self._searchForScene(scene)
         self._results[scene] = scene_matches
 
@@ -243,17 +257,31 @@ class ManuscriptFindWidget(QWidget):
         self.wdgResults.clear()
         self._results.clear()
         if not term or term == ' ' or (len(term) == 1 and not re.match(r'[\d\W]', term)):
+            self._pattern = None
             self.lblResults.clear()
             self.btnReplace.setDisabled(True)
             self.reset.emit()
             return
 
+        try:
+            self._pattern = search_pattern(term, case_sensitive=self.btnCase.isChecked(),
+                                           whole_word=self.btnWord.isChecked(), regex=self.btnRegex.isChecked())
+        except re.error:
+            self._pattern = None
+            self.lblResults.setText('Invalid regular expression')
+            self.btnReplace.setDisabled(True)
+            self.reset.emit()
+            return
+
         json_client.load_manuscript(self.novel)
+        matches = self._index.search(self._pattern, term, whole_word=self.btnWord.isChecked(),
+                                     regex=self.btnRegex.isChecked())
+        self._index.save()
 
         count = 0
         resultCursor = QTextCursor(self.wdgResults.document())
         for scene in self.novel.scenes:
-            scene_matches = self._searchForScene(scene)
+            scene_matches = [self._formatResult(x) for x in matches.get(scene, [])]
             if scene_matches:
                 count += len(scene_matches)
                 self._results[scene] = scene_matches
@@ -274,51 +302,15 @@ class ManuscriptFindWidget(QWidget):
         self._results.pop(scene, None)
         if not scene.manuscript:
             return []
-        doc = QTextDocument()
-        doc.setHtml(scene.manuscript.content)
-        raw_text = doc.toPlainText()
-
-        flags = None
-        if self.btnCase.isChecked():
-            flags = QTextDocument.FindFlag.FindCaseSensitively
-        if self.btnWord.isChecked():
-            flags = flags | QTextDocument.FindFlag.FindWholeWords if flags else QTextDocument.FindFlag.FindWholeWords
-
-        cursor = QTextCursor(doc)
-        scene_matches = []
-        while not cursor.isNull() and not cursor.atEnd():
-            if flags:
-                cursor = doc.find(self._term, cursor, options=flags)
-            else:
-                cursor = doc.find(self._term, cursor)
-            if cursor.isNull():
-                break
-
-            start = cursor.selectionStart()
-            end = cursor.selectionEnd()
-
-            before_start = raw_text.rfind(" ", 0, start - self.CONTEXT_SIZE)
-            before_start = 0 if before_start == -1 else before_start + 1
-            after_end = raw_text.find(" ", end + self.CONTEXT_SIZE)
-            after_end = len(raw_text) if after_end == -1 else after_end
-
-            before = raw_text[before_start:start]
-            after = raw_text[end:after_end]
-            match_text = raw_text[start:end]
-
-            formatted_match = f'{before}<span style="background-color: {PLOTLYST_TERTIARY_COLOR}; color: black; padding: 2px;">{match_text}</span>{after}'
-
-            result = {
-                "scene": scene,
-                "start": start,
-                "end": end,
-                "block": cursor.blockNumber(),
-                "pos_in_block": (cursor.positionInBlock() - len(match_text), cursor.positionInBlock()),
-                "context": formatted_match
-            }
-            scene_matches.append(result)
-
-        return scene_matches
+        matches = self._index.search_scene(scene, self._pattern, self.CONTEXT_SIZE)
+        return [self._formatResult(x) for x in matches]
+
+    def _formatResult(self, result: dict) -> dict:
+        before = html.escape(result.pop('before'))
+        match_text = html.escape(result.pop('match'))
+        after = html.escape(result.pop('after'))
+        result['context'] = f'{before}<span style="background-color: {PLOTLYST_TERTIARY_COLOR}; color: black; padding: 2px;">{match_text}</span>{after}'
+        return result
 
     def _updateResultsLabel(self):
         count = 0
@@ -692,7 +692,7 @@ class SceneElementWidget(QWidget):
                 self._arrows[degree].setVisible(True)
 
         if self._element.ref:
-            storyline = next((x for x in self._novel.plots if x.id == self._element.ref), None)
+            storyline = self._novel.find_plot(self._element.ref)
             if storyline is not None:
                 self._btnStorylineLink.setIcon(IconRegistry.from_name(storyline.icon, storyline.icon_color))
                 if self._storylineVisible:
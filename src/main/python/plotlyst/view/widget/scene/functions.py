@@ -106,7 +106,7 @@ class _StorylineAssociatedFunctionWidget(PrimarySceneFunctionWidget):
             self._btnProgress.setVisible(False)
 
     def plot(self) -> Optional[Plot]:
-        return next((x for x in self.novel.plots if x.id == self.function.ref), None)
+        return self.novel.find_plot(self.function.ref)
 
     def setPlot(self, plot: Plot):
         self._plotSelected(plot)
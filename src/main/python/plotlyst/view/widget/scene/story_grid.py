@@ -257,7 +257,7 @@ class ScenesGridWidget(TimelineGridWidget, EventListener):
                 card.refresh()
                 self._updateSceneReferences(event.scene)
         elif isinstance(event, SceneAddedEvent):
-            index = self._novel.scenes.index(event.scene)
+            index = self._novel.scene_index(event.scene)
             sceneCard = SceneGridCard(event.scene, self._novel)
             if index == len(self._novel.scenes) - 1:  # last one
                 self.cardsView.addCard(sceneCard, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -429,7 +429,7 @@ class ScenesGridWidget(TimelineGridWidget, EventListener):
         plot: Plot = line.ref
 
         ref = scene.link_plot(plot)
-        wdg = self.addRef(self._novel.scenes.index(scene), scene, ref)
+        wdg = self.addRef(self._novel.scene_index(scene), scene, ref)
         fade_in(wdg)
 
         self._updateSceneType(scene)
@@ -458,7 +458,7 @@ class ScenesGridWidget(TimelineGridWidget, EventListener):
         scene.update_purpose()
 
     def _addSceneReferences(self, scene: Scene):
-        index = self._novel.scenes.index(scene)
+        index = self._novel.scene_index(scene)
 
         for plot_ref in scene.plot_values:
             self.addRef(index, scene, plot_ref, removeOld=False)
@@ -469,7 +469,7 @@ class ScenesGridWidget(TimelineGridWidget, EventListener):
                 self._insertPlaceholder(index, line, scene)
 
     def _updateSceneReferences(self, scene: Scene):
-        index = self._novel.scenes.index(scene)
+        index = self._novel.scene_index(scene)
 
         for plot_ref in scene.plot_values:
             self.addRef(index, scene, plot_ref)
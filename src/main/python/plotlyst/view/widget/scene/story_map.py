@@ -18,15 +18,17 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from enum import Enum
 from functools import partial
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from typing import List
 
-from PyQt6.QtCore import QPoint, QTimeLine
+from PyQt6.QtCore import QPoint, QTimeLine, QRect, QLine
 from PyQt6.QtCore import Qt, QEvent, QSize, pyqtSignal
 from PyQt6.QtGui import QColor, QMouseEvent, QPaintEvent, QPainter, \
-    QPen, QPainterPath, QShowEvent
+    QPen, QPainterPath, QShowEvent, QPixmap
 from PyQt6.QtWidgets import QSizePolicy, QWidget
 from overrides import overrides
 from qthandy import busy, margins
@@ -38,7 +40,8 @@ from plotlyst.common import truncate_string
 from plotlyst.core.domain import Scene, Novel, Plot
 from plotlyst.event.core import Event, EventListener, emit_event
 from plotlyst.event.handler import event_dispatchers
-from plotlyst.events import SceneOrderChangedEvent, SceneChangedEvent
+from plotlyst.events import SceneOrderChangedEvent, SceneChangedEvent, SceneDeletedEvent, SceneAddedEvent, \
+    StorylineCreatedEvent, StorylineRemovedEvent, StorylineChangedEvent
 from plotlyst.service.cache import acts_registry
 from plotlyst.service.persistence import RepositoryPersistenceManager
 from plotlyst.view.common import action
@@ -52,16 +55,43 @@ class StoryMapDisplayMode(Enum):
     DETAILED = 2
 
 
+@dataclass
+class _StoryLinesLayout:
+    scenes: List[Scene]
+    width: int
+    height: int
+    scene_indexes: Dict[Scene, int] = field(default_factory=dict)
+    paths: List[Tuple[QColor, QPainterPath, QRect]] = field(default_factory=list)
+    lines: List[Tuple[QColor, QLine]] = field(default_factory=list)
+    icons: List[Tuple[QPixmap, int, int]] = field(default_factory=list)
+    texts: List[Tuple[int, int, str]] = field(default_factory=list)
+    ellipses: Dict[int, List[Tuple[int, int]]] = field(default_factory=dict)
+
+    def addPath(self, plot: Plot, path: QPainterPath):
+        bounds = path.boundingRect().toAlignedRect().adjusted(-4, -4, 4, 4)
+        self.paths.append((QColor(plot.icon_color), path, bounds))
+
+
 class StoryLinesMapWidget(QWidget):
+    """Draws the storylines across the scenes.
+
+    The geometry is computed once per change and rendered into pixmap tiles. A paint event only blits the exposed
+    tiles and draws the selected scene on top.
+    """
     sceneSelected = pyqtSignal(Scene)
+    TILE_WIDTH: int = 512
+    MAX_TILES: int = 32
+    ELLIPSE_MARGIN: int = 30
 
     def __init__(self, mode: StoryMapDisplayMode, acts_filter: Dict[int, bool], parent=None):
         super().__init__(parent=parent)
         hbox(self)
         self.setMouseTracking(True)
         self.novel: Optional[Novel] = None
-        self._scene_coord_y: Dict[int, int] = {}
         self._clicked_scene: Optional[Scene] = None
+        self._story_layout: Optional[_StoryLinesLayout] = None
+        self._tiles: OrderedDict[int, QPixmap] = OrderedDict()
+        self._tiles_dpr: float = 1.0
         self._display_mode: StoryMapDisplayMode = mode
         self._acts_filter = acts_filter
 
@@ -82,6 +112,8 @@ class StoryLinesMapWidget(QWidget):
             self.update(0, 0, x, self.minimumSizeHint().height())
 
         self.novel = novel
+        self._story_layout = None
+        self._tiles.clear()
         if animated:
             timeline = QTimeLine(700, parent=self)
             timeline.setFrameRange(0, self.minimumSizeHint().width())
@@ -96,6 +128,8 @@ class StoryLinesMapWidget(QWidget):
 
     @overrides
     def minimumSizeHint(self) -> QSize:
+        if self._story_layout is not None:
+            return QSize(self._story_layout.width, self._story_layout.height)
         if self.novel:
             x = self._scene_x(len(self.scenes()) - 1) + 50
             y = self._story_line_y(len(self.novel.plots)) * 2
@@ -118,24 +152,56 @@ class StoryLinesMapWidget(QWidget):
         index = self._index_from_pos(event.pos())
         scenes = self.scenes()
         if index < len(scenes):
-            self._clicked_scene: Scene = scenes[index]
+            self._select(scenes[index])
             self.sceneSelected.emit(self._clicked_scene)
             self._context_menu_requested(event.pos())
-            self.update()
 
     @overrides
     def paintEvent(self, event: QPaintEvent) -> None:
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.fillRect(self.rect(), QColor(RELAXED_WHITE_COLOR))
+        painter.fillRect(event.rect(), QColor(RELAXED_WHITE_COLOR))
 
         if not self._first_paint_triggered:
             painter.end()
             return
 
+        layout = self._layout()
+        dpr = self.devicePixelRatioF()
+        if dpr != self._tiles_dpr:
+            self._tiles.clear()
+            self._tiles_dpr = dpr
+        first_tile = max(0, event.rect().left()) // self.TILE_WIDTH
+        last_tile = min(event.rect().right(), layout.width) // self.TILE_WIDTH
+        for tile in range(first_tile, last_tile + 1):
+            painter.drawPixmap(tile * self.TILE_WIDTH, 0, self._tile(tile))
+
+        index = layout.scene_indexes.get(self._clicked_scene) if self._clicked_scene else None
+        if index is not None:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            for x, y in layout.ellipses.get(index, []):
+                self._draw_scene_ellipse(painter, self._clicked_scene, x, y, selected=True)
+
+        painter.end()
+
+    def invalidate(self):
+        self._story_layout = None
+        self._tiles.clear()
+        self.updateGeometry()
+        self.update()
+
+    def _layout(self) -> '_StoryLinesLayout':
+        if self._story_layout is None:
+            self._story_layout = self._build_layout()
+        return self._story_layout
+
+    def _build_layout(self) -> '_StoryLinesLayout':
         scenes = self.scenes()
+        scene_plots = [scene.plots() for scene in scenes]
+        size = self.minimumSizeHint()
+        layout = _StoryLinesLayout(scenes, size.width(), size.height())
+        layout.scene_indexes = {scene: i for i, scene in enumerate(scenes)}
 
-        self._scene_coord_y.clear()
+        scene_coord_y: Dict[int, int] = {}
         y = 0
         last_sc_x: Dict[int, int] = {}
         for sl_i, plot in enumerate(self.novel.plots):
@@ -143,63 +209,125 @@ class StoryLinesMapWidget(QWidget):
             previous_x = 0
             y = self._story_line_y(sl_i)
             path = QPainterPath()
-            painter.setPen(QPen(QColor(plot.icon_color), 4, Qt.PenStyle.SolidLine))
             path.moveTo(0, y)
-            IconRegistry.from_name(plot.icon, plot.icon_color).paint(painter, 0, y - 35, 24, 24)
+            layout.icons.append((IconRegistry.from_name(plot.icon, plot.icon_color).pixmap(24, 24), 0, y - 35))
             path.lineTo(5, y)
-            painter.drawPath(path)
 
-            for sc_i, scene in enumerate(scenes):
+            chunk = 0
+            for sc_i, plots in enumerate(scene_plots):
                 x = self._scene_x(sc_i)
-                if plot in scene.plots():
-                    if sc_i not in self._scene_coord_y.keys():
-                        self._scene_coord_y[sc_i] = y
-                    if previous_y > self._scene_coord_y[sc_i] or (previous_y == 0 and y > self._scene_coord_y[sc_i]):
+                if plot in plots:
+                    if x // self.TILE_WIDTH != chunk:
+                        # split the path so that a tile strokes only the segments that cross it
+                        chunk = x // self.TILE_WIDTH
+                        layout.addPath(plot, path)
+                        position = path.currentPosition()
+                        path = QPainterPath()
+                        path.moveTo(position)
+                    if sc_i not in scene_coord_y.keys():
+                        scene_coord_y[sc_i] = y
+                    if previous_y > scene_coord_y[sc_i] or (previous_y == 0 and y > scene_coord_y[sc_i]):
                         path.lineTo(x - self._scene_width // 2, y)
-                    elif 0 < previous_y < self._scene_coord_y[sc_i]:
+                    elif 0 < previous_y < scene_coord_y[sc_i]:
                         path.lineTo(previous_x + self._scene_width // 2, y)
 
-                    if previous_y == self._scene_coord_y[sc_i] and previous_y != y:
-                        path.arcTo(previous_x + 4, self._scene_coord_y[sc_i] - 3, x - previous_x,
-                                   self._scene_coord_y[sc_i] - 25,
+                    if previous_y == scene_coord_y[sc_i] and previous_y != y:
+                        path.arcTo(previous_x + 4, scene_coord_y[sc_i] - 3, x - previous_x,
+                                   scene_coord_y[sc_i] - 25,
                                    -180, 180)
                     else:
-                        path.lineTo(x, self._scene_coord_y[sc_i])
+                        path.lineTo(x, scene_coord_y[sc_i])
 
-                    painter.drawPath(path)
-                    previous_y = self._scene_coord_y[sc_i]
+                    previous_y = scene_coord_y[sc_i]
                     previous_x = x
                     last_sc_x[sl_i] = x
+            layout.addPath(plot, path)
 
-        for sc_i, scene in enumerate(scenes):
-            if sc_i not in self._scene_coord_y.keys():
-                continue
-            self._draw_scene_ellipse(painter, scene, self._scene_x(sc_i), self._scene_coord_y[sc_i])
-
-        for sc_i, scene in enumerate(scenes):
-            if not scene.plots():
-                self._draw_scene_ellipse(painter, scene, self._scene_x(sc_i), 3)
+        for sc_i, y_ in scene_coord_y.items():
+            layout.ellipses.setdefault(sc_i, []).append((self._scene_x(sc_i), y_))
+        for sc_i, plots in enumerate(scene_plots):
+            if not plots:
+                layout.ellipses.setdefault(sc_i, []).append((self._scene_x(sc_i), 3))
 
         if len(self.novel.plots) <= 1:
-            return
+            return layout
 
         base_y = y
         for sl_i, plot in enumerate(self.novel.plots):
             y = 50 * (sl_i + 1) + 25 + base_y
-            painter.setPen(QPen(QColor(plot.icon_color), 4, Qt.PenStyle.SolidLine))
-            painter.drawLine(0, y, last_sc_x.get(sl_i, 15), y)
-            painter.setPen(QPen(Qt.GlobalColor.black, 5, Qt.PenStyle.SolidLine))
-            painter.drawPixmap(0, y - 35, IconRegistry.from_name(plot.icon, plot.icon_color).pixmap(24, 24))
-            painter.drawText(26, y - 15, plot.text)
+            layout.lines.append((QColor(plot.icon_color), QLine(0, y, last_sc_x.get(sl_i, 15), y)))
+            layout.icons.append((IconRegistry.from_name(plot.icon, plot.icon_color).pixmap(24, 24), 0, y - 35))
+            layout.texts.append((26, y - 15, plot.text))
 
-            for sc_i, scene in enumerate(scenes):
-                if plot in scene.plots():
-                    self._draw_scene_ellipse(painter, scene, self._scene_x(sc_i), y)
+            for sc_i, plots in enumerate(scene_plots):
+                if plot in plots:
+                    layout.ellipses.setdefault(sc_i, []).append((self._scene_x(sc_i), y))
 
+        return layout
+
+    def _tile(self, index: int) -> QPixmap:
+        pixmap = self._tiles.get(index)
+        if pixmap is not None:
+            self._tiles.move_to_end(index)
+            return pixmap
+
+        layout = self._layout()
+        rect = QRect(index * self.TILE_WIDTH, 0, self.TILE_WIDTH, max(layout.height, 1))
+        pixmap = QPixmap(int(rect.width() * self._tiles_dpr), int(rect.height() * self._tiles_dpr))
+        pixmap.setDevicePixelRatio(self._tiles_dpr)
+        pixmap.fill(QColor(RELAXED_WHITE_COLOR))
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.font())
+        painter.translate(-rect.left(), 0)
+        self._paint_layer(painter, layout, rect)
         painter.end()
 
-    def _draw_scene_ellipse(self, painter: QPainter, scene: Scene, x: int, y: int):
-        selected = scene is self._clicked_scene
+        self._tiles[index] = pixmap
+        while len(self._tiles) > self.MAX_TILES:
+            self._tiles.popitem(last=False)
+        return pixmap
+
+    def _paint_layer(self, painter: QPainter, layout: '_StoryLinesLayout', rect: QRect):
+        for color, path, bounds in layout.paths:
+            if bounds.intersects(rect):
+                painter.setPen(QPen(color, 4, Qt.PenStyle.SolidLine))
+                painter.drawPath(path)
+        for color, line in layout.lines:
+            if line.x1() <= rect.right() and line.x2() >= rect.left():
+                painter.setPen(QPen(color, 4, Qt.PenStyle.SolidLine))
+                painter.drawLine(line)
+        for pixmap, x, y in layout.icons:
+            if x <= rect.right():
+                painter.drawPixmap(x, y, pixmap)
+        painter.setPen(QPen(Qt.GlobalColor.black, 5, Qt.PenStyle.SolidLine))
+        for x, y, text in layout.texts:
+            if x <= rect.right():
+                painter.drawText(x, y, text)
+
+        first = max(0, self._index_from_x(rect.left() - self.ELLIPSE_MARGIN))
+        last = min(len(layout.scenes) - 1, self._index_from_x(rect.right() + self.ELLIPSE_MARGIN))
+        for sc_i in range(first, last + 1):
+            for x, y in layout.ellipses.get(sc_i, []):
+                self._draw_scene_ellipse(painter, layout.scenes[sc_i], x, y)
+
+    def _scene_rect(self, scene: Optional[Scene]) -> QRect:
+        if scene is None or self._story_layout is None:
+            return QRect()
+        index = self._story_layout.scene_indexes.get(scene)
+        if index is None:
+            return QRect()
+        x = self._scene_x(index)
+        return QRect(x - self.ELLIPSE_MARGIN, 0, self.ELLIPSE_MARGIN * 2 + 20, self.height())
+
+    def _select(self, scene: Scene):
+        if self._clicked_scene is not None:
+            self.update(self._scene_rect(self._clicked_scene))
+        self._clicked_scene = scene
+        self.update(self._scene_rect(scene))
+
+    def _draw_scene_ellipse(self, painter: QPainter, scene: Scene, x: int, y: int, selected: bool = False):
         if scene.plot_values:
             pen_color = PLOTLYST_TERTIARY_COLOR if selected else Qt.GlobalColor.black
             if len(scene.plot_values) == 1:
@@ -213,7 +341,7 @@ class StoryLinesMapWidget(QWidget):
                 painter.setBrush(Qt.GlobalColor.white)
                 painter.drawEllipse(x, y - 10, 20, 20)
         else:
-            pen_color = PLOTLYST_SECONDARY_COLOR if scene is self._clicked_scene else Qt.GlobalColor.gray
+            pen_color = PLOTLYST_SECONDARY_COLOR if selected else Qt.GlobalColor.gray
             painter.setPen(QPen(QColor(pen_color), 3, Qt.PenStyle.SolidLine))
             painter.setBrush(Qt.GlobalColor.gray)
             size = 18 if selected else 14
@@ -227,14 +355,16 @@ class StoryLinesMapWidget(QWidget):
         return self._scene_width * (index + 1)
 
     def _index_from_pos(self, pos: QPoint) -> int:
-        return int((pos.x() / self._scene_width) - 1)
+        return self._index_from_x(pos.x())
+
+    def _index_from_x(self, x: int) -> int:
+        return int((x / self._scene_width) - 1)
 
     def _context_menu_requested(self, pos: QPoint) -> None:
         index = self._index_from_pos(pos)
         scenes = self.scenes()
         if index < len(scenes):
-            self._clicked_scene: Scene = scenes[index]
-            self.update()
+            self._select(scenes[index])
 
             self._menuPlots.clear()
             if self.novel.plots:
@@ -258,7 +388,7 @@ class StoryLinesMapWidget(QWidget):
             self._clicked_scene.unlink_plot(plot)
         RepositoryPersistenceManager.instance().update_scene(self._clicked_scene)
 
-        self.update()
+        self.invalidate()
         emit_event(self.novel, SceneChangedEvent(self, self._clicked_scene))
 
 
@@ -271,6 +401,7 @@ class StoryMap(QWidget, EventListener):
         self._display_mode: StoryMapDisplayMode = StoryMapDisplayMode.DOTS
         self._orientation: int = Qt.Orientation.Horizontal
         self._acts_filter: Dict[int, bool] = {}
+        self._map: Optional[StoryLinesMapWidget] = None
         vbox(self, spacing=0)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         # apply to every QWidget inside
@@ -281,15 +412,27 @@ class StoryMap(QWidget, EventListener):
     def setNovel(self, novel: Novel):
         self.novel = novel
         dispatcher = event_dispatchers.instance(self.novel)
-        dispatcher.register(self, SceneOrderChangedEvent)
+        dispatcher.register(self, SceneOrderChangedEvent, SceneChangedEvent, SceneAddedEvent, SceneDeletedEvent,
+                            StorylineCreatedEvent, StorylineRemovedEvent, StorylineChangedEvent)
         self.refresh()
 
     @overrides
     def event_received(self, event: Event):
-        if self.isVisible():
-            self.refresh()
-        else:
+        self.events_received([event])
+
+    @overrides
+    def events_received(self, events: List[Event]):
+        events = [x for x in events if x.source is not self._map]
+        if not events:
+            return
+        if not self.isVisible():
             self._refreshOnShow = True
+        elif self._map is not None and self._display_mode != StoryMapDisplayMode.TITLE and all(
+                isinstance(x, (SceneChangedEvent, StorylineChangedEvent)) for x in events):
+            # the scenes and storylines are the same, only the cached layout is outdated
+            self._map.invalidate()
+        else:
+            self.refresh()
 
     @overrides
     def showEvent(self, event: QShowEvent) -> None:
@@ -303,6 +446,7 @@ class StoryMap(QWidget, EventListener):
         clear_layout(self)
 
         wdg = StoryLinesMapWidget(self._display_mode, self._acts_filter, parent=self)
+        self._map = wdg
         self.layout().addWidget(wdg)
         wdg.setNovel(self.novel, animated=animated)
         if self._display_mode == StoryMapDisplayMode.TITLE:
@@ -44,7 +44,7 @@ from plotlyst.env import app_env
 from plotlyst.event.core import Event, EventListener, emit_event
 from plotlyst.event.handler import event_dispatchers
 from plotlyst.events import SceneStatusChangedEvent, \
-    ActiveSceneStageChanged, AvailableSceneStagesChanged, NovelConflictTrackingToggleEvent
+    ActiveSceneStageChanged, AvailableSceneStagesChanged, NovelConflictTrackingToggleEvent, SceneChangedEvent
 from plotlyst.model.common import DistributionFilterProxyModel
 from plotlyst.model.distribution import CharactersScenesDistributionTableModel, TagScenesDistributionTableModel, \
     InformationScenesDistributionTableModel
@@ -649,13 +649,16 @@ class ScenesDistributionWidget(QWidget, Ui_CharactersScenesDistributionWidget, E
         self.btnCharacters.setChecked(True)
         self.btnConflicts.setVisible(self.novel.prefs.toggled(NovelSetting.Track_conflict))
         self.btnConflicts.setHidden(True)
-        event_dispatchers.instance(self.novel).register(self, NovelConflictTrackingToggleEvent)
+        event_dispatchers.instance(self.novel).register(self, NovelConflictTrackingToggleEvent, SceneChangedEvent)
 
         self.refresh()
 
     @overrides
     def event_received(self, event: Event):
-        if isinstance(event, NovelConflictTrackingToggleEvent):
+        if isinstance(event, SceneChangedEvent):
+            self._model.updateScene(event.scene)
+            self.refreshAverage()
+        elif isinstance(event, NovelConflictTrackingToggleEvent):
             self.btnConflicts.setVisible(event.toggled)
             if self.btnConflicts.isChecked():
                 self.btnCharacters.setChecked(True)
@@ -27,7 +27,7 @@ from qthandy import line, decr_icon
 
 from plotlyst.common import BLACK_COLOR
 from plotlyst.core.client import json_client
-from plotlyst.core.domain import GraphicsItemType, NODE_SUBTYPE_TOOL, NODE_SUBTYPE_COST, Diagram
+from plotlyst.core.domain import GraphicsItemType, NODE_SUBTYPE_TOOL, NODE_SUBTYPE_COST, Diagram, DiagramChanges
 from plotlyst.core.domain import Node
 from plotlyst.core.domain import Novel
 from plotlyst.service.image import LoadedImage, upload_image, load_image
@@ -71,6 +71,10 @@ class EventsMindMapScene(NetworkScene):
     def _save(self):
         self.repo.update_diagram(self._novel, self._diagram)
 
+    @overrides
+    def _saveChanges(self, changes: DiagramChanges):
+        self.repo.update_diagram(self._novel, self._diagram, changes)
+
     @overrides
     def _uploadImage(self) -> Optional[LoadedImage]:
         return upload_image(self._novel)
@@ -389,17 +389,11 @@ class StoryStructureEditor(QWidget, Ui_StoryStructureSettings, EventListener):
     def event_received(self, event: Event):
         if isinstance(event, CharacterDeletedEvent):
             for btn in self.btnGroupStructure.buttons():
-                structure: StoryStructure = btn.structure()
-                if structure.character_id == event.character.id:
-                    structure.reset_character()
-                    btn.refresh()
-                    self._save()
+                btn.refresh()
         elif isinstance(event, NovelStoryStructureActivationRequest):
             for btn in self.btnGroupStructure.buttons():
                 if btn.structure() is event.structure:
                     btn.setChecked(True)
-            self._save()
-            self._emit()
             return
 
         self._activeStructureToggled(self.novel.active_story_structure, True)
@@ -250,9 +250,12 @@ class TaskWidget(QFrame):
         self._charSelector.setVisible(True)
         self.changed.emit()
 
-    def resetCharacter(self):
-        self._task.reset_character()
-        self._charSelector.clear()
+    def refreshCharacter(self):
+        if self._task.character_id:
+            self._charSelector.setCharacter(self._task.character(app_env.novel))
+        elif not self._charSelector.isHidden():
+            self._charSelector.clear()
+            self._charSelector.setHidden(True)
 
     def updateCharacter(self, character: Character):
         self._charSelector.setIcon(avatars.avatar(character))
@@ -385,12 +388,10 @@ class StatusColumnWidget(BaseStatusColumnWidget, EventListener):
             item = self._container.layout().itemAt(i)
             if item.widget():
                 taskWdg: TaskWidget = item.widget()
-                if taskWdg.task().character_id == event.character.id:
-                    if isinstance(event, CharacterDeletedEvent):
-                        taskWdg.resetCharacter()
-                        self.taskChanged.emit(taskWdg.task())
-                    elif isinstance(event, CharacterChangedEvent):
-                        taskWdg.updateCharacter(event.character)
+                if isinstance(event, CharacterDeletedEvent):
+                    taskWdg.refreshCharacter()
+                elif taskWdg.task().character_id == event.character.id:
+                    taskWdg.updateCharacter(event.character)
 
     def status(self) -> TaskStatus:
         return self._status
@@ -529,4 +530,4 @@ class BoardWidget(QWidget):
         self._saveBoard()
 
     def _saveBoard(self):
-        self.repo.update_novel(self._novel)
+        self.repo.update_board(self._novel)
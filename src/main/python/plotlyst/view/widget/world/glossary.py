@@ -98,6 +98,7 @@ class GlossaryModel(SelectionItemsModel):
     def remove(self, index: QModelIndex):
         glossary = self._items[index.row()]
         self._novel.world.glossary.pop(glossary.key)
+        invalidate_glossary_matcher(self._novel.world.glossary)
         self.refresh()
         self.glossaryRemoved.emit()
 
@@ -157,6 +158,80 @@ class GlossaryTextBlockData(QTextBlockUserData):
         self.refs: List[GlossaryTextReference] = []
 
 
+class GlossaryMatcher:
+    """Finds the glossary terms of a text block in a single pass.
+
+    Single-word terms are looked up per word. Multi-word terms are compiled into one regular expression that is
+    structured as a prefix tree, so each position of the text is tested against the terms that share its prefix
+    only. The longest term wins where terms overlap.
+    """
+    _WORD = re.compile(r'\S+')
+
+    def __init__(self, glossary: Dict[str, GlossaryItem]):
+        self.glossary = glossary
+        self.size = len(glossary)
+        phrases = [x for x in glossary.keys() if ' ' in x]
+        self._pattern: Optional[re.Pattern] = re.compile(self._trie_expression(phrases)) if phrases else None
+
+    def find(self, text: str) -> List[GlossaryTextReference]:
+        refs = []
+        for match in self._WORD.finditer(text):
+            clean_word = match.group().strip('.,!?()[]')
+            if clean_word in self.glossary:
+                refs.append(GlossaryTextReference(match.start(), match.end() - match.start(),
+                                                  self.glossary[clean_word]))
+
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                refs.append(GlossaryTextReference(match.start(), match.end() - match.start(),
+                                                  self.glossary[match.group()]))
+
+        return refs
+
+    @staticmethod
+    def _trie_expression(keys: List[str]) -> str:
+        trie = {}
+        for key in keys:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def expression(node: dict) -> str:
+            branches = [re.escape(char) + expression(child) for char, child in node.items() if char]
+            if not branches:
+                return ''
+            expr = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if '' in node:
+                expr = f'(?:{expr})?'
+            return expr
+
+        return expression(trie)
+
+
+_glossary_matchers: Dict[int, GlossaryMatcher] = {}
+
+
+def glossary_matcher(glossary: Dict[str, GlossaryItem]) -> GlossaryMatcher:
+    """Returns the matcher shared by every highlighter of the given glossary.
+
+    The matchers hold their glossary, so the cache must be cleared with clear_glossary_matchers once the novel closes.
+    """
+    matcher = _glossary_matchers.get(id(glossary))
+    if matcher is None or matcher.glossary is not glossary or matcher.size != len(glossary):
+        matcher = GlossaryMatcher(glossary)
+        _glossary_matchers[id(glossary)] = matcher
+    return matcher
+
+
+def invalidate_glossary_matcher(glossary: Dict[str, GlossaryItem]):
+    _glossary_matchers.pop(id(glossary), None)
+
+
+def clear_glossary_matchers():
+    _glossary_matchers.clear()
+
+
 class GlossaryTextBlockHighlighter(AbstractTextBlockHighlighter):
 
     def __init__(self, glossary: Dict[str, GlossaryItem], document: QTextDocument, palette: WorldBuildingPalette):
@@ -168,30 +243,12 @@ class GlossaryTextBlockHighlighter(AbstractTextBlockHighlighter):
 
     @overrides
     def highlightBlock(self, text):
-        words = text.split()
-        index = 0
         data: GlossaryTextBlockData = self._currentblockData()
         data.refs.clear()
 
-        for word in words:
-            clean_word = word.strip('.,!?()[]')
-
-            if clean_word in self._glossary:
-                start_index = text.find(word, index)
-                length = len(word)
-                self.setFormat(start_index, length, self.underline_format)
-                data.refs.append(GlossaryTextReference(start_index, length, self._glossary[clean_word]))
-
-            index += len(word) + 1
-
-        for key in self._glossary.keys():
-            if ' ' in key:
-                pattern = re.escape(key)
-                for match in re.finditer(pattern, text):
-                    start_index = match.start()
-                    length = match.end() - start_index
-                    self.setFormat(start_index, length, self.underline_format)
-                    data.refs.append(GlossaryTextReference(start_index, length, self._glossary[key]))
+        for ref in glossary_matcher(self._glossary).find(text):
+            self.setFormat(ref.start, ref.length, self.underline_format)
+            data.refs.append(ref)
 
         self.setCurrentBlockUserData(data)
 
@@ -356,6 +413,7 @@ class WorldBuildingGlossaryEditor(QWidget):
 
     def _updateGlossary(self, glossary: GlossaryItem):
         self._novel.world.glossary[glossary.key] = glossary
+        invalidate_glossary_matcher(self._novel.world.glossary)
         self.glossaryModel.refresh()
         self._save()
 
@@ -17,18 +17,20 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import logging
 import math
+from collections import OrderedDict
 from functools import partial
-from typing import Optional, Any
+from typing import Optional, Any, Set, Tuple
 
 import qtanim
-from PyQt6.QtCore import Qt, QPoint, QSize, QPointF, QRectF, pyqtSignal, QTimer, QObject
+from PyQt6.QtCore import Qt, QPoint, QSize, QPointF, QRectF, pyqtSignal, QTimer, QObject, QThreadPool
 from PyQt6.QtGui import QColor, QPixmap, QShowEvent, QResizeEvent, QImage, QPainter, QKeyEvent, QIcon, QUndoStack, \
     QPainterPath, QPen, QMouseEvent
 from PyQt6.QtWidgets import QGraphicsScene, QGraphicsPixmapItem, QGraphicsItem, QAbstractGraphicsShapeItem, QWidget, \
     QGraphicsSceneMouseEvent, QGraphicsOpacityEffect, QGraphicsDropShadowEffect, QFrame, QLineEdit, \
     QApplication, QGraphicsSceneDragDropEvent, QSlider, QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsPathItem, \
-    QGraphicsView, QGraphicsEffect
+    QGraphicsView, QGraphicsEffect, QGraphicsObject, QStyleOptionGraphicsItem
 from overrides import overrides
 from qthandy import busy, vbox, sp, line, incr_font, flow, incr_icon, bold, vline, \
     margins, decr_font, translucent
@@ -42,6 +44,8 @@ from plotlyst.resources import resource_registry
 from plotlyst.service.cache import entities_registry
 from plotlyst.service.image import load_image, upload_image, LoadedImage
 from plotlyst.service.persistence import RepositoryPersistenceManager
+from plotlyst.service.tiles import MapTilePyramid, MapTilesBuildResult, MapTilesBuildWorker, MapTileLoadResult, \
+    MapTileLoader
 from plotlyst.view.common import tool_btn, action, shadow, TooltipPositionEventFilter, dominant_color, push_btn, \
     ExclusiveOptionalButtonGroup, restyle
 from plotlyst.view.icons import IconRegistry
@@ -675,12 +679,163 @@ class AreaSelectorWidget(SecondarySelectorWidget):
         self._btnCustom.setChecked(True)
 
 
+class MapTilesItem(QGraphicsObject):
+    """Map background that is painted from a tile pyramid.
+
+    Only the tiles visible at the current zoom level are loaded, on a worker thread, and at most MAX_TILES of them
+    are kept in memory. Until a tile is loaded, it is painted from a lower resolution.
+    """
+    ready = pyqtSignal()
+    failed = pyqtSignal(str)
+    MAX_TILES: int = 96
+
+    def __init__(self, pyramid: MapTilePyramid, image: Optional[QImage] = None, parent=None):
+        super().__init__(parent)
+        self._pyramid = pyramid
+        built = pyramid.load()
+        size = pyramid.source_size()
+        self._rect = QRectF(0, 0, max(size.width(), 0), max(size.height(), 0))
+        self._overview: Optional[QPixmap] = None
+        self._tiles: OrderedDict[Tuple[int, int, int], QPixmap] = OrderedDict()
+        self._pending: Set[Tuple[int, int, int]] = set()
+        self._level: int = 0
+
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(2)
+        self._loadResult = MapTileLoadResult()
+        self._loadResult.loaded.connect(self._tileLoaded)
+
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+        self.setAcceptedMouseButtons(Qt.MouseButton.LeftButton)
+
+        if built:
+            self._initOverview()
+        else:
+            self._buildResult = MapTilesBuildResult()
+            self._buildResult.finished.connect(self._built)
+            self._buildResult.failed.connect(self._buildFailed)
+            self._pool.start(MapTilesBuildWorker(pyramid, image, self._buildResult))
+
+    def isReady(self) -> bool:
+        return self._overview is not None
+
+    def pixmap(self) -> QPixmap:
+        return self._overview if self._overview is not None else QPixmap()
+
+    @overrides
+    def boundingRect(self) -> QRectF:
+        return self._rect
+
+    @overrides
+    def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = ...) -> None:
+        if self._overview is None:
+            return
+        exposed = option.exposedRect.intersected(self._rect)
+        if exposed.isEmpty():
+            return
+
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        x_ratio = self._overview.width() / self._rect.width()
+        y_ratio = self._overview.height() / self._rect.height()
+        painter.drawPixmap(exposed, self._overview,
+                           QRectF(exposed.x() * x_ratio, exposed.y() * y_ratio, exposed.width() * x_ratio,
+                                  exposed.height() * y_ratio))
+
+        scale = option.levelOfDetailFromTransform(painter.worldTransform())
+        if widget:
+            scale *= widget.devicePixelRatioF()
+        level = self._levelFor(scale)
+        if level != self._level:
+            self._level = level
+            self._pool.clear()
+            self._pending.clear()
+        if level == self._pyramid.levels - 1:
+            return
+
+        span = MapTilePyramid.TILE_SIZE << level
+        columns, rows = self._pyramid.grid(level)
+        for row in range(int(exposed.top()) // span, min(math.ceil(exposed.bottom() / span), rows)):
+            for col in range(int(exposed.left()) // span, min(math.ceil(exposed.right() / span), columns)):
+                key = (level, col, row)
+                pixmap = self._tiles.get(key)
+                if pixmap is None:
+                    self._request(key)
+                    self._paintFallback(painter, key)
+                else:
+                    self._tiles.move_to_end(key)
+                    painter.drawPixmap(self._tileRect(key), pixmap, QRectF(pixmap.rect()))
+
+    def _levelFor(self, scale: float) -> int:
+        if scale >= 1:
+            return 0
+        return min(int(math.floor(math.log2(1 / scale))), self._pyramid.levels - 1)
+
+    def _tileRect(self, key: Tuple[int, int, int]) -> QRectF:
+        level, col, row = key
+        span = MapTilePyramid.TILE_SIZE << level
+        return QRectF(col * span, row * span, span, span).intersected(self._rect)
+
+    def _paintFallback(self, painter: QPainter, key: Tuple[int, int, int]):
+        level, col, row = key
+        target = self._tileRect(key)
+        for parent_level in range(level + 1, self._pyramid.levels - 1):
+            shift = parent_level - level
+            parent_key = (parent_level, col >> shift, row >> shift)
+            pixmap = self._tiles.get(parent_key)
+            if pixmap is None:
+                continue
+            origin = self._tileRect(parent_key).topLeft()
+            factor = 1 << parent_level
+            source = QRectF((target.x() - origin.x()) / factor, (target.y() - origin.y()) / factor,
+                            target.width() / factor, target.height() / factor)
+            painter.drawPixmap(target, pixmap, source)
+            return
+
+    def _request(self, key: Tuple[int, int, int]):
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        self._pool.start(MapTileLoader(self._pyramid, *key, self._loadResult))
+
+    def _tileLoaded(self, level: int, col: int, row: int, image: QImage):
+        key = (level, col, row)
+        self._pending.discard(key)
+        if image.isNull():
+            return
+        self._tiles[key] = QPixmap.fromImage(image)
+        while len(self._tiles) > self.MAX_TILES:
+            self._tiles.popitem(last=False)
+        if level == self._level:
+            self.update(self._tileRect(key))
+
+    def _built(self):
+        if not self._pyramid.load():
+            self._buildFailed(f'Could not read the map tiles in {self._pyramid.path}')
+            return
+        self.prepareGeometryChange()
+        self._rect = QRectF(0, 0, self._pyramid.width, self._pyramid.height)
+        self._initOverview()
+        self.update()
+        self.ready.emit()
+
+    def _buildFailed(self, error: str):
+        logging.error('Could not build the map tiles: %s', error)
+        self._pyramid.remove()
+        self.failed.emit(error)
+
+    def _initOverview(self):
+        overview = self._pyramid.overview()
+        if not overview.isNull():
+            self._overview = QPixmap.fromImage(overview)
+
+
 class WorldBuildingMapScene(QGraphicsScene):
     showPopup = pyqtSignal(BaseMapItem)
     hidePopup = pyqtSignal()
     cancelItemAddition = pyqtSignal()
     itemAdded = pyqtSignal()
     itemMoved = pyqtSignal()
+    mapReplaced = pyqtSignal(QGraphicsItem)
 
     def __init__(self, novel: Novel, parent=None):
         super().__init__(parent)
@@ -741,17 +896,29 @@ class WorldBuildingMapScene(QGraphicsScene):
             event.ignore()
 
     @busy
-    def loadMap(self, map: WorldBuildingMap) -> Optional[QGraphicsPixmapItem]:
+    def loadMap(self, map: WorldBuildingMap) -> Optional[QGraphicsItem]:
         self.clear()
+        item: Optional[QGraphicsItem] = None
+        image: Optional[QImage] = None
         if map.ref:
-            image: Optional[QImage] = load_image(self._novel, map.ref)
+            pyramid = MapTilePyramid.for_image(self._novel, map.ref)
+            if pyramid.source.exists():
+                if map.ref.loaded:
+                    image = map.ref.data
+                    # the tiles replace the decoded image, which would be kept in memory otherwise
+                    map.ref.loaded = False
+                    map.ref.data = None
+                item = MapTilesItem(pyramid, image)
+                item.failed.connect(partial(self._tilesFailed, item, map))
+            else:
+                image = load_image(self._novel, map.ref)
         else:
             image = QImage(resource_registry.paper_bg)
-        if image:
+        if item is None and image:
+            item = self._pixmapItem(image)
+
+        if item is not None:
             self._map = map
-            item = QGraphicsPixmapItem()
-            item.setAcceptedMouseButtons(Qt.MouseButton.LeftButton)
-            item.setPixmap(QPixmap.fromImage(image))
             self.addItem(item)
 
             for marker in self._map.markers:
@@ -778,6 +945,25 @@ class WorldBuildingMapScene(QGraphicsScene):
         else:
             self._map = None
 
+    def _pixmapItem(self, image: QImage) -> QGraphicsPixmapItem:
+        item = QGraphicsPixmapItem()
+        item.setAcceptedMouseButtons(Qt.MouseButton.LeftButton)
+        item.setPixmap(QPixmap.fromImage(image))
+        return item
+
+    def _tilesFailed(self, item: MapTilesItem, map: WorldBuildingMap, _: str):
+        if map is not self._map or item.scene() is not self:
+            return
+        image = load_image(self._novel, map.ref)
+        if not image:
+            return
+        pixmapItem = self._pixmapItem(image)
+        self.addItem(pixmapItem)
+        pixmapItem.stackBefore(item)
+        self.removeItem(item)
+        item.deleteLater()
+        self.mapReplaced.emit(pixmapItem)
+
     @overrides
     def mousePressEvent(self, event: 'QGraphicsSceneMouseEvent') -> None:
         if self.isAreaAdditionMode() and event.button() == Qt.MouseButton.LeftButton:
@@ -890,7 +1076,7 @@ class WorldBuildingMapView(BaseGraphicsView):
         super().__init__(parent)
         self._novel = novel
         self._shown = False
-        self._bgItem: Optional[QGraphicsPixmapItem] = None
+        self._bgItem: Optional[QGraphicsItem] = None
 
         self._wdgZoomBar = ZoomBar(self)
         self._wdgZoomBar.zoomed.connect(self._scale)
@@ -944,6 +1130,7 @@ class WorldBuildingMapView(BaseGraphicsView):
         self._scene.itemAdded.connect(self._endAddition)
         self._scene.itemMoved.connect(self._itemMoved)
         self._scene.cancelItemAddition.connect(self._endAddition)
+        self._scene.mapReplaced.connect(self._mapReplaced)
         # self._wdgEditor.changed.connect(self._scene.markerChangedEvent)
 
         self.repo = RepositoryPersistenceManager.instance()
@@ -1053,11 +1240,11 @@ class WorldBuildingMapView(BaseGraphicsView):
             return
 
         if map.dominant_color:
-            bg_color = QColor(map.dominant_color)
+            self.setBackgroundBrush(QColor(map.dominant_color))
+        elif isinstance(self._bgItem, MapTilesItem) and not self._bgItem.isReady():
+            self._bgItem.ready.connect(partial(self._updateDominantColor, map))
         else:
-            bg_color = dominant_color(self._bgItem.pixmap())
-            map.dominant_color = bg_color.name()
-        self.setBackgroundBrush(bg_color)
+            self._updateDominantColor(map)
         # call to calculate rect size
         _ = self._scene.sceneRect()
         self.centerOn(self._bgItem)
@@ -1087,6 +1274,17 @@ class WorldBuildingMapView(BaseGraphicsView):
         restyle(self._btnEdit)
         self.__arrangeEditBtn()
 
+    def _mapReplaced(self, item: QGraphicsItem):
+        self._bgItem = item
+        map = self._scene.map()
+        if map and not map.dominant_color:
+            self._updateDominantColor(map)
+
+    def _updateDominantColor(self, map: WorldBuildingMap):
+        bg_color = dominant_color(self._bgItem.pixmap())
+        map.dominant_color = bg_color.name()
+        self.setBackgroundBrush(bg_color)
+
     def _addNewMap(self):
         loadedImage: Optional[LoadedImage] = upload_image(self._novel)
         if loadedImage:
@@ -1095,6 +1293,8 @@ class WorldBuildingMapView(BaseGraphicsView):
                 self._novel.world.maps.append(map)
             else:
                 map = self._novel.world.maps[0]
+                if map.ref:
+                    MapTilePyramid.for_image(self._novel, map.ref).remove()
                 map.ref = loadedImage.ref
                 map.dominant_color = ''
             self._loadMap(map)